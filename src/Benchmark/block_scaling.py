@@ -0,0 +1,102 @@
+import sys
+import time
+import logging
+import argparse
+from antlr4 import InputStream, CommonTokenStream
+from Language.compiscriptLexer import compiscriptLexer
+from Controller.compiler import parse_program
+from Controller.lowering import ASTBuilder
+from Controller.resolver import Resolver
+from Controller.Driver import SemanticAnalyzer
+
+# Sizes of the generated blocks, each one doubles the previous
+DEFAULT_SIZES = (12500, 25000, 50000, 100000)
+
+# A linear phase takes about twice as long when the block doubles
+DEFAULT_MAX_GROWTH = 3.0
+
+
+def generate_block(declarations: int):
+    """
+    Generates a program made of a single block with the given number of declarations,
+    mixing variable declarations, assignments, expression chains and prints.
+    """
+    lines = ["{", "var x0 = 0;"]
+    last = "x0"     # Last declared variable
+    for i in range(1, declarations):
+        kind = i % 4
+        if kind == 0:
+            lines.append(f"{last} = {last} + {i} * 2 - 1;")
+        elif kind == 1:
+            lines.append(f"print {last} + {i};")
+        else:
+            lines.append(f"var x{i} = {last} + {i} - 1;")
+            last = f"x{i}"
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def measure(source: str):
+    """
+    Compiles a source text and returns the time in seconds spent by each phase.
+    """
+    timings = {}
+    start = time.perf_counter()
+    lexer = compiscriptLexer(InputStream(source))
+    stream = CommonTokenStream(lexer)
+    stream.fill()
+    tree = parse_program(stream)
+    timings['parse'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    program = ASTBuilder().visit(tree)
+    timings['lower'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Resolver().resolve(program)
+    analyzer = SemanticAnalyzer(logger=logging.getLogger("compiscript.benchmark"))
+    analyzer.visit(program)
+    timings['analyze'] = time.perf_counter() - start
+
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Checks that compiling a block scales linearly with its size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Number of declarations of each block.")
+    parser.add_argument("--max-growth", type=float, default=DEFAULT_MAX_GROWTH,
+                        help="Largest accepted time ratio between a block and one half its size.")
+    args = parser.parse_args(argv)
+
+    # Warm up the DFA cache so the first size does not pay for it
+    measure(generate_block(100))
+
+    sizes = sorted(args.sizes)
+    print(f"{'declarations':>12} {'parse':>9} {'lower':>9} {'analyze':>9} {'us/decl':>8} {'growth':>7}")
+
+    previous = None
+    failed = False
+    for size in sizes:
+        timings = measure(generate_block(size))
+        total = sum(timings.values())
+
+        # Time ratio against the previous size, normalized to a doubling
+        growth = ""
+        if previous is not None:
+            previous_size, previous_total = previous
+            ratio = (total / previous_total) / (size / previous_size) * 2
+            growth = f"{ratio:.2f}"
+            failed = failed or ratio > args.max_growth
+
+        print(f"{size:>12} {timings['parse']:>8.2f}s {timings['lower']:>8.2f}s {timings['analyze']:>8.2f}s "
+              f"{total / size * 1e6:>8.1f} {growth:>7}")
+        previous = (size, total)
+
+    if failed:
+        print(f"Superlinear growth: a block twice as large took more than {args.max_growth}x as long.")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+import sys
+import time
+import logging
+import argparse
+from types import GeneratorType
+from antlr4 import InputStream, CommonTokenStream, ParserRuleContext
+from antlr4.Token import CommonToken
+from antlr4.tree.Tree import TerminalNodeImpl
+from Language.compiscriptLexer import compiscriptLexer
+from Controller.compiler import parse_program
+from Controller.lowering import ASTBuilder
+from Controller.Driver import SemanticAnalyzer
+from Controller.resolver import Resolver
+from Controller.custom_exception import SemanticError
+from Model.parse_tree import TreeVisualizer
+from Model.scope import BindingScopeManager
+from Benchmark.block_scaling import generate_block
+import Model.ast_nodes as ast
+
+# Nesting depths of the generated trees
+DEFAULT_DEPTHS = (100, 500, 10000, 100000)
+
+# Declarations of the flat program used to compare the walks on a shallow tree
+DEFAULT_FLAT_SIZE = 10000
+
+
+class RecursiveAnalyzer(SemanticAnalyzer):
+    """Analyzer that runs the nested visit methods with recursive calls, one Python frame per pending statement."""
+    def walk(self, generator):
+        send = generator.send
+        value = None
+        while True:
+            try:
+                request = send(value)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                if isinstance(request, ast.Node):
+                    request = self._visit_table[type(request)](self, request)
+                value = self.walk(request) if type(request) is GeneratorType else request
+                send = generator.send
+            except SemanticError as e:
+                value, send = e, generator.throw
+
+
+class RecursiveResolver(Resolver):
+    """Resolver that runs the nested visit methods with recursive calls, one Python frame per pending statement."""
+    def walk(self, generator):
+        for request in generator:
+            if isinstance(request, ast.Node):
+                request = self._visit_table[type(request)](self, request)
+            if type(request) is GeneratorType:
+                self.walk(request)
+
+
+class RecursiveTreeVisualizer(TreeVisualizer):
+    """Visualizer that walks the parse tree with recursive calls, one Python frame per node."""
+    def visit(self, ctx, parent=None):
+        label = ctx.getText() if ctx.getChildCount() == 0 else type(ctx).__name__.replace("Context", "")
+        current_node = self.add_node(label)
+        if parent:
+            self.add_edge(parent, current_node)
+        for i in range(ctx.getChildCount()):
+            self.visit(ctx.getChild(i), current_node)
+        return current_node
+
+
+def nested_blocks(depth: int):
+    """Builds the AST of 'var v0 = 0; { var v1 = v0; { var v2 = v1; ... } }' with 'depth' blocks."""
+    body = []
+    for level in range(depth, 0, -1):
+        body = [ast.Block([ast.VarDecl(f"v{level}", ast.Identifier(f"v{level - 1}"))] + body)]
+    return ast.Program([ast.VarDecl("v0", ast.Literal('num', '0'))] + body)
+
+
+def else_if_chain(depth: int):
+    """Builds the AST of 'if (true) print 1; else if (true) print 1; else ...' with 'depth' if statements."""
+    statement = ast.PrintStmt(ast.Literal('num', '1'))
+    for _ in range(depth):
+        statement = ast.IfStmt(ast.Literal('true', 'true'), ast.PrintStmt(ast.Literal('num', '1')), statement)
+    return ast.Program([statement])
+
+
+def assignment_chain(depth: int):
+    """Builds the AST of 'var a1; ... var aN; a1 = a2 = ... = aN = 1;' with 'depth' assignments."""
+    value = ast.Literal('num', '1')
+    for i in range(depth, 0, -1):
+        value = ast.Assign(f"a{i}", value)
+    return ast.Program([ast.VarDecl(f"a{i}") for i in range(1, depth + 1)] + [ast.ExprStmt(value)])
+
+
+def property_chain(depth: int):
+    """Builds the AST of 'var a = 0; print a.p.p...p;' with 'depth' property accesses."""
+    expression = ast.Identifier("a")
+    for _ in range(depth):
+        expression = ast.Get(expression, "p")
+    return ast.Program([ast.VarDecl("a", ast.Literal('num', '0')), ast.PrintStmt(expression)])
+
+
+def nested_contexts(depth: int):
+    """Builds a parse tree of 'depth' nested rule nodes, each one wrapped in braces."""
+    def terminal(text, parent):
+        token = CommonToken()
+        token.text = text
+        node = TerminalNodeImpl(token)
+        node.parentCtx = parent
+        return node
+
+    root = ParserRuleContext()
+    ctx = root
+    for _ in range(depth - 1):
+        child = ParserRuleContext(ctx)
+        ctx.addChild(terminal("{", ctx))
+        ctx.addChild(child)
+        ctx.addChild(terminal("}", ctx))
+        ctx = child
+    return root
+
+
+# Programs measured for the analyzer, by name
+SHAPES = {
+    'blocks': nested_blocks,
+    'else-if': else_if_chain,
+    'assign': assignment_chain,
+    'property': property_chain,
+}
+
+
+def timed(run):
+    """Returns the time in seconds spent by run(), or the name of the exception it raised."""
+    start = time.perf_counter()
+    try:
+        run()
+    except RecursionError:
+        return "RecursionError"
+    return time.perf_counter() - start
+
+
+def analyzer_run(analyzer_class, program):
+    logger = logging.getLogger("compiscript.benchmark")
+    return lambda: analyzer_class(logger=logger, scope_manager=BindingScopeManager()).visit(program)
+
+
+def resolver_run(resolver_class, program):
+    return lambda: resolver_class().resolve(program)
+
+
+def format_time(result):
+    return f"{result:>13.3f}s" if isinstance(result, float) else f"{result:>14}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compares the explicit stack walks with recursive walks on deeply nested trees.")
+    parser.add_argument("--depths", type=int, nargs="+", default=DEFAULT_DEPTHS, help="Nesting depths to measure.")
+    parser.add_argument("--flat-size", type=int, default=DEFAULT_FLAT_SIZE, help="Declarations of the flat program.")
+    args = parser.parse_args(argv)
+
+    print(f"Recursion limit: {sys.getrecursionlimit()}")
+    print(f"{'walker':<12} {'shape':<8} {'depth':>7} {'recursive':>14} {'explicit stack':>14}")
+    for depth in sorted(args.depths):
+        for shape, build in SHAPES.items():
+            program = build(depth)
+            recursive = timed(analyzer_run(RecursiveAnalyzer, program))
+            iterative = timed(analyzer_run(SemanticAnalyzer, program))
+            print(f"{'analyzer':<12} {shape:<8} {depth:>7} {format_time(recursive)} {format_time(iterative)}")
+            recursive = timed(resolver_run(RecursiveResolver, program))
+            iterative = timed(resolver_run(Resolver, program))
+            print(f"{'resolver':<12} {shape:<8} {depth:>7} {format_time(recursive)} {format_time(iterative)}")
+
+        tree = nested_contexts(depth)
+        recursive = timed(lambda: RecursiveTreeVisualizer().visit(tree))
+        iterative = timed(lambda: TreeVisualizer().visit(tree))
+        print(f"{'visualizer':<12} {'rules':<8} {depth:>7} {format_time(recursive)} {format_time(iterative)}")
+
+    # Shallow but large program, the cost of the explicit stack when recursion is not a problem
+    stream = CommonTokenStream(compiscriptLexer(InputStream(generate_block(args.flat_size))))
+    stream.fill()
+    tree = parse_program(stream)
+    program = ASTBuilder().visit(tree)
+    recursive = timed(analyzer_run(RecursiveAnalyzer, program))
+    iterative = timed(analyzer_run(SemanticAnalyzer, program))
+    print(f"{'analyzer':<12} {'flat':<8} {args.flat_size:>7} {format_time(recursive)} {format_time(iterative)}")
+    recursive = timed(resolver_run(RecursiveResolver, program))
+    iterative = timed(resolver_run(Resolver, program))
+    print(f"{'resolver':<12} {'flat':<8} {args.flat_size:>7} {format_time(recursive)} {format_time(iterative)}")
+    recursive = timed(lambda: RecursiveTreeVisualizer().visit(tree))
+    iterative = timed(lambda: TreeVisualizer().visit(tree))
+    print(f"{'visualizer':<12} {'flat':<8} {args.flat_size:>7} {format_time(recursive)} {format_time(iterative)}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
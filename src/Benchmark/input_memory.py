@@ -0,0 +1,96 @@
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+from antlr4 import FileStream, Token
+from Controller.regex_lexer import RegexLexer
+from Controller.mapped_stream import MappedInputStream
+from Benchmark.program_generator import ProgramGenerator
+
+# Input streams compared, by the name of their compile_file input mode
+STREAMS = {'read': FileStream, 'mmap': MappedInputStream}
+
+# Phases measured: only opening the stream, or also lexing the whole source
+PHASES = ('open', 'lex')
+
+
+def write_source(path: str, megabytes: int):
+    """Writes a generated program of about 'megabytes' MB, repeating the same 10000 lines."""
+    chunk = ProgramGenerator(seed=0).generate(10000)
+    target = megabytes * 1024 * 1024
+    written = 0
+    with open(path, 'w', encoding='ascii', newline='') as file:
+        while written < target:
+            file.write(chunk)
+            written += len(chunk)
+
+
+def count_tokens(lexer):
+    """Lexes the whole input without keeping the tokens, returns how many there were."""
+    count = 0
+    while True:
+        if lexer.match_token() is not None:
+            count += 1
+            continue
+        count += 1
+        if lexer.nextToken().type == Token.EOF:
+            return count
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes (ru_maxrss is in KB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure(mode: str, phase: str, path: str):
+    """Opens (and lexes) a source in this process, returns its time and peak RSS."""
+    baseline = peak_rss()
+    start = time.perf_counter()
+    input_stream = STREAMS[mode](path)
+    tokens = count_tokens(RegexLexer(input_stream)) if phase == 'lex' else None
+    elapsed = time.perf_counter() - start
+    return {'mode': mode, 'phase': phase, 'seconds': elapsed, 'baseline': baseline, 'peak': peak_rss(),
+            'tokens': tokens}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compares the peak RSS of reading a source with FileStream and with "
+                                                 "MappedInputStream, each in its own process.")
+    parser.add_argument("--megabytes", type=int, default=100, help="Size of the generated source.")
+    parser.add_argument("--source", default=None, help="Measure this file instead of a generated one.")
+    parser.add_argument("--phases", nargs="+", choices=PHASES, default=PHASES, help="Phases to measure.")
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "PHASE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure(*args.child)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.source
+        if path is None:
+            path = os.path.join(directory, "generated.cspt")
+            write_source(path, args.megabytes)
+        size = os.path.getsize(path)
+        print(f"Source: {size / 1024 / 1024:.1f} MB\n")
+
+        print(f"{'input':<6} {'phase':<6} {'seconds':>8} {'tokens':>10} {'peak RSS MB':>12} {'over baseline MB':>17}")
+        for phase in args.phases:
+            for mode in STREAMS:
+                # A fresh process per measurement, ru_maxrss never goes down
+                output = subprocess.run([sys.executable, "-m", "Benchmark.input_memory", "--child", mode, phase, path],
+                                        check=True, capture_output=True, text=True).stdout
+                result = json.loads(output)
+                tokens = result['tokens'] if result['tokens'] is not None else '-'
+                print(f"{mode:<6} {phase:<6} {result['seconds']:>8.2f} {tokens:>10} "
+                      f"{result['peak'] / 1024 / 1024:>12.1f} {(result['peak'] - result['baseline']) / 1024 / 1024:>17.1f}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
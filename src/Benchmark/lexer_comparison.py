@@ -0,0 +1,126 @@
+import gc
+import sys
+import time
+import random
+import argparse
+from antlr4 import InputStream, CommonTokenStream
+from Language.compiscriptLexer import compiscriptLexer
+from Controller.regex_lexer import RegexLexer
+from Controller.batch import collect_sources
+from Controller.custom_exception import CollectingErrorListener
+from Benchmark.program_generator import ProgramGenerator
+from Benchmark.parser_comparison import EDGE_CASES
+
+# Lines of the programs whose lexing throughput is measured
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+# Characters inserted by the mutations: the ends of strings and comments, line breaks,
+# characters of no token and the starts of the tokens that need more than one character
+MUTATION_CHARACTERS = ('"', '\\', '/', '//', '\n', '\r\n', '\t', '@', '#', '$', '~', 'é', '.', '1.', '=', '!')
+
+
+def lex(lexer_class, source: str):
+    """
+    Lexes a source with a collecting error listener.
+
+    Returns:
+        - The tokens as (type, channel, start, stop, line, column, text) tuples, the lexer
+          errors as (message, span) tuples, and the line and column the lexer ended at.
+    """
+    lexer = lexer_class(InputStream(source))
+    lexer.removeErrorListeners()
+    listener = CollectingErrorListener()
+    lexer.addErrorListener(listener)
+    stream = CommonTokenStream(lexer)
+    stream.fill()
+    tokens = [(token.type, token.channel, token.start, token.stop, token.line, token.column, token.text)
+              for token in stream.tokens]
+    errors = [(diagnostic.message, diagnostic.span) for diagnostic in listener.diagnostics]
+    return tokens, errors, (lexer.line, lexer.column)
+
+
+def mutants(source: str, count: int, rng):
+    """Yields 'count' copies of a source with a few characters inserted or deleted."""
+    for _ in range(count):
+        mutated = source
+        for _ in range(rng.randint(1, 3)):
+            position = rng.randrange(len(mutated) + 1)
+            if rng.random() < 0.3:
+                mutated = mutated[:position] + mutated[position + 1:]
+            else:
+                mutated = mutated[:position] + rng.choice(MUTATION_CHARACTERS) + mutated[position:]
+        yield mutated
+
+
+def compare(sources):
+    """
+    Lexes every source with compiscriptLexer and RegexLexer.
+
+    Returns:
+        - The number of sources with lexer errors and the names of the sources the lexers disagree on.
+    """
+    with_errors = 0
+    differences = []
+    for name, source in sources:
+        expected = lex(compiscriptLexer, source)
+        if lex(RegexLexer, source) != expected:
+            differences.append(name)
+        elif expected[1]:
+            with_errors += 1
+    return with_errors, differences
+
+
+def best_time(lexer_class, source: str, repeat: int):
+    """Returns the best time of filling a CommonTokenStream over 'repeat' runs, and the number of tokens."""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        stream = CommonTokenStream(lexer_class(InputStream(source)))
+        stream.fill()
+        best = min(best, time.perf_counter() - start)
+    return best, len(stream.tokens)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Checks that RegexLexer gives the same tokens and lexer errors as "
+                                                 "compiscriptLexer, and compares their throughput.")
+    parser.add_argument("paths", nargs="*", help="Extra source files or directories to compare.")
+    parser.add_argument("--programs", type=int, default=100, help="Generated programs to compare, one per seed.")
+    parser.add_argument("--lines", type=int, default=60, help="Lines of each generated program.")
+    parser.add_argument("--mutants", type=int, default=20, help="Mutated copies of each generated program.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Lines of the measured programs.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size under 100000 lines, the best is kept.")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    sources = [(f"edge case {index}", source) for index, source in enumerate(EDGE_CASES)]
+    for path in collect_sources(args.paths):
+        with open(path, 'r', encoding='utf-8') as file:
+            sources.append((path, file.read()))
+    for seed in range(args.programs):
+        source = ProgramGenerator(seed=seed).generate(args.lines)
+        sources.append((f"seed {seed}", source))
+        sources.extend((f"seed {seed} mutant {index}", mutant)
+                       for index, mutant in enumerate(mutants(source, args.mutants, rng)))
+
+    with_errors, differences = compare(sources)
+    print(f"{len(sources)} sources compared, {with_errors} with lexer errors, {len(differences)} differences")
+    for name in differences[:20]:
+        print(f"  {name}")
+
+    print(f"\n{'lines':>8} {'tokens':>9} {'antlr ms':>10} {'regex ms':>10} {'antlr tokens/s':>15} "
+          f"{'regex tokens/s':>15} {'speedup':>8}")
+    for size in sorted(args.sizes):
+        source = ProgramGenerator(seed=0).generate(size)
+        repeat = args.repeat if size < 100000 else 1
+        antlr_time, tokens = best_time(compiscriptLexer, source, repeat)
+        regex_time, _ = best_time(RegexLexer, source, repeat)
+        print(f"{source.count(chr(10)):>8} {tokens:>9} {antlr_time * 1000:>10.1f} {regex_time * 1000:>10.1f} "
+              f"{tokens / antlr_time:>15,.0f} {tokens / regex_time:>15,.0f} {antlr_time / regex_time:>7.1f}x")
+
+    return 0 if not differences else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
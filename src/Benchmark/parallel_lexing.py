@@ -0,0 +1,116 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from antlr4 import FileStream
+from Language.compiscriptLexer import compiscriptLexer
+from Controller.regex_lexer import RegexLexer
+from Controller.mapped_stream import MappedInputStream
+from Controller.token_buffer import TokenBuffer
+from Controller.parallel_lexer import lex_parallel
+from Controller.custom_exception import CollectingErrorListener
+from Benchmark.program_generator import ProgramGenerator
+from Benchmark.lexer_comparison import mutants
+from Benchmark.input_memory import write_source
+
+# Lexers and input streams checked against the serial compiscriptLexer over a FileStream
+LEXERS = {'antlr': compiscriptLexer, 'regex': RegexLexer}
+STREAMS = {'read': FileStream, 'mmap': MappedInputStream}
+
+
+def lex(lexer_class, stream_class, path: str, workers: int = 1, chunks: int = None):
+    """
+    Lexes a file into a TokenBuffer, serially if 'workers' is 1, with a collecting error listener.
+
+    Returns:
+        - The tokens as (type, start, stop, line, column, text) tuples, the lexer errors
+          as (message, span) tuples, and the line, column and index the lexer ended at.
+    """
+    lexer = lexer_class(stream_class(path))
+    lexer.removeErrorListeners()
+    listener = CollectingErrorListener()
+    lexer.addErrorListener(listener)
+    buffer = lex_parallel(lexer, workers, chunks) if workers > 1 else TokenBuffer.from_lexer(lexer)
+    tokens = [(buffer.types[index], buffer.starts[index], buffer.stops[index], buffer.lines[index],
+               buffer.columns[index], buffer.text(index)) for index in range(len(buffer))]
+    errors = [(diagnostic.message, diagnostic.span) for diagnostic in listener.diagnostics]
+    return tokens, errors, (lexer.line, lexer.column, lexer.inputStream.index)
+
+
+def compare(sources, directory: str, workers: int, rng):
+    """
+    Lexes every source serially and in a random number of chunks, with every lexer and input stream.
+
+    Returns:
+        - The number of sources with lexer errors and the names of the sources (and the lexer
+          and stream) the parallel lexing disagrees on.
+    """
+    path = os.path.join(directory, "source.cspt")
+    with_errors = 0
+    differences = []
+    for name, source in sources:
+        with open(path, 'w', encoding='ascii', newline='') as file:
+            file.write(source)
+        expected = lex(compiscriptLexer, FileStream, path)
+        with_errors += bool(expected[1])
+        for lexer_name, lexer_class in LEXERS.items():
+            for stream_name, stream_class in STREAMS.items():
+                if lex(lexer_class, stream_class, path, workers, rng.randint(2, 16)) != expected:
+                    differences.append(f"{name} ({lexer_name}, {stream_name})")
+    return with_errors, differences
+
+
+def check_sources(count: int, rng):
+    """Generated programs with strings across lines, and mutants of them (most with lexer errors)."""
+    sources = []
+    for seed in range(count):
+        source = ProgramGenerator(seed=seed).generate(200)
+        # Break some strings across lines, the split points must not fall inside them
+        source = source.replace('"', '"\n', rng.randint(0, 6))
+        sources.append((f"generated-{seed}", source))
+        sources.extend((f"generated-{seed}-mutant-{index}", mutant.encode('ascii', 'ignore').decode('ascii'))
+                       for index, mutant in enumerate(mutants(source, 5, rng)))
+    return sources
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Checks that lexing a file in chunks across processes gives the "
+                                                 "same tokens and errors as compiscriptLexer, and times it.")
+    parser.add_argument("--programs", type=int, default=20, help="Generated programs checked, each with 5 mutants.")
+    parser.add_argument("--megabytes", type=int, default=20, help="Size of the generated source that is timed.")
+    parser.add_argument("--workers", type=int, nargs="+", default=(2, 4), help="Worker processes timed.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the mutations and of the number of chunks.")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        sources = check_sources(args.programs, rng)
+        with_errors, differences = compare(sources, directory, max(args.workers), rng)
+        print(f"Checked {len(sources)} sources ({with_errors} with lexer errors) with {len(LEXERS) * len(STREAMS)} "
+              f"lexer and stream pairs: {len(differences)} differences")
+        for name in differences:
+            print(f"  {name}")
+
+        path = os.path.join(directory, "generated.cspt")
+        write_source(path, args.megabytes)
+        print(f"\nSource: {os.path.getsize(path) / 1024 / 1024:.1f} MB, {os.cpu_count()} cores\n")
+        print(f"{'lexer':<6} {'input':<6} {'workers':>8} {'seconds':>8} {'tokens':>10} {'speedup':>8}")
+        for lexer_name, lexer_class in LEXERS.items():
+            for stream_name, stream_class in STREAMS.items():
+                serial = None
+                for workers in (1, *args.workers):
+                    start = time.perf_counter()
+                    lexer = lexer_class(stream_class(path))
+                    buffer = lex_parallel(lexer, workers) if workers > 1 else TokenBuffer.from_lexer(lexer)
+                    elapsed = time.perf_counter() - start
+                    serial = serial or elapsed
+                    print(f"{lexer_name:<6} {stream_name:<6} {workers:>8} {elapsed:>8.2f} {len(buffer):>10} "
+                          f"{serial / elapsed:>7.2f}x")
+
+    return 0 if not differences else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+import gc
+import sys
+import time
+import random
+import argparse
+from antlr4 import InputStream, CommonTokenStream, Token
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.Errors import ParseCancellationException
+from Language.compiscriptLexer import compiscriptLexer
+from Controller.compiler import create_parser, parse_program
+from Controller.lowering import ASTBuilder
+from Controller.fast_parser import parse_fast
+from Controller.hybrid_parser import HybridParser
+from Controller.batch import collect_sources
+from Controller.custom_exception import ThrowingErrorListener
+from Benchmark.program_generator import ProgramGenerator
+
+# Programs at the edges of the assignment and anonymous function rules, valid and invalid
+EDGE_CASES = (
+    "a = 1;", "a.b = 1;", "a.b.c = 1;", "a().b = 1;", "a[0].b = 1;", "this.x = 1;", "super.x.y = 1;",
+    "a = b = c;", "a = b.c = d;", "a.b = c.d = 1;", "fun () {}.x = 1;", "var f = fun () {}.x = 1;",
+    "f(fun () {}.x = 1);", "var x = fun (a, b) { return a; };", "print fun () {};", "fun () {};", "fun f() {}",
+    "a + b = 1;", "(a) = 1;", "this = 1;", "super.x = 1;", "a() = 1;", "a[0] = 1;", "-a = 1;", "!a.b = 1;",
+    "1 = 1;", "a or b = 1;", "a == b = 1;", "a.b + 1 = 2;", "fun () {}.x;", "fun () {}();", "fun () {}.x.y = 1;",
+    "-fun () {}.x = 1;", "(fun () {}.x) = 1;", "fun () {}.x == 1;", "a = ;", "= 1;", "a.b. = 1;",
+    "if (a) if (b) x = 1; else y = 2;", "for (a = 1; a < 2; a = a + 1) print a;", "for (;;) {}",
+)
+
+# Tokens inserted by the mutations, the ones around the assignment and anonymous function rules
+MUTATION_TOKENS = ('=', '.', '(', ')', 'fun', '{', '}', ';', 'a', '1', '+', '-', '!', '[', ']', ',', 'else')
+
+
+def token_stream(source: str):
+    lexer = compiscriptLexer(InputStream(source))
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(ThrowingErrorListener.INSTANCE)
+    stream = CommonTokenStream(lexer)
+    stream.fill()
+    return stream
+
+
+def ast_outline(program):
+    """
+    Lists the nodes of an AST in preorder, with their attributes, spans and number of
+    children, which describes the whole tree and can be compared with '=='.
+    """
+    outline = []
+    pending = [program]
+    while pending:
+        node = pending.pop()
+        children = list(node.children())
+        attributes = tuple((name, getattr(node, name)) for name in type(node).__slots__ if name not in node.fields)
+        outline.append((type(node).__name__, attributes, node.span, len(children)))
+        pending.extend(reversed(children))
+    return outline
+
+
+def parse_outline(source: str, parse_mode: str = 'two-stage'):
+    """Parses and lowers a source with compiscriptParser, returning its AST outline or 'syntax error'."""
+    try:
+        stream = token_stream(source)
+        tree = parse_program(stream, parse_mode)
+    except ParseCancellationException:
+        return "syntax error"
+    return ast_outline(ASTBuilder().visit(tree))
+
+
+def mutants(source: str, count: int, rng):
+    """Yields 'count' copies of a source with one token deleted, duplicated or replaced."""
+    tokens = [token.text for token in token_stream(source).tokens if token.type != Token.EOF]
+    for _ in range(count):
+        mutated = list(tokens)
+        position = rng.randrange(len(mutated))
+        operation = rng.random()
+        if operation < 0.3:
+            del mutated[position]
+        elif operation < 0.6:
+            mutated.insert(position, mutated[position])
+        else:
+            mutated[position] = rng.choice(MUTATION_TOKENS)
+        yield " ".join(mutated)
+
+# Lines of the programs whose parse throughput is measured
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+def fast_outline(source: str):
+    """Parses a source with the FastParser, returning its AST outline or 'syntax error'."""
+    try:
+        return ast_outline(parse_fast(token_stream(source)))
+    except ParseCancellationException:
+        return "syntax error"
+
+
+def parse_hybrid(stream):
+    """Parses a token stream with the HybridParser and lowers it, the way compile_file does before any fallback."""
+    return ASTBuilder().visit(create_parser(stream, PredictionMode.SLL, bail=True, parser_class=HybridParser).program())
+
+
+def hybrid_outline(source: str):
+    """Parses a source with the HybridParser, returning its AST outline or 'syntax error'."""
+    try:
+        return ast_outline(parse_hybrid(token_stream(source)))
+    except ParseCancellationException:
+        return "syntax error"
+
+
+def compare(sources):
+    """
+    Parses every source with the ANTLR parser (and ASTBuilder), the HybridParser and the FastParser.
+
+    Returns:
+        - The number of sources the three parsers accepted and the names of the sources and
+          parsers that disagree with ANTLR.
+    """
+    accepted = 0
+    differences = []
+    for name, source in sources:
+        expected = parse_outline(source)
+        outlines = (('hybrid', hybrid_outline(source)), ('fast', fast_outline(source)))
+        disagree = [parser for parser, outline in outlines if outline != expected]
+        if disagree:
+            differences.append(f"{name} ({', '.join(disagree)})")
+        elif expected != "syntax error":
+            accepted += 1
+    return accepted, differences
+
+
+def best_time(run, repeat: int):
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Checks that the hybrid and hand-written parsers build the same ASTs "
+                                                 "as the ANTLR parser, and compares their throughput.")
+    parser.add_argument("paths", nargs="*", help="Extra source files or directories to compare.")
+    parser.add_argument("--programs", type=int, default=100, help="Generated programs to compare, one per seed.")
+    parser.add_argument("--lines", type=int, default=60, help="Lines of each generated program.")
+    parser.add_argument("--mutants", type=int, default=10, help="Mutated copies of each generated program.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Lines of the measured programs.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size under 100000 lines, the best is kept.")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    sources = [(f"edge case {index}", source) for index, source in enumerate(EDGE_CASES)]
+    for path in collect_sources(args.paths):
+        with open(path, 'r', encoding='utf-8') as file:
+            sources.append((path, file.read()))
+    for seed in range(args.programs):
+        # More classes than the default, so methods and 'this' are covered too
+        source = ProgramGenerator(seed=seed, classes=0.2).generate(args.lines)
+        sources.append((f"seed {seed}", source))
+        sources.extend((f"seed {seed} mutant {index}", mutant)
+                       for index, mutant in enumerate(mutants(source, args.mutants, rng)))
+
+    accepted, differences = compare(sources)
+    print(f"{len(sources)} programs compared, {accepted} accepted by all, {len(differences)} differences")
+    for name in differences[:20]:
+        print(f"  {name}")
+
+    # The ANTLR and hybrid times include ASTBuilder, since the fast parser builds the AST itself
+    print(f"\n{'lines':>8} {'antlr ms':>10} {'hybrid ms':>10} {'fast ms':>10} {'antlr lines/s':>14} "
+          f"{'hybrid lines/s':>15} {'fast lines/s':>14} {'hybrid':>7} {'fast':>7}")
+    for size in sorted(args.sizes):
+        source = ProgramGenerator(seed=0).generate(size)
+        lines = source.count("\n")
+        stream = token_stream(source)
+        repeat = args.repeat if size < 100000 else 1
+
+        def antlr():
+            stream.seek(0)
+            ASTBuilder().visit(parse_program(stream))
+
+        def hybrid():
+            stream.seek(0)
+            parse_hybrid(stream)
+
+        antlr()  # Warm the DFA caches
+        hybrid()
+        antlr_time = best_time(antlr, repeat)
+        hybrid_time = best_time(hybrid, repeat)
+        fast_time = best_time(lambda: parse_fast(stream), repeat)
+        print(f"{lines:>8} {antlr_time * 1000:>10.1f} {hybrid_time * 1000:>10.1f} {fast_time * 1000:>10.1f} "
+              f"{lines / antlr_time:>14,.0f} {lines / hybrid_time:>15,.0f} {lines / fast_time:>14,.0f} "
+              f"{antlr_time / hybrid_time:>6.1f}x {antlr_time / fast_time:>6.1f}x")
+
+    return 0 if not differences else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
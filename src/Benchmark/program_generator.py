@@ -0,0 +1,223 @@
+import sys
+import random
+import argparse
+
+
+class ProgramGenerator:
+    """
+    Seeded generator of valid CompiScript programs of a given number of lines.
+
+    The program is a sequence of top-level units: variable declarations, functions,
+    classes and statements, one statement per line. Nested statements (if, while
+    and for) go down to 'depth' levels. Every program passes the semantic analyzer:
+    expressions only combine numbers and variables declared as numbers, names are
+    never declared twice and free functions are never called, since the analyzer
+    does not resolve function names in expressions yet. Classes are only parsed.
+
+    The same seed and parameters always give the same program.
+
+    Attributes:
+        - functions: Share of the top-level units that are function declarations (0 to 1).
+        - classes: Share of the top-level units that are class declarations (0 to 1).
+        - loops: Chance that a statement is a loop or an if instead of a simple statement (0 to 1).
+        - depth: Maximum nesting depth of the statements.
+        - expression_length: Number of operands of the arithmetic expressions.
+        - body_size: Maximum number of statements of a block.
+    """
+    def __init__(self, seed=0, functions=0.2, classes=0.05, loops=0.3, depth=3, expression_length=4, body_size=4):
+        self.random = random.Random(seed)
+        self.functions = functions
+        self.classes = classes
+        self.loops = loops
+        self.depth = depth
+        self.expression_length = max(1, expression_length)
+        self.body_size = max(1, body_size)
+
+        self.lines = []
+        self.indent = 0
+        self.visible = []           # Number variables visible in the open scopes, innermost last
+        self.marks = []             # Length of 'visible' when each open block was entered
+        self.names = 0              # Counter used to give every name a unique suffix
+
+
+    def generate(self, lines: int):
+        """Returns the source of a program with at least 'lines' lines."""
+        self.lines = []
+        self.visible = []
+        while len(self.lines) < lines:
+            roll = self.random.random()
+            if roll < self.functions:
+                self.function()
+            elif roll < self.functions + self.classes:
+                self.class_declaration()
+            elif len(self.visible) < 2 or roll < 0.5:
+                self.variable()
+            else:
+                self.statement(0)
+        return "\n".join(self.lines) + "\n"
+
+
+    # ---------- Helpers ----------
+
+    def emit(self, line: str):
+        self.lines.append("    " * self.indent + line)
+
+    def new_name(self, prefix: str):
+        self.names += 1
+        return f"{prefix}{self.names}"
+
+    def open_block(self, header: str):
+        self.emit(header + " {")
+        self.indent += 1
+        self.marks.append(len(self.visible))
+
+    def close_block(self):
+        # The variables of the block go out of scope
+        del self.visible[self.marks.pop():]
+        self.indent -= 1
+        self.emit("}")
+
+
+    # ---------- Expressions ----------
+
+    def operand(self, names):
+        if names and self.random.random() < 0.6:
+            return self.random.choice(names)
+        return str(self.random.randint(0, 999))
+
+    def arithmetic(self, length=None):
+        """Numeric expression with 'length' operands, such as 'a + 2 * b - 7'."""
+        names = self.visible
+        length = length or self.random.randint(1, self.expression_length)
+        parts = [self.operand(names)]
+        for _ in range(length - 1):
+            parts.append(self.random.choice(('+', '-', '*', '/')))
+            parts.append(self.operand(names))
+        return " ".join(parts)
+
+    def condition(self):
+        """Boolean expression made of comparisons, joined with 'and' or 'or'."""
+        comparisons = [f"{self.arithmetic(2)} {self.random.choice(('<', '<=', '>', '>='))} {self.arithmetic(1)}"
+                       for _ in range(self.random.randint(1, 2))]
+        return f" {self.random.choice(('and', 'or'))} ".join(comparisons)
+
+
+    # ---------- Statements ----------
+
+    def variable(self):
+        name = self.new_name("v")
+        self.emit(f"var {name} = {self.arithmetic()};")
+        self.visible.append(name)
+
+    def simple_statement(self):
+        names = self.visible
+        roll = self.random.random()
+        if roll < 0.4 or not names:
+            self.variable()
+        elif roll < 0.7:
+            self.emit(f"{self.random.choice(names)} = {self.arithmetic()};")
+        else:
+            self.emit(f"print {self.arithmetic()};")
+
+    def body(self, level: int):
+        for _ in range(self.random.randint(1, self.body_size)):
+            self.statement(level)
+
+    def statement(self, level: int):
+        if level >= self.depth or self.random.random() >= self.loops:
+            self.simple_statement()
+            return
+
+        kind = self.random.choice(('if', 'while', 'for'))
+        if kind == 'if':
+            self.open_block(f"if ({self.condition()})")
+            self.body(level + 1)
+            self.close_block()
+            if self.random.random() < 0.5:
+                self.open_block("else")
+                self.body(level + 1)
+                self.close_block()
+        elif kind == 'while':
+            counter = self.new_name("w")
+            self.emit(f"var {counter} = 0;")
+            self.visible.append(counter)
+            self.open_block(f"while ({counter} < {self.random.randint(1, 100)})")
+            self.body(level + 1)
+            self.emit(f"{counter} = {counter} + 1;")
+            self.close_block()
+        else:
+            counter = self.new_name("i")
+            self.open_block(f"for (var {counter} = 0; {counter} < {self.random.randint(1, 100)}; {counter} = {counter} + 1)")
+            self.visible.append(counter)
+            self.body(level + 1)
+            self.close_block()
+
+
+    # ---------- Declarations ----------
+
+    def function(self):
+        name = self.new_name("f")
+        parameters = [self.new_name("p") for _ in range(self.random.randint(0, 3))]
+        self.open_block(f"fun {name}({', '.join(parameters)})")
+        # Parameters have no type, so they are only used in the two operand expression of the result,
+        # which is always a number
+        result = self.new_name("r")
+        names = self.visible + parameters
+        self.emit(f"var {result} = {self.operand(names)} {self.random.choice(('+', '-', '*', '/'))} {self.operand(names)};")
+        self.visible.append(result)
+        self.body(1)
+        self.emit(f"return {result};")
+        self.close_block()
+
+    def class_declaration(self):
+        name = self.new_name("C")
+        self.emit(f"class {name} {{")
+        self.indent += 1
+        self.emit("init(value) {")
+        self.emit("    this.value = value;")
+        self.emit("}")
+        for _ in range(self.random.randint(1, 3)):
+            self.emit(f"{self.new_name('m')}(x) {{")
+            self.emit("    return this.value + x;")
+            self.emit("}")
+        self.indent -= 1
+        self.emit("}")
+
+        instance = self.new_name("o")
+        self.emit(f"var {instance} = new {name}({self.random.randint(0, 99)});")
+
+
+def add_generator_arguments(parser):
+    """Adds the options of the generator to an argument parser."""
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generator.")
+    parser.add_argument("--functions", type=float, default=0.2, help="Share of top-level functions.")
+    parser.add_argument("--classes", type=float, default=0.05, help="Share of top-level classes.")
+    parser.add_argument("--loops", type=float, default=0.3, help="Chance of a nested statement.")
+    parser.add_argument("--depth", type=int, default=3, help="Maximum nesting depth.")
+    parser.add_argument("--expression-length", type=int, default=4, help="Maximum operands of an expression.")
+
+
+def generator_from_args(args):
+    """Creates the generator described by the options added with add_generator_arguments."""
+    return ProgramGenerator(seed=args.seed, functions=args.functions, classes=args.classes, loops=args.loops,
+                            depth=args.depth, expression_length=args.expression_length)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generates a valid CompiScript program.")
+    parser.add_argument("lines", type=int, help="Number of lines of the program.")
+    add_generator_arguments(parser)
+    parser.add_argument("-o", "--output", default=None, help="Output file (default: standard output).")
+    args = parser.parse_args(argv)
+
+    source = generator_from_args(args).generate(args.lines)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(source)
+    else:
+        sys.stdout.write(source)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import sys
+import time
+import logging
+import argparse
+from antlr4 import InputStream, CommonTokenStream
+from Language.compiscriptLexer import compiscriptLexer
+from Controller.compiler import parse_program
+from Controller.lowering import ASTBuilder
+from Controller.resolver import Resolver
+from Controller.Driver import SemanticAnalyzer
+from Model.scope import ScopeManager, BindingScopeManager
+
+# Nesting depths of the generated programs
+DEFAULT_DEPTHS = (25, 50, 100, 200)
+
+# Statements declared at every nesting level
+DEFAULT_WIDTH = 40
+
+# Parsing and analyzing deep blocks recurses a few frames per level
+sys.setrecursionlimit(20000)
+
+
+def generate_nested(depth: int, width: int):
+    """
+    Generates a program with 'depth' nested blocks. Every level declares 'width'
+    variables that read the global variable and the variable of the enclosing level.
+    """
+    lines = ["var g = 1;", "var v0 = 0;"]
+    for level in range(1, depth + 1):
+        lines.append("{")
+        lines.append(f"var v{level} = v{level - 1} + g;")
+        for i in range(width):
+            lines.append(f"var w{level}_{i} = g + v{level};")
+    lines.append("}" * depth)
+    return "\n".join(lines)
+
+
+def analyze(program, scope_manager_class, repeat=3):
+    """Returns the best time in seconds spent analyzing the program with a scope manager."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        analyzer = SemanticAnalyzer(logger=logging.getLogger("compiscript.benchmark"), scope_manager=scope_manager_class())
+        analyzer.visit(program)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compares the scope managers on deeply nested programs.")
+    parser.add_argument("--depths", type=int, nargs="+", default=DEFAULT_DEPTHS, help="Nesting depths to measure.")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH, help="Declarations at every nesting level.")
+    args = parser.parse_args(argv)
+
+    print(f"{'depth':>6} {'tree':>9} {'binding':>9} {'resolved':>9}")
+    for depth in sorted(args.depths):
+        stream = CommonTokenStream(compiscriptLexer(InputStream(generate_nested(depth, args.width))))
+        stream.fill()
+        tree = parse_program(stream)
+
+        # Name lookups walk the scope chain with ScopeManager and use the stacks with BindingScopeManager
+        by_name = ASTBuilder().visit(tree)
+        tree_time = analyze(by_name, ScopeManager)
+        binding_time = analyze(by_name, BindingScopeManager)
+
+        # Resolved occurrences skip the name lookups, only declarations still look names up
+        resolved = Resolver().resolve(ASTBuilder().visit(tree))
+        resolved_time = analyze(resolved, BindingScopeManager)
+
+        print(f"{depth:>6} {tree_time:>8.3f}s {binding_time:>8.3f}s {resolved_time:>8.3f}s")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
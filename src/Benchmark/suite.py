@@ -0,0 +1,185 @@
+import gc
+import os
+import sys
+import json
+import math
+import shutil
+import logging
+import platform
+import argparse
+import tempfile
+from antlr4 import InputStream, CommonTokenStream
+from Language.compiscriptLexer import compiscriptLexer
+from Controller.compiler import compile_file, parse_program
+from Controller.metrics import CompileMetrics
+from Model.parse_tree import TreeVisualizer
+from Benchmark.program_generator import add_generator_arguments, generator_from_args
+
+# Number of lines of the generated programs, 1000000 is supported but takes minutes and gigabytes
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+# Phases compared against the baseline, in pipeline order
+PHASES = ('lex', 'parse', 'visualize', 'render', 'lower', 'resolve', 'analyze')
+
+# Programs from this size on are compiled once, whatever --repeat says
+LARGE_SIZE = 100000
+
+# A phase regresses when its throughput falls more than this fraction below the baseline
+DEFAULT_THRESHOLD = 0.25
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Logger of the compilations, the generated programs are valid so nothing is expected
+logger = logging.getLogger("compiscript.benchmark")
+logger.addHandler(logging.NullHandler())
+logger.propagate = False
+
+
+def run_pipeline(source: str, visualize=False, trace_memory=False):
+    """
+    Compiles a source text and returns its CompileMetrics.
+
+    The parse tree visualizer is measured on a second parse of the source, since
+    compile_file only runs it together with the graphviz render. The render itself
+    is only measured when graphviz's 'dot' program is installed.
+    """
+    metrics = CompileMetrics(trace_memory=trace_memory)
+    try:
+        compile_file("<generated>", logger, input_stream=InputStream(source), metrics=metrics)
+
+        if visualize:
+            stream = CommonTokenStream(compiscriptLexer(InputStream(source)))
+            stream.fill()
+            tree = parse_program(stream)
+            visualizer = TreeVisualizer()
+            with metrics.phase('visualize'):
+                visualizer.visit(tree)
+            if shutil.which('dot'):
+                with tempfile.TemporaryDirectory() as output_dir, metrics.phase('render'):
+                    visualizer.render(output_file='benchmark', format='svg', output_dir=output_dir)
+    finally:
+        metrics.close()
+    return metrics
+
+
+def measure_size(source: str, repeat: int, visualize=False, trace_memory=False):
+    """Returns the best wall time of each phase over 'repeat' runs, the counts and peak memory of the last one."""
+    best = {}
+    for _ in range(repeat):
+        # Don't charge the garbage of the previous run to this one
+        gc.collect()
+        metrics = run_pipeline(source, visualize, trace_memory)
+        for phase in metrics.phases:
+            best[phase.name] = min(best.get(phase.name, phase.wall), phase.wall)
+    peak_memory = {phase.name: phase.peak_memory for phase in metrics.phases} if trace_memory else None
+    return best, metrics.counts, peak_memory
+
+
+def scaling_exponent(small_size, small_time, large_size, large_time):
+    """Returns k such that the time grows like size**k between two sizes, 1.0 is linear."""
+    if small_time <= 0 or large_time <= 0:
+        return float('nan')
+    return math.log(large_time / small_time) / math.log(large_size / small_size)
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares the throughput of each phase and size against the baseline.
+
+    Returns:
+        - The list of regression messages, empty if no phase regressed.
+    """
+    regressions = []
+    for size, phases in results.items():
+        reference = baseline.get(str(size), {})
+        for phase, lines_per_second in phases.items():
+            expected = reference.get(phase)
+            if expected and lines_per_second < expected * (1 - threshold):
+                regressions.append(f"{phase} at {size} lines: {lines_per_second:,.0f} lines/s, "
+                                   f"baseline {expected:,.0f} lines/s ({lines_per_second / expected - 1:+.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measures the throughput and scaling of every phase on generated programs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Lines of the generated programs.")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help=f"Runs per size under {LARGE_SIZE} lines, the best time of each phase is kept.")
+    parser.add_argument("--visualize", action="store_true", help="Also measure the parse tree visualizer (and the render, if dot is installed).")
+    parser.add_argument("--memory", action="store_true", help="Also record the peak memory of each phase (slows every phase down).")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file the throughputs are compared against.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the throughputs of this run as the baseline.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Throughput drop, as a fraction of the baseline, that fails the run.")
+    parser.add_argument("--json", default=None, metavar="FILE", help="Write the results to a JSON file.")
+    add_generator_arguments(parser)
+    args = parser.parse_args(argv)
+
+    sizes = sorted(args.sizes)
+    # Load the ATN of the lexer and the parser before measuring anything
+    run_pipeline(generator_from_args(args).generate(50))
+
+    # Programs are generated once, with the same seed the smaller ones are a prefix of the larger ones
+    throughput = {}
+    report = {'python': platform.python_version(), 'sizes': {}}
+    previous = None
+
+    print(f"{'lines':>8} {'phase':<10} {'best ms':>10} {'lines/s':>12} {'scaling':>8} {'peak KB':>10}")
+    for size in sizes:
+        source = generator_from_args(args).generate(size)
+        lines = source.count("\n")
+        repeat = args.repeat if size < LARGE_SIZE else 1
+        times, counts, peak_memory = measure_size(source, repeat, args.visualize, args.memory)
+
+        throughput[size] = {}
+        for phase in PHASES:
+            if phase not in times:
+                continue
+            wall = times[phase]
+            throughput[size][phase] = lines / wall if wall > 0 else float('inf')
+            # Growth of the time against the previous size, 1.0 is linear
+            exponent = scaling_exponent(previous[0], previous[1][phase], lines, wall) \
+                if previous is not None and phase in previous[1] else None
+            scaling = '-' if exponent is None else f"{exponent:.2f}"
+            peak = '-' if peak_memory is None else f"{peak_memory[phase] / 1024:.0f}"
+            print(f"{lines:>8} {phase:<10} {wall * 1000:>10.1f} {throughput[size][phase]:>12,.0f} {scaling:>8} {peak:>10}")
+
+        print(f"{'':>8} {', '.join(f'{name} {value}' for name, value in counts.items())}")
+        report['sizes'][size] = {'lines': lines, 'times': times, 'throughput': throughput[size],
+                                 'counts': counts, 'peak_memory': peak_memory}
+        previous = (lines, times)
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.memory:
+        # Tracing memory slows every phase down, the throughputs can't be compared with a baseline
+        print("\nThroughputs measured with --memory are not compared with the baseline")
+        return 0
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump({'python': report['python'], 'throughput': throughput}, file, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}, run with --save-baseline to store one")
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)['throughput']
+    regressions = compare(throughput, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regressions beyond {args.threshold:.0%} of the baseline:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+
+    print(f"\nNo phase is more than {args.threshold:.0%} slower than the baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
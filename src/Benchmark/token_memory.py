@@ -0,0 +1,91 @@
+import gc
+import sys
+import time
+import argparse
+import tracemalloc
+from antlr4 import InputStream, CommonTokenStream
+from Language.compiscriptLexer import compiscriptLexer
+from Controller.regex_lexer import RegexLexer
+from Controller.token_buffer import TokenBuffer, ColumnarTokenStream
+from Controller.fast_parser import parse_fast
+from Controller.compiler import parse_program
+from Controller.lowering import ASTBuilder
+from Benchmark.program_generator import ProgramGenerator
+
+# Lines of the programs whose tokens are measured
+DEFAULT_SIZES = (10000, 100000)
+
+
+def token_list(lexer):
+    stream = CommonTokenStream(lexer)
+    stream.fill()
+    return stream
+
+
+def token_columns(lexer):
+    return ColumnarTokenStream(TokenBuffer.from_lexer(lexer))
+
+
+def measure_store(store, lexer_class, input_stream):
+    """
+    Lexes an input into a token store twice, once timed and once tracing the memory the store keeps.
+
+    Returns:
+        - The token stream, the seconds it took and the bytes it holds once filled.
+    """
+    input_stream.reset()
+    gc.collect()
+    start = time.perf_counter()
+    store(lexer_class(input_stream))
+    elapsed = time.perf_counter() - start
+
+    input_stream.reset()
+    gc.collect()
+    tracemalloc.start()
+    stream = store(lexer_class(input_stream))
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return stream, elapsed, held
+
+
+def best_parse_time(run, stream, repeat: int):
+    best = float('inf')
+    for _ in range(repeat):
+        stream.seek(0)
+        gc.collect()
+        start = time.perf_counter()
+        run(stream)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compares the memory and speed of a CommonTokenStream and of the "
+                                                 "columnar TokenBuffer.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Lines of the measured programs.")
+    parser.add_argument("--repeat", type=int, default=3, help="Parses per size under 100000 lines, the best is kept.")
+    args = parser.parse_args(argv)
+
+    parsers = (('fast', parse_fast), ('antlr', lambda stream: ASTBuilder().visit(parse_program(stream))))
+    print(f"{'lines':>8} {'tokens':>9} {'lexer':<6} {'store':<8} {'lex ms':>9} {'MB':>8} {'bytes/token':>12} "
+          + " ".join(f"{name + ' ms':>10}" for name, _ in parsers))
+    for size in sorted(args.sizes):
+        source = ProgramGenerator(seed=0).generate(size)
+        lines = source.count("\n")
+        input_stream = InputStream(source)
+        repeat = args.repeat if size < 100000 else 1
+        for lexer_name, lexer_class in (('antlr', compiscriptLexer), ('regex', RegexLexer)):
+            for store_name, store in (('list', token_list), ('columns', token_columns)):
+                stream, elapsed, held = measure_store(store, lexer_class, input_stream)
+                tokens = len(stream.tokens)
+                parse_times = " ".join(f"{best_parse_time(run, stream, repeat) * 1000:>10.1f}" for _, run in parsers)
+                print(f"{lines:>8} {tokens:>9} {lexer_name:<6} {store_name:<8} {elapsed * 1000:>9.1f} "
+                      f"{held / 1024 / 1024:>8.1f} {held / tokens:>12.1f} {parse_times}")
+                del stream
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
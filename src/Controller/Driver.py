@@ -1,627 +1,753 @@
-from Language.compiscriptVisitor import compiscriptVisitor
-from Language.compiscriptParser import compiscriptParser
 from Controller.semantic_utils import *
 from Model.data_types import *
 from Model.object_types import *
+from types import GeneratorType
 from Model.scope import ScopeManager
 from Model.symbol_table import Symbol
+from Controller.custom_exception import SemanticError
+from Controller.diagnostics import Diagnostic
+import Model.ast_nodes as ast
 
-class SemanticAnalyzer(compiscriptVisitor):
+class SemanticAnalyzer:
     """
-    Class that implements the visitor pattern to perform semantic analysis on the parse
-    tree generated by the ANTLR parser.
+    Class that implements the visitor pattern to perform semantic analysis on the AST
+    lowered from the parse tree generated by the ANTLR parser (see Controller.lowering).
 
     The semantic analyzer is responsible for creating the symbol table and performing
     type checking on the program.
+
+    By default the analysis stops at the first error with a SemanticError. With
+    collect_errors every error is recorded as a Diagnostic instead, the offending
+    expression gets the ERROR_TYPE and the analysis goes on, so a single pass finds
+    every error of the program.
+
+    Statements that contain statements (blocks, ifs, loops and functions) are walked with
+    an explicit stack instead of recursion, so the nesting depth of the program is not
+    limited by the Python recursion limit. Their visit methods are generators that yield
+    the nested statement and get its result back, see walk(). Expressions are visited
+    recursively: their depth is bounded by the precedence levels, and assignment and
+    call chains are followed with a loop.
     """
-    def __init__(self, logger=None):
-        self.scope_manager = ScopeManager()         # Create a scope manager
+    # Visit method for each level of binary operators
+    BINARY_LEVELS = {
+        'or': 'visitLogic_or',
+        'and': 'visitLogic_and',
+        '==': 'visitEquality', '!=': 'visitEquality',
+        '<': 'visitComparison', '<=': 'visitComparison', '>': 'visitComparison', '>=': 'visitComparison',
+        '+': 'visitTerm', '-': 'visitTerm',
+        '*': 'visitFactor', '/': 'visitFactor', '%': 'visitFactor',
+    }
+
+    # Visit method for each kind of declaration, any other node is a statement
+    DECLARATIONS = {
+        ast.FunDecl: 'visitFunDecl',
+        ast.VarDecl: 'visitVarDecl',
+        ast.ClassDecl: 'visitClassDecl',
+    }
+
+    # Visit method for each kind of statement, called as (node, scope_name, function_symbol)
+    STATEMENTS = {
+        ast.ExprStmt: 'visitExprStmt',
+        ast.IfStmt: 'visitIfStmt',
+        ast.ForStmt: 'visitForStmt',
+        ast.WhileStmt: 'visitWhileStmt',
+        ast.ReturnStmt: 'visitReturnStmt',
+        ast.PrintStmt: 'visitPrintStmt',
+        ast.Block: 'visitNestedBlock',
+    }
+
+    def __init__(self, logger=None, tracer=None, scope_manager=None, collect_errors=False):
+        self.scope_manager = scope_manager or ScopeManager()    # Scope manager, BindingScopeManager is a drop-in alternative
         self.logger = logger                        # Get the logger for the class
+        self.tracer = tracer                        # Trace buffer (see Controller.trace), None when tracing is off
         self.in_print_ctx = False                   # Flag to indicate if the visitor is in a print statement context
         self.in_return_ctx = False                  # Flag to indicate if the visitor is in a return statement context
+        self.diagnostics = [] if collect_errors else None   # Errors found so far, None to stop at the first one
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Subclasses may override visit methods, resolve the tables again for them
+        cls._build_dispatch_tables()
+
+    @classmethod
+    def _build_dispatch_tables(cls):
+        """
+        Resolves the method names of the dispatch tables into functions once per class,
+        so every node is routed with a single dictionary lookup on its class instead of
+        a chain of isinstance checks or a getattr on the method name.
+        """
+        cls._visit_table = {}
+        for node_class in ast.NODE_CLASSES:
+            method = getattr(cls, 'visit' + node_class.__name__, None)
+            if method is not None:
+                cls._visit_table[node_class] = method
+        cls._declaration_table = {node_class: getattr(cls, name) for node_class, name in cls.DECLARATIONS.items()}
+        cls._statement_table = {node_class: getattr(cls, name) for node_class, name in cls.STATEMENTS.items()}
+        cls._binary_table = {operator: getattr(cls, name) for operator, name in cls.BINARY_LEVELS.items()}
+
+    def visit(self, node: ast.Node):
+        result = self._visit_table[type(node)](self, node)
+        if type(result) is GeneratorType:
+            return self.walk(result)
+        return result
+
+    def walk(self, generator):
+        """
+        Runs the generator of a visit method to completion and returns its result.
+
+        The generators of the pending visit methods are kept on an explicit stack. Each
+        one yields a node to visit it, or the result of calling another visit method:
+        a generator is pushed on the stack, any other value is sent back as is. An
+        exception is thrown into the generator that was waiting for the failed one,
+        like it would propagate through recursive calls.
+        """
+        stack = [generator]
+        value = None
+        error = None
+        while stack:
+            try:
+                if error is None:
+                    request = stack[-1].send(value)
+                else:
+                    request = stack[-1].throw(error)
+                    error = None
+            except StopIteration as stop:
+                # The visit method returned, its result goes to the one waiting for it
+                stack.pop()
+                value = stop.value
+                continue
+            except Exception as e:
+                # The visit method failed, the one waiting for it gets the exception
+                stack.pop()
+                if not stack:
+                    raise
+                error = e
+                continue
+
+            if isinstance(request, ast.Node):
+                try:
+                    request = self._visit_table[type(request)](self, request)
+                except Exception as e:
+                    # A plain visit method failed, the generator that yielded the node gets the exception
+                    error = e
+                    continue
+
+            if type(request) is GeneratorType:
+                stack.append(request)
+                value = None
+            else:
+                value = request
+
+        return value
+
+    def _trace(self, event, node=None, data_type=None, detail=None):
+        # Only called behind 'if self.tracer is not None:' so nothing is built when tracing is off
+        self.tracer.emit(event, node, self.scope_manager.current_scope, data_type, detail)
+
+    def error(self, code, message, node):
+        """Reports a semantic error found on a node, see report()."""
+        return self.report(SemanticError(code, message), node)
 
-    def visitProgram(self, ctx: compiscriptParser.ProgramContext):
+    def report(self, error: SemanticError, node):
+        """
+        Reports a semantic error found on a node. When the analyzer stops at the first error it is
+        raised, otherwise it is recorded and ERROR_TYPE is returned as the type of the offending expression.
+        """
+        if error.span is None:
+            error.span = node.span
+        if self.tracer is not None:
+            self._trace('error', node, detail=error.code)
+        if self.diagnostics is None:
+            raise error
+        self.diagnostics.append(Diagnostic.from_error(error, self.scope_manager.current_scope.name))
+        return ERROR_TYPE
+
+
+
+    def visitProgram(self, node: ast.Program):
+        if self.tracer is not None:
+            self._trace('enter_scope', node, detail=self.scope_manager.current_scope.name)
         # Enter the global scope
-        self.logger.debug("Entered global scope")
-        return self.visitChildren(ctx)
-    
-
-
-    def visitDeclaration(self, ctx: compiscriptParser.DeclarationContext, function_symbol=None):
-        self.logger.debug("Visiting declaration")
-        # Check if the declaration is a variable declaration
-        if ctx.funDecl() is not None:
-            # Visit the function declaration
-            self.logger.debug("Visiting function declaration in declaration")
-            self.visitFunDecl(ctx.funDecl())
-        
-        elif ctx.varDecl() is not None:
-            # Visit the variable declaration
-            self.logger.debug("Visiting variable declaration in declaration")
-            self.visitVarDecl(ctx.varDecl())
-
-        # Check if the declaration is a statement
-        elif ctx.statement() is not None:
+        for declaration in node.declarations:
+            # Only nested statements need the stack, the other declarations are already done
+            result = self.visitDeclaration(declaration)
+            if type(result) is GeneratorType:
+                yield result
+
+
+
+    def visitDeclaration(self, node: ast.Node, function_symbol=None):
+        # Route the declaration to the visit method of its class
+        handler = self._declaration_table.get(type(node))
+        if handler is not None:
+            return handler(self, node)
+
+        # Otherwise the declaration is a statement
+        else:
             # Visit the statement
-            self.logger.debug("Visiting statement in declaration")
-            return self.visitStatement(ctx.statement(), function_symbol=function_symbol)
-        
-
-
-    def visitStatement(self, ctx: compiscriptParser.StatementContext, scope_name=None, function_symbol=None):
-        self.logger.debug("Visiting statement")
-        # Check if the statement is a expression statement
-        if ctx.exprStmt() is not None:
-            # Visit the expression statement
-            self.logger.debug("Visiting expression statement in statement")
-            return self.visitExprStmt(ctx.exprStmt())
-
-        # Check if the statement is a if statement
-        elif ctx.ifStmt() is not None:
-            # Visit the if statement
-            self.logger.debug("Visiting if statement in statement")
-            return self.visitIfStmt(ctx.ifStmt())
-        
-        # Check if the statement is a for statement
-        elif ctx.forStmt() is not None:
-            # Visit the for statement
-            self.logger.debug("Visiting for statement in statement")
-            return self.visitForStmt(ctx.forStmt())
-        
-        # Check if the statement is a while statement
-        elif ctx.whileStmt() is not None:
-            # Visit the while statement
-            self.logger.debug("Visiting while statement in statement")
-            return self.visitWhileStmt(ctx.whileStmt())
-        
-        # Check if the statement is a return statement
-        elif ctx.returnStmt() is not None:
-            # Visit the return statement
-            self.logger.debug("Visiting return statement in statement")
-            return self.visitReturnStmt(ctx.returnStmt(), function_symbol=function_symbol)
-        
-        # Check if the statement is a print statement
-        elif ctx.printStmt() is not None:
-            # Visit the print statement
-            self.logger.debug("Visiting print statement in statement")
-            return self.visitPrintStmt(ctx.printStmt())
-        
-        # Check if the statement is a block statement
-        elif ctx.block() is not None:
-            # Visit the block statement
-            self.logger.debug("Visiting block statement in statement")
-            return self.visitBlockStmt(ctx.block(), scope_name)
-        
-
-
-    def visitForStmt(self, ctx: compiscriptParser.ForStmtContext):
-        self.logger.debug("Visiting for statement")
-        
+            return self.visitStatement(node, function_symbol=function_symbol)
+
+
+
+    def visitClassDecl(self, node: ast.ClassDecl):
+        # Class declarations are not analyzed yet
+        if self.tracer is not None:
+            self._trace('skip', node, detail=node.name)
+
+
+
+    def visitStatement(self, node: ast.Node, scope_name=None, function_symbol=None):
+        # Route the statement to the visit method of its class
+        handler = self._statement_table.get(type(node))
+        if handler is not None:
+            return handler(self, node, scope_name, function_symbol)
+
+
+
+    def visitNestedBlock(self, node: ast.Block, scope_name=None, function_symbol=None):
+        # Blocks nested in a statement get the scope name but not the enclosing function
+        return self.visitBlockStmt(node, scope_name)
+
+
+
+    def visitForStmt(self, node: ast.ForStmt, scope_name=None, function_symbol=None):
+
         # Enter the scope of the for loop
-        self.logger.debug("Entered for loop scope")
         self.scope_manager.enter_scope("For Loop")
+        if self.tracer is not None:
+            self._trace('enter_scope', node, detail="For Loop")
 
         # Visit the initialization (variable declaration or expression statement)
-        if ctx.varDecl() is not None:
-            self.logger.debug("Visiting variable declaration in for loop")
-            self.visitVarDecl(ctx.varDecl())
-        elif ctx.exprStmt() is not None:
-            self.logger.debug("Visiting expression statement in for loop initialization")
-            self.visitExprStmt(ctx.exprStmt())
-        else:
-            self.logger.debug("No initialization in for loop")
+        if isinstance(node.initializer, ast.VarDecl):
+            self.visitVarDecl(node.initializer)
+        elif isinstance(node.initializer, ast.ExprStmt):
+            self.visitExprStmt(node.initializer)
 
         # Visit the condition (optional)
-        if ctx.expression(0) is not None:
-            self.logger.debug("Visiting condition expression in for loop")
-            condition_type = self.visitExpression(ctx.expression(0))
-            validate_boolean_expression_type(condition_type, " in for loop condition")
-        else:
-            self.logger.debug("No condition in for loop (infinite loop unless broken)")
+        if node.condition is not None:
+            condition_type = self.visit(node.condition)
+            try:
+                validate_boolean_expression_type(condition_type, " in for loop condition")
+            except SemanticError as e:
+                self.report(e, node.condition)
 
         # Visit the update expression (optional)
-        if ctx.expression(1) is not None:
-            self.logger.debug("Visiting update expression in for loop")
-            self.visitExpression(ctx.expression(1)) 
-        else:
-            self.logger.debug("No update expression in for loop")
+        if node.update is not None:
+            self.visit(node.update)
 
         # Visit the body of the for loop
-        if ctx.statement() is not None:
-            self.logger.debug("Entering body scope of for loop")
+        if node.body is not None:
             # Enter the scope of the body
-            self.scope_manager.enter_scope("For Loop Body")  
+            self.scope_manager.enter_scope("For Loop Body")
             # Visit the body of the for loop
-            self.visitStatement(ctx.statement())
+            yield self.visitStatement(node.body)
             # Exit the scope of the body
             self.scope_manager.exit_scope()
 
         # Exit the scope of the for loop
-        self.logger.debug("Exited for loop scope")
         self.scope_manager.exit_scope()
 
 
 
-    def visitWhileStmt(self, ctx: compiscriptParser.WhileStmtContext):
-        self.logger.debug("Visiting while statement")
+    def visitWhileStmt(self, node: ast.WhileStmt, scope_name=None, function_symbol=None):
 
         # Visit the condition expression
-        if ctx.expression() is not None:
-            self.logger.debug("Visiting condition expression in while loop")
-            condition_type = self.visitExpression(ctx.expression())
-            validate_boolean_expression_type(condition_type, " in while loop condition")
+        if node.condition is not None:
+            condition_type = self.visit(node.condition)
+            try:
+                validate_boolean_expression_type(condition_type, " in while loop condition")
+            except SemanticError as e:
+                self.report(e, node.condition)
         else:
-            raise Exception("While loop must have a condition expression.")
+            self.error('missing-condition', "While loop must have a condition expression.", node)
 
         # Visit the body of the while loop
-        if ctx.statement() is not None:
-            self.logger.debug("Visiting body of while loop")
-            self.visitStatement(ctx.statement(), "While Loop")   
+        if node.body is not None:
+            yield self.visitStatement(node.body, "While Loop")
 
 
 
-    def visitReturnStmt(self, ctx: compiscriptParser.ReturnStmtContext, function_symbol=None):
-        self.logger.debug("Visiting return statement")
+    def visitReturnStmt(self, node: ast.ReturnStmt, scope_name=None, function_symbol=None):
         # If there is an expression in the return statement, visit it
-        if ctx.expression() is not None:
-            self.logger.debug("Visiting expression in return statement")
-            return_type = self.visitExpression(ctx.expression())
+        if node.value is not None:
+            return_type = self.visit(node.value)
 
             # Check if the function has a return dependent on parameters
             # using the return context flag
             if not self.in_return_ctx:
                 # Return not dependent on parameters
                 # Check if the function has a return type defined
-                if isinstance(function_symbol.return_type, NilType):
+                if function_symbol.return_type is NIL_TYPE:
                     function_symbol.return_type = return_type
                     self.scope_manager.update_symbol(function_symbol.name, function_symbol, Function)
-                    self.logger.debug(f"Inferred return type for function '{function_symbol.name}' is '{return_type}'")
+                    if self.tracer is not None:
+                        self._trace('infer_return', node, return_type, function_symbol.name)
                 else:
                     # Validate that the return type matches the function's return type
-                    if str(function_symbol.return_type) != str(return_type):
-                        raise Exception(f"Type mismatch: Cannot return '{return_type}' from function '{function_symbol.name}' with return type '{function_symbol.return_type}'")
-            else:
+                    if function_symbol.return_type is not return_type and ERROR_TYPE not in (function_symbol.return_type, return_type):
+                        self.error('return-mismatch', f"Type mismatch: Cannot return '{return_type}' from function '{function_symbol.name}' with return type '{function_symbol.return_type}'", node)
+            elif self.tracer is not None:
                 # Postpone validation if we are in a return context (params-dependent)
-                self.logger.debug("Postponing return type validation due to parameter dependency")
+                self._trace('postpone', node, return_type, function_symbol.name)
         else:
             # Set the return type to NilType if there is no return expression
-            return_type = NilType()
-            self.logger.debug("No return expression in return statement")
+            return_type = NIL_TYPE
             self.scope_manager.update_symbol(function_symbol.name, function_symbol, Function)
 
 
-    def visitPrintStmt(self, ctx: compiscriptParser.PrintStmtContext):
-        self.logger.debug("Visiting print statement")
+    def visitPrintStmt(self, node: ast.PrintStmt, scope_name=None, function_symbol=None):
 
-        # Change print context flag to True 
+        # Change print context flag to True
         # to indicate that the visitor is in a print statement
         self.in_print_ctx = True
 
         # Visit the expression inside the print statement
-        self.visit(ctx.expression())
+        self.visit(node.expression)
 
-        # Change print context flag to False 
+        # Change print context flag to False
         # to indicate that the visitor is no longer in a print statement
         self.in_print_ctx = False
 
 
-    def visitBlockStmt(self, ctx: compiscriptParser.BlockContext, scope_name=None, function_symbol=None):
-        self.logger.debug("Visiting block statement")
+    def visitBlockStmt(self, node: ast.Block, scope_name=None, function_symbol=None):
         # Enter a new scope for the block
         if scope_name is not None:
-            self.logger.debug(f"Entered block scope '{scope_name}'")
             self.scope_manager.enter_scope(scope_name)
         else:
-            self.logger.debug("Entered block scope")
             self.scope_manager.enter_scope("Block Scope")
+        if self.tracer is not None:
+            self._trace('enter_scope', node, detail=self.scope_manager.current_scope.name)
 
         # Visit the block statements
-        self.logger.debug("Visiting block statements")
-        for i in range(len(ctx.declaration())):
-            self.logger.debug(f"Visiting declaration {i} in block statement")
-            self.visitDeclaration(ctx.declaration(i), function_symbol)
+        for declaration in node.declarations:
+            result = self.visitDeclaration(declaration, function_symbol)
+            if type(result) is GeneratorType:
+                yield result
 
         # Exit the block scope
-        self.logger.debug("Exited block scope")
+        if self.tracer is not None:
+            self._trace('exit_scope', node)
         self.scope_manager.exit_scope()
-        
-
 
-    def visitFunDecl(self, ctx: compiscriptParser.FunDeclContext):
-        self.logger.debug("Visiting function declaration")
-        # Visit the function
-        if ctx.function() is not None:
-            self.logger.debug("Visiting function in function declaration")
-            self.visitFunction(ctx.function())
-        else:
-            raise Exception("Function declaration must have a function definition.")
 
 
-    def visitVarDecl(self, ctx: compiscriptParser.VarDeclContext):
+    def visitVarDecl(self, node: ast.VarDecl):
         # Get the variable identifier
-        self.logger.debug("Visiting variable declaration")
-        identifier = ctx.IDENTIFIER().getText()
-        self.logger.debug(f"Started variable declaration for var: {identifier}")
+        identifier = node.name
 
         # Check if the variable already exists in the current scope
-        self.logger.debug(f"Checking if variable '{identifier}' already exists in the current scope")
         existing_var = self.scope_manager.get_symbol(identifier, Variable)
         if existing_var is not None:
             # Variable already exists in the current scope
-            raise Exception(f"Variable '{identifier}' already exists in the current scope.")
-        
+            self.error('duplicate-variable', f"Variable '{identifier}' already exists in the current scope.", node)
+            self.scope_manager.reserve_slot(existing_var)
+            return
+
         # Create a new variable symbol and add it to the current scope in the symbol table
-        self.logger.debug(f"Creating new variable symbol for '{identifier}'")
         variable = Variable(data_type=None) # Initialize the variable without defining its data type
         new_var_symbol = Symbol(name=identifier, obj_type=variable)
 
         # Add the variable to the current scope
-        self.logger.debug(f"Adding variable '{identifier}' to current scope {self.scope_manager.current_scope}")
         self.scope_manager.add_symbol(new_var_symbol)
-        self.logger.debug(f"Added variable {identifier} to current scope {self.scope_manager.current_scope}")
 
         # Check if the variable has an initialization expression
-        if ctx.expression() is not None:
+        if node.initializer is not None:
             # Visit the expression to infer its type
-            self.logger.debug(f"Visiting expression to infer type for variable '{identifier}'")
-            expression_type = self.visit(ctx.expression())
+            expression_type = self.visit(node.initializer)
             variable.data_type = expression_type
-            self.logger.debug(f"Inferred type for variable {identifier}: {expression_type}")
-        else:
-            self.logger.debug(f"No initial value for '{identifier}', type is undefined.")
 
-        # Log the variable declaration
-        self.logger.debug(f"Variable '{identifier}' declared with type '{variable.data_type}' in {self.scope_manager.current_scope}")
+        if self.tracer is not None:
+            self._trace('declare', node, variable.data_type, identifier)
+
 
 
+    def visitExprStmt(self, node: ast.ExprStmt, scope_name=None, function_symbol=None):
+        if node.expression is not None:
+            return self.visit(node.expression)
 
-    def visitExprStmt(self, ctx: compiscriptParser.ExprStmtContext):
-        self.logger.debug("Visiting expression statement")
-        if ctx.expression() is not None:
-            self.logger.debug("Visiting expression in expression statement")
-            return self.visitExpression(ctx.expression())
-        
 
 
-    def visitIfStmt(self, ctx: compiscriptParser.IfStmtContext):
-        self.logger.debug("Visiting if statement")
+    def visitIfStmt(self, node: ast.IfStmt, scope_name=None, function_symbol=None):
         # Check if the if statement has an expression
-        if ctx.expression() is not None:
-            self.logger.debug("Visiting expression in if statement")
+        if node.condition is not None:
             # Visit the expression to infer its type
-            condition_type = self.visitExpression(ctx.expression())
+            condition_type = self.visit(node.condition)
             # Validate that the condition type is BooleanType
-            validate_boolean_expression_type(condition_type, " in if statement")
+            try:
+                validate_boolean_expression_type(condition_type, " in if statement")
+            except SemanticError as e:
+                self.report(e, node.condition)
         else:
-            raise Exception("If statement must have a condition expression.")
-        
-        if ctx.statement(0) is not None:
-            self.logger.debug("Visiting statement in if statement")
-            self.visitStatement(ctx.statement(0), "If Block")
-        else:
-            raise Exception("If statement must have a body.")
+            self.error('missing-condition', "If statement must have a condition expression.", node)
 
-        if ctx.statement(1) is not None:
-            self.logger.debug("Visiting statement in else statement")
-            self.visitStatement(ctx.statement(1), "Else Block")
+        if node.then_branch is not None:
+            yield self.visitStatement(node.then_branch, "If Block")
         else:
-            self.logger.debug("No else statement in if statement")
+            self.error('missing-body', "If statement must have a body.", node)
+
+        if node.else_branch is not None:
+            yield self.visitStatement(node.else_branch, "Else Block")
 
 
 
-    def visitFunction(self, ctx: compiscriptParser.FunctionContext):
-        self.logger.debug("Visiting function")
+    def visitFunDecl(self, node: ast.FunDecl):
         # Get the function identifier
-        identifier = ctx.IDENTIFIER().getText()
-        self.logger.debug(f"Started function declaration for function '{identifier}'")
+        identifier = node.name
 
         # Check if the function already exists in the current scope
-        self.logger.debug(f"Checking if function '{identifier}' already exists in the current scope")
         existing_function = self.scope_manager.get_symbol(identifier, Function)
         if existing_function is not None:
             # Function already exists in the current scope
-            raise Exception(f"Function '{identifier}' already exists in the current scope.")
-        
+            self.error('duplicate-function', f"Function '{identifier}' already exists in the current scope.", node)
+            self.scope_manager.reserve_slot(existing_function)
+            return
+
         # Create a new function symbol and add it to the current scope in the symbol table
-        self.logger.debug(f"Creating new function symbol for '{identifier}'")
-        function = Function(return_type = NilType())
+        function = Function(return_type = NIL_TYPE)
         function_symbol = Symbol(name=identifier, obj_type=function)
-        self.logger.debug(f"Adding function '{identifier}' to current scope {self.scope_manager.current_scope}")
         self.scope_manager.add_symbol(function_symbol)
 
         # Enter the scope of the function
-        self.logger.debug(f"Entered function scope '{identifier}'")
         scope_name = f"Function '{identifier}'"
         self.scope_manager.enter_scope(scope_name)
+        if self.tracer is not None:
+            self._trace('declare', node, detail=identifier)
+            self._trace('enter_scope', node, detail=scope_name)
         # Handle function parameters (if any)
-        if ctx.parameters() is not None:
-            self.logger.debug("Visiting parameters in function")
-            function_symbol.parameters = self.visitParameters(ctx.parameters())
+        if node.parameters is not None:
+            function_symbol.parameters = self.visitParameters(node.parameters, node)
             self.in_return_ctx = True
             self.scope_manager.update_symbol(identifier, function_symbol, Function)
-            self.logger.debug(f"Updated function '{identifier}' with parameters '{function_symbol.parameters}'")
-        else:
-            self.logger.debug("No parameters in function")
 
         # Visit the function body
-        if ctx.block() is not None:
-            self.logger.debug("Visiting block in function")
-            self.visitBlockStmt(ctx.block(), f"Function {identifier} Body", function_symbol)
-
-        # Update the function symbol
-        
-        self.logger.debug(f"Function '{identifier}' declared with return type '{function_symbol.return_type}' and parameters '{function_symbol.parameters}' in {self.scope_manager.current_scope}")
-        
+        if node.body is not None:
+            yield self.visitBlockStmt(node.body, f"Function {identifier} Body", function_symbol)
+
         # Exit the scope of the function
-        self.logger.debug(f"Exited function scope '{identifier}'")
+        if self.tracer is not None:
+            self._trace('exit_scope', node, function_symbol.return_type, identifier)
         self.scope_manager.exit_scope()
         self.in_return_ctx = False
-        
 
 
-    def visitParameters(self, ctx: compiscriptParser.ParametersContext):
-        self.logger.debug("Visiting parameters")
+
+    def visitParameters(self, parameters: list, node=None):
         params = []
         # Visit the parameter list
-        for param in ctx.IDENTIFIER():
-            # Get the parameter identifier
-            identifier = param.getText()
-            self.logger.debug(f"Started parameter declaration for parameter '{identifier}'")
+        for identifier in parameters:
 
             # Check if the parameter already exists in the current scope
-            self.logger.debug(f"Checking if parameter '{identifier}' already exists in the current scope")
             existing_param = self.scope_manager.get_symbol(identifier, Variable)
             if existing_param is not None:
                 # Parameter already exists in the current scope
-                raise Exception(f"Parameter '{identifier}' already exists in the current scope.")
-            
+                self.error('duplicate-parameter', f"Parameter '{identifier}' already exists in the current scope.", node)
+                self.scope_manager.reserve_slot(existing_param)
+                continue
+
             # Create a new parameter symbol and add it to the current scope in the symbol table
-            self.logger.debug(f"Creating new parameter symbol for '{identifier}'")
             parameter = Variable(data_type=None)
             new_param_symbol = Symbol(name=identifier, obj_type=parameter)
-            self.logger.debug(f"Adding parameter '{identifier}' to current scope {self.scope_manager.current_scope}")
             self.scope_manager.add_symbol(new_param_symbol)
 
-            self.logger.debug(f"Added parameter {identifier} to current scope {self.scope_manager.current_scope}")
             # Add the parameter to the function's parameter list
             params.append(parameter)
-        
+            if self.tracer is not None:
+                self._trace('declare', detail=identifier)
+
         return params
 
 
-    def visitExpression(self, ctx: compiscriptParser.ExpressionContext):
-        self.logger.debug("Visiting expression")
-        if ctx.assignment() is not None:
-            self.logger.debug("Visiting assignment in expression")
-            return self.visitAssignment(ctx.assignment())
 
+    def lookup_variable(self, node):
+        # Occurrences bound by the resolver are found by (level, slot), the others by name
+        if node.binding is not None:
+            return self.scope_manager.resolve(node.binding)
+        return self.scope_manager.get_symbol(node.name, Variable)
 
 
-    def visitAssignment(self, ctx: compiscriptParser.AssignmentContext):
-        self.logger.debug("Visiting assignment")
-        
-        if ctx.IDENTIFIER() is not None:
-            # Get the identifier of the variable being assigned
-            identifier = ctx.IDENTIFIER().getText()
-            self.logger.debug(f"Started assignment for variable '{identifier}'")
 
+    def visitAssign(self, node: ast.Assign):
+        # Follow an assignment chain 'a = b = ... = value' with a loop: the variables are
+        # looked up from the outermost assignment in, then the value is visited and the
+        # assignments are checked from the innermost out, like nested visits would
+        chain = []
+        while True:
             # Check if the variable exists in the current scope
-            variable_symbol = self.scope_manager.get_symbol(identifier, Variable)
+            variable_symbol = self.lookup_variable(node)
             if variable_symbol is None:
-                raise Exception(f"Variable '{identifier}' is not declared in the current scope - {self.scope_manager.current_scope}")
-            
-            # Get the variable symbol from the symbol table
-            self.logger.debug(f"Found variable '{identifier}' in {self.scope_manager.current_scope}")
-            # Visit the expression to infer its type
-            expression_type = self.visit(ctx.assignment())
-
-            # Check if the variable has a data type defined
-            if variable_symbol.object_type.data_type is None:
-                # Set the data type of the variable to the inferred type
-                variable_symbol.object_type.data_type = expression_type
-                self.logger.debug(f"Set type of variable '{identifier}' to '{expression_type}'")
-            
-            # Check if the variable's data type matches the inferred type
-            elif str(variable_symbol.object_type.data_type) != str(expression_type):
-                raise Exception(f"Type mismatch: Cannot assign '{expression_type}' to variable '{identifier}' of type '{variable_symbol.object_type.data_type}'")
-
-            self.logger.debug(f"Assigned value to variable '{identifier}' of type '{variable_symbol.object_type.data_type}'")
-
-        elif ctx.logic_or() is not None:
-            self.logger.debug("Visiting logic_or in assignment")
-            return self.visitLogic_or(ctx.logic_or())
-        
-
-        
-    def visitLogic_or(self, ctx: compiscriptParser.Logic_orContext):
-        self.logger.debug("Visiting logic_or")
-        # Check if there is only one 'logic_and' element
-        # meaning this step is a wrapper around 'logic_and' only
-        if len(ctx.logic_and()) == 1:
-            self.logger.debug("Single logic_and in logic_or")
-            return self.visitLogic_and(ctx.logic_and(0))
-        
+                self.error('undeclared-variable', f"Variable '{node.name}' is not declared in the current scope - {self.scope_manager.current_scope}", node)
+            chain.append((node, variable_symbol))
+            if type(node.value) is not ast.Assign and type(node.value) is not ast.Set:
+                break
+            node = node.value
+
+        # Visit the expression to infer its type
+        expression_type = self.visit(node.value)
+
+        for node, variable_symbol in reversed(chain):
+            # An undeclared variable was reported already, only its value was checked
+            if variable_symbol is not None:
+                self.check_assignment(node, variable_symbol, expression_type)
+            # The assignment itself has no type, it is the value of the enclosing one
+            expression_type = None
+
+
+    def check_assignment(self, node, variable_symbol, expression_type):
+        identifier = node.name
+
+        # Check if the variable has a data type defined
+        if variable_symbol.object_type.data_type is None:
+            # Set the data type of the variable to the inferred type
+            variable_symbol.object_type.data_type = expression_type
+            if self.tracer is not None:
+                self._trace('infer', node, expression_type, identifier)
+
+        # Check if the variable's data type matches the inferred type
+        elif variable_symbol.object_type.data_type is not expression_type and ERROR_TYPE not in (variable_symbol.object_type.data_type, expression_type):
+            self.error('assign-mismatch', f"Type mismatch: Cannot assign '{expression_type}' to variable '{identifier}' of type '{variable_symbol.object_type.data_type}'", node)
+
+        if self.tracer is not None:
+            self._trace('assign', node, expression_type, identifier)
+
+
+    # Property assignments are checked against the assigned name, like plain assignments
+    visitSet = visitAssign
+
+
+
+    def visitBinary(self, node: ast.Binary):
+        # Route the operator chain to the visit method of its precedence level
+        data_type = self._binary_table[node.operators[0]](self, node)
+        if self.tracer is not None:
+            self._trace('infer', node, data_type, node.operators[0])
+        return data_type
+
+
+
+    def visitLogic_or(self, node: ast.Binary):
+        # Walk the operands once, left to right
+        operands = iter(node.operands)
         # Get the left term type
-        left_term_type = self.visitLogic_and(ctx.logic_and(0))
+        left_term_type = self.visit(next(operands))
+        result_type = BOOLEAN_TYPE
 
         # Evaluate the rest of the 'logic_and' elements
-        for i in range(1, len(ctx.logic_and())):
-            self.logger.debug(f"Visiting logic_and {i} in logic_or")
+        for operand in operands:
             # Get the right term type
-            right_term_type = self.visitLogic_and(ctx.logic_and(i))
+            right_term_type = self.visit(operand)
+            if left_term_type is ERROR_TYPE or right_term_type is ERROR_TYPE:
+                # An operand already failed to type check and was reported, the chain fails with it
+                result_type = ERROR_TYPE
             # Validate the types for the 'or' operator are BooleanType
-            validate_logical_types(left_term_type, right_term_type, 'or')
+            try:
+                validate_logical_types(left_term_type, right_term_type, 'or')
+            except SemanticError as e:
+                # The whole chain takes the error type, its remaining operands are only visited
+                result_type = left_term_type = self.report(e, node)
+
+        return result_type
 
-        return BooleanType()
 
 
-        
-    def visitLogic_and(self, ctx: compiscriptParser.Logic_andContext):
-        self.logger.debug("Visiting logic_and")
-        # Check if there is only one 'equality' element
-        # meaning this step is a wrapper around 'equality' only
-        if len(ctx.equality()) == 1:
-            self.logger.debug("Single equality in logic_and")
-            return self.visitEquality(ctx.equality(0))
-        
+    def visitLogic_and(self, node: ast.Binary):
+        # Walk the operands once, left to right
+        operands = iter(node.operands)
         # Get the type of the left term
-        left_type = self.visitEquality(ctx.equality(0))
+        left_type = self.visit(next(operands))
+        result_type = BOOLEAN_TYPE
 
         # Evaluate the rest of the 'equality' elements
-        for i in range(1, len(ctx.equality())):
-            self.logger.debug(f"Visiting equality {i} in logic_and")
+        for operand in operands:
             # Get the type of the right term
-            right_type = self.visitEquality(ctx.equality(i))
+            right_type = self.visit(operand)
+            if left_type is ERROR_TYPE or right_type is ERROR_TYPE:
+                # An operand already failed to type check and was reported, the chain fails with it
+                result_type = ERROR_TYPE
             # Validate the types for the 'and' operator are BooleanType
-            validate_logical_types(left_type, right_type, 'and') 
+            try:
+                validate_logical_types(left_type, right_type, 'and')
+            except SemanticError as e:
+                # The whole chain takes the error type, its remaining operands are only visited
+                result_type = left_type = self.report(e, node)
 
-        return BooleanType()
+        return result_type
 
 
 
-    def visitEquality(self, ctx: compiscriptParser.EqualityContext):
-        self.logger.debug("Visiting equality")
-        # Check if there is only one 'comparison' element
-        # meaning this step is a wrapper around 'comparison' only
-        if len(ctx.comparison()) == 1:
-            self.logger.debug("Single comparison in equality")
-            return self.visitComparison(ctx.comparison(0))
-        
+    def visitEquality(self, node: ast.Binary):
+        # Walk the operands once, left to right
+        operands = iter(node.operands)
         # Get the type of the left term
-        left_type = self.visitComparison(ctx.comparison(0))
+        left_type = self.visit(next(operands))
+        result_type = BOOLEAN_TYPE
 
         # Evaluate the rest of the 'comparison' elements
-        for i in range(1, len(ctx.comparison())):
-            self.logger.debug(f"Visiting comparison {i} in equality")
+        for operator, operand in zip(node.operators, operands):
             # Get the type of the right term
-            right_type = self.visitComparison(ctx.comparison(i))
-            # Get the equality operator ('==', '!=')
-            operator = ctx.getChild(2 * i - 1).getText()
+            right_type = self.visit(operand)
+            if left_type is ERROR_TYPE or right_type is ERROR_TYPE:
+                # An operand already failed to type check and was reported, the chain fails with it
+                result_type = ERROR_TYPE
             # Validate the types for the equality operator are the same
             # and are either NumType or StringType
-            validate_equality_type(left_type, right_type, operator) 
+            try:
+                validate_equality_type(left_type, right_type, operator)
+            except SemanticError as e:
+                # The whole chain takes the error type, its remaining operands are only visited
+                result_type = left_type = self.report(e, node)
+
+        return result_type
 
-        return BooleanType()
 
 
-        
-    def visitComparison(self, ctx: compiscriptParser.ComparisonContext):
-        self.logger.debug("Visiting comparison")
-        # Check if there is only one 'term' element
-        # meaning this step is a wrapper around 'term' only
-        if len(ctx.term()) == 1:
-            self.logger.debug("Single term in comparison")
-            return self.visitTerm(ctx.term(0))
-        
+    def visitComparison(self, node: ast.Binary):
+        # Walk the operands once, left to right
+        operands = iter(node.operands)
         # Get the type of the left term
-        left_type = self.visitTerm(ctx.term(0))
-        self.logger.debug(f"Visited left term in comparison: {left_type}")
+        left_type = self.visit(next(operands))
+        result_type = BOOLEAN_TYPE
 
         # Evaluate the rest of the 'term' elements
-        for i in range(1, len(ctx.term())):
-            self.logger.debug(f"Visiting term {i} in comparison")
+        for operator, operand in zip(node.operators, operands):
             # Get the type of the right term
-            right_type = self.visitTerm(ctx.term(i))
-            self.logger.debug(f"Visited right term in comparison: {right_type}")
-            # Get the comparison operator ('<', '>', '<=', '>=')
-            operator = ctx.getChild(2 * i - 1).getText()
+            right_type = self.visit(operand)
+            if left_type is ERROR_TYPE or right_type is ERROR_TYPE:
+                # An operand already failed to type check and was reported, the chain fails with it
+                result_type = ERROR_TYPE
             # Validate the types for the comparison operator are NumType
-            validate_arithmetic_type(left_type, right_type, operator, 
-                                     logger=self.logger, 
-                                     print_context=self.in_print_ctx,
-                                     return_context=self.in_return_ctx) 
-
-        return BooleanType()
-    
-        
-
-    def visitTerm(self, ctx: compiscriptParser.TermContext):
-        self.logger.debug("Visiting term")
-        # Check if there is only one 'factor' element
-        # meaning this step is a wrapper around 'factor' only
-        if len(ctx.factor()) == 1:
-            self.logger.debug("Single factor in term")
-            return self.visitFactor(ctx.factor(0))
-        
+            try:
+                usage = validate_arithmetic_type(left_type, right_type, operator,
+                                                 print_context=self.in_print_ctx,
+                                                 return_context=self.in_return_ctx)
+                if self.tracer is not None and usage:
+                    self._trace(usage, node, detail=operator)
+            except SemanticError as e:
+                # The whole chain takes the error type, its remaining operands are only visited
+                result_type = left_type = self.report(e, node)
+
+        return result_type
+
+
+
+    def visitTerm(self, node: ast.Binary):
+        # Walk the operands once, left to right
+        operands = iter(node.operands)
         # Get the type of the left term
-        left_type = self.visitFactor(ctx.factor(0))
-        
+        left_type = self.visit(next(operands))
+        result_type = NUM_TYPE
+
         # Evaluate the rest of the 'factor' elements
-        for i in range(1, len(ctx.factor())):
-            self.logger.debug(f"Visiting factor {i} in term")
+        for operator, operand in zip(node.operators, operands):
             # Get the type of the right term
-            right_type = self.visitFactor(ctx.factor(i))
-            # Get the operator between the factors ('+', '-')
-            operator = ctx.getChild(2 * i - 1).getText()
+            right_type = self.visit(operand)
+            if left_type is ERROR_TYPE or right_type is ERROR_TYPE:
+                # An operand already failed to type check and was reported, the chain fails with it
+                result_type = ERROR_TYPE
             # Validate the types for the arithmetic operator are NumType
-            validate_arithmetic_type(left_type, right_type, operator, 
-                                     logger=self.logger, 
-                                     print_context=self.in_print_ctx,
-                                     return_context=self.in_return_ctx)
-
-        return NumType()
-    
-
-        
-    def visitFactor(self, ctx: compiscriptParser.FactorContext):
-        self.logger.debug("Visiting factor")
-        # Check if there is only one 'unary' element
-        # meaning this step is a wrapper around 'unary' only
-        if len(ctx.unary()) == 1:
-            self.logger.debug("Single unary in factor")
-            return self.visitUnary(ctx.unary(0))
+            try:
+                usage = validate_arithmetic_type(left_type, right_type, operator,
+                                                 print_context=self.in_print_ctx,
+                                                 return_context=self.in_return_ctx)
+                if self.tracer is not None and usage:
+                    self._trace(usage, node, detail=operator)
+            except SemanticError as e:
+                # The whole chain takes the error type, its remaining operands are only visited
+                result_type = left_type = self.report(e, node)
+
+        return result_type
 
+
+
+    def visitFactor(self, node: ast.Binary):
+        # Walk the operands once, left to right
+        operands = iter(node.operands)
         # Get the type of the left term
-        left_type = self.visitUnary(ctx.unary(0))
+        left_type = self.visit(next(operands))
+        result_type = NUM_TYPE
 
         # Evaluate the rest of the 'unary' elements
-        for i in range(1, len(ctx.unary())):
-            self.logger.debug(f"Visiting unary {i} in factor")
+        for operator, operand in zip(node.operators, operands):
             # Get the type of the right term
-            right_type = self.visitUnary(ctx.unary(i))
-            # Get the operator between the factors ('*', '/', '%')
-            operator = ctx.getChild(2 * i - 1).getText()
+            right_type = self.visit(operand)
+            if left_type is ERROR_TYPE or right_type is ERROR_TYPE:
+                # An operand already failed to type check and was reported, the chain fails with it
+                result_type = ERROR_TYPE
             # Validate the types for the arithmetic operator are NumType
-            validate_arithmetic_type(left_type, right_type, operator, 
-                                     logger=self.logger, 
-                                     print_context=self.in_print_ctx,
-                                     return_context=self.in_return_ctx)
-
-        return NumType()
-
-
-
-    def visitUnary(self, ctx: compiscriptParser.UnaryContext):
-        self.logger.debug("Visiting unary")
-        if ctx.call() is not None:
-            self.logger.debug("Visiting call in unary")
-            return self.visitCall(ctx.call())
-        
-
-
-    def visitCall(self, ctx: compiscriptParser.CallContext):
-        self.logger.debug("Visiting call")
-        if ctx.primary() is not None:
-            self.logger.debug("Visiting primary in call")
-            return self.visitPrimary(ctx.primary())
-        
-
-
-    def visitPrimary(self, ctx: compiscriptParser.PrimaryContext):
-        self.logger.debug("Visiting primary")
-        
-        if ctx.NUMBER() is not None:
-            return NumType()
-        elif ctx.STRING() is not None:
-            return StringType()
-        elif ctx.getText() == 'true' or ctx.getText() == 'false':
-            return BooleanType()
-        elif ctx.getText() == 'nil' or ctx.getText() == None:
-            return NilType()
-        elif ctx.IDENTIFIER() is not None:
-            identifier = ctx.IDENTIFIER().getText()
-            self.logger.debug(f"Getting type for identifier '{identifier}'")
-            variable_symbol = self.scope_manager.get_symbol(identifier, Variable)
-            if variable_symbol is None:
-                raise Exception(f"Variable '{identifier}' is not declared in the current scope.")
-            return variable_symbol.object_type.data_type
\ No newline at end of file
+            try:
+                usage = validate_arithmetic_type(left_type, right_type, operator,
+                                                 print_context=self.in_print_ctx,
+                                                 return_context=self.in_return_ctx)
+                if self.tracer is not None and usage:
+                    self._trace(usage, node, detail=operator)
+            except SemanticError as e:
+                # The whole chain takes the error type, its remaining operands are only visited
+                result_type = left_type = self.report(e, node)
+
+        return result_type
+
+
+
+    def visitUnary(self, node: ast.Unary):
+        # Unary operators are not type checked yet
+        return None
+
+
+
+    def visitCall(self, node: ast.Call):
+        # The type of a call chain is the type of its primary, follow the chain down to it
+        while True:
+            if type(node) is ast.Call:
+                node = node.callee
+            elif type(node) is ast.Get or type(node) is ast.Index:
+                node = node.object
+            else:
+                return self.visit(node)
+
+    visitGet = visitCall
+    visitIndex = visitCall
+
+
+
+    def visitLiteral(self, node: ast.Literal):
+        if node.kind == 'num':
+            return NUM_TYPE
+        elif node.kind == 'string':
+            return STRING_TYPE
+        elif node.kind == 'true' or node.kind == 'false':
+            return BOOLEAN_TYPE
+        elif node.kind == 'nil':
+            return NIL_TYPE
+
+
+    def visitIdentifier(self, node: ast.Identifier):
+        identifier = node.name
+        variable_symbol = self.lookup_variable(node)
+        if variable_symbol is None:
+            return self.error('undeclared-variable', f"Variable '{identifier}' is not declared in the current scope.", node)
+        if self.tracer is not None:
+            self._trace('infer', node, variable_symbol.object_type.data_type, identifier)
+        return variable_symbol.object_type.data_type
+
+    # 'super.name' is checked as the identifier after the dot
+    visitSuper = visitIdentifier
+
+
+    # Expressions whose type is not inferred yet
+    def visitFunAnon(self, node: ast.FunAnon):
+        return None
+
+    def visitThis(self, node: ast.This):
+        return None
+
+    def visitGrouping(self, node: ast.Grouping):
+        return None
+
+    def visitArrayLiteral(self, node: ast.ArrayLiteral):
+        return None
+
+    def visitNew(self, node: ast.New):
+        return None
+
+
+# Resolve the dispatch tables of the base analyzer
+SemanticAnalyzer._build_dispatch_tables()
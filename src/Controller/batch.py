@@ -0,0 +1,229 @@
+import os
+import time
+import logging
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+from antlr4 import InputStream
+from antlr4.error.Errors import ParseCancellationException
+from Controller.Driver import SemanticAnalyzer
+from Controller.compiler import compile_file
+from Controller.dfa_cache import load_dfa_snapshot
+from Controller.metrics import CompileMetrics
+from Controller.custom_exception import SemanticError, SemanticErrors
+
+# Logger used inside the worker processes, only warnings and errors get through
+worker_logger = logging.getLogger("compiscript.batch")
+worker_logger.setLevel(logging.WARNING)
+worker_logger.addHandler(logging.NullHandler())
+worker_logger.propagate = False
+
+
+class FileResult:
+    """
+    Outcome of compiling a single file in a batch.
+
+    Attributes:
+        - path: Path of the compiled file.
+        - error: Error message, or None if the file compiled successfully.
+        - elapsed: Wall time in seconds spent compiling the file.
+        - cached: Whether the outcome came from the result cache.
+        - metrics: Phase timings, memory and sizes of the compilation (see CompileMetrics.to_dict), or None.
+    """
+    def __init__(self, path: str, error: str = None, elapsed: float = 0.0, cached: bool = False, metrics: dict = None):
+        self.path = path
+        self.error = error
+        self.elapsed = elapsed
+        self.cached = cached
+        self.metrics = metrics
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def to_dict(self):
+        return {'path': self.path, 'error': self.error, 'elapsed': self.elapsed, 'cached': self.cached,
+                'metrics': self.metrics}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(data['path'], data['error'], data['elapsed'], data.get('cached', False), data.get('metrics'))
+
+    def __repr__(self):
+        return f"FileResult({self.path}, {'ok' if self.ok else self.error}, {self.elapsed:.4f}s)"
+
+
+def compile_worker(file_path: str, parse_mode='two-stage', cache=None, all_errors=False, timings=False, parser='antlr',
+                   lexer='antlr', token_store='list', input_mode='read', lex_jobs=1):
+    """
+    Compiles one file without rendering the parse tree. Runs inside a worker process.
+
+    Args:
+        - file_path: Path of the .cspt source file.
+        - parse_mode: Prediction strategy of the parser.
+        - cache: ResultCache to reuse and store outcomes, or None to always compile.
+        - all_errors: Whether to report every syntax and semantic error instead of only the first one.
+        - timings: Whether to record the time and memory of each phase, cached outcomes have none.
+        - parser: Parser to use, one of PARSERS.
+        - lexer: Lexer to use, one of LEXERS.
+        - token_store: How the tokens are kept while parsing, one of TOKEN_STORES.
+        - input_mode: How the file is read, one of INPUT_MODES, the cache always reads it.
+        - lex_jobs: Number of processes that lex the file, the cache always lexes it in this one.
+
+    Returns:
+        - A FileResult with the outcome of the compilation.
+    """
+    start = time.perf_counter()
+    key = None
+    input_stream = None
+    phase = None
+    analyzer = SemanticAnalyzer(logger=worker_logger, collect_errors=all_errors)
+    metrics = CompileMetrics() if timings else None
+
+    try:
+        if cache is not None:
+            with open(file_path, 'rb') as file:
+                source = file.read()
+            # Decode like FileStream does, so a file that can't be read is never cached
+            text = source.decode('ascii')
+
+            key = cache.key(source, variant='all-errors' if all_errors else '')
+            entry = cache.get(key)
+            if entry is not None:
+                # Unchanged source: skip the lexer, the parser and the analyzer entirely
+                return FileResult(file_path, entry['error'], time.perf_counter() - start, cached=True)
+            input_stream = InputStream(text)
+
+        compile_file(file_path, worker_logger, parse_mode=parse_mode, input_stream=input_stream, analyzer=analyzer,
+                     recover_syntax=all_errors, metrics=metrics, parser=parser, lexer=lexer,
+                     token_store=token_store, input_mode=input_mode, lex_jobs=lex_jobs)
+        error = None
+    except ParseCancellationException as e:
+        error = f"Syntax error: {str(e)}"
+        phase = 'syntax'
+    except (SemanticError, SemanticErrors) as e:
+        error = f"Error: {str(e)}"
+        phase = 'semantic'
+    except Exception as e:
+        # A failure of the compiler itself, not an outcome of the source: report it but don't cache it
+        error = f"Error: {str(e)}"
+        key = None
+    finally:
+        if metrics is not None:
+            metrics.close()
+
+    if key is not None:
+        # A syntax error stops the pipeline before any scope is built, unless the parser recovered from it
+        scopes = None if phase == 'syntax' and not all_errors else analyzer.scope_manager.global_scope.to_dict()
+        cache.put(key, {'error': error, 'phase': phase, 'scopes': scopes})
+
+    return FileResult(file_path, error, time.perf_counter() - start,
+                      metrics=metrics.to_dict() if metrics is not None else None)
+
+
+def collect_sources(paths, extension='.cspt'):
+    """
+    Expands files and directories into a sorted list of source files.
+
+    Args:
+        - paths: Iterable of file or directory paths.
+        - extension: Extension of the source files searched in directories.
+
+    Returns:
+        - The list of source file paths.
+    """
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            # Walk the directory tree looking for source files
+            for root, _, files in os.walk(path):
+                sources.extend(os.path.join(root, name) for name in files if name.endswith(extension))
+        else:
+            sources.append(path)
+
+    return sorted(sources)
+
+
+def run_batch(sources, workers=None, parse_mode='two-stage', snapshot_path=None, cache=None, all_errors=False,
+              timings=False, parser='antlr', lexer='antlr', token_store='list',
+              input_mode='read', lex_jobs=1):
+    """
+    Compiles every source file across a pool of worker processes.
+
+    Args:
+        - sources: List of source file paths.
+        - workers: Number of worker processes (defaults to the number of cores).
+        - parse_mode: Prediction strategy of the parser.
+        - snapshot_path: DFA snapshot loaded by every worker before compiling, if any.
+        - cache: ResultCache shared by the workers, pruned to its size cap at the end.
+        - all_errors: Whether to report every syntax and semantic error of each file.
+        - timings: Whether to record the time and memory of each phase of each file.
+        - parser: Parser to use, one of PARSERS.
+        - lexer: Lexer to use, one of LEXERS.
+        - token_store: How the tokens are kept while parsing, one of TOKEN_STORES.
+        - input_mode: How the file is read, one of INPUT_MODES.
+        - lex_jobs: Number of processes that lex each file, on top of the workers.
+
+    Returns:
+        - The list of FileResult in the same order as the sources.
+    """
+    if not sources:
+        return []
+
+    workers = workers or os.cpu_count() or 1
+    # Send the files in chunks so thousands of small files don't pay one round trip each
+    chunksize = max(1, len(sources) // (workers * 4))
+
+    # Start every worker with a warm DFA cache when a snapshot is available
+    initializer = load_dfa_snapshot if snapshot_path else None
+    initargs = (snapshot_path,) if snapshot_path else ()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        results = list(executor.map(compile_worker, sources, repeat(parse_mode), repeat(cache), repeat(all_errors),
+                                    repeat(timings), repeat(parser), repeat(lexer),
+                                    repeat(token_store), repeat(input_mode), repeat(lex_jobs),
+                                    chunksize=chunksize))
+
+    if cache is not None:
+        cache.prune()
+
+    return results
+
+
+def format_summary(results, wall_time, quiet=False):
+    """
+    Builds the aggregated report of a batch.
+
+    Args:
+        - results: List of FileResult.
+        - wall_time: Wall time in seconds of the whole batch.
+        - quiet: Whether to list only the files that failed.
+
+    Returns:
+        - The report as a string.
+    """
+    lines = []
+    for result in results:
+        if not result.ok:
+            # Indent every line of the error, there is one per error with all_errors
+            error = result.error.replace("\n", "\n     ")
+            lines.append(f"FAIL {result.elapsed * 1000:9.2f} ms  {result.path}\n     {error}")
+        elif not quiet:
+            lines.append(f"PASS {result.elapsed * 1000:9.2f} ms  {result.path}")
+
+    passed = sum(1 for result in results if result.ok)
+    failed = len(results) - passed
+    compile_time = sum(result.elapsed for result in results)
+
+    if lines:
+        lines.append("")
+    cached = sum(1 for result in results if result.cached)
+    lines.append(f"{len(results)} files: {passed} passed, {failed} failed, {cached} from cache")
+    lines.append(f"Compile time {compile_time:.3f} s, wall time {wall_time:.3f} s")
+
+    # Show the slowest files to spot outliers in the corpus
+    slowest = sorted(results, key=lambda result: result.elapsed, reverse=True)[:5]
+    if slowest:
+        lines.append("Slowest files:")
+        lines.extend(f"  {result.elapsed * 1000:9.2f} ms  {result.path}" for result in slowest)
+
+    return "\n".join(lines)
@@ -0,0 +1,375 @@
+import os
+import logging
+from antlr4 import FileStream, CommonTokenStream
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.Errors import ParseCancellationException
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.tree.Tree import ErrorNode
+from Model.parse_tree import TreeVisualizer
+from Language.compiscriptLexer import compiscriptLexer
+from Language.compiscriptParser import compiscriptParser
+from Controller.Driver import SemanticAnalyzer
+from Controller.lowering import ASTBuilder, span_of
+from Controller.resolver import Resolver
+import Model.ast_nodes as ast
+from Controller.diagnostics import Diagnostic
+from Controller.metrics import measure
+from Controller.fast_parser import parse_fast
+from Controller.hybrid_parser import HybridParser
+from Controller.regex_lexer import RegexLexer
+from Controller.token_buffer import TokenBuffer, ColumnarTokenStream
+from Controller.mapped_stream import MappedInputStream
+from Controller.parallel_lexer import lex_parallel
+from Controller.custom_exception import ThrowingErrorListener, CollectingErrorListener, SemanticError, SemanticErrors, SyntaxErrors
+
+# Define the custom logging level SUCCESS (between INFO and WARNING)
+SUCCESS_LEVEL_NUM = 25
+logging.addLevelName(SUCCESS_LEVEL_NUM, "SUCCESS")
+
+# Define the method for logging success messages
+def success(self, message, *args, **kwargs):
+    if self.isEnabledFor(SUCCESS_LEVEL_NUM):
+        self._log(SUCCESS_LEVEL_NUM, message, args, **kwargs)
+
+# Add the 'success' method to the Logger class
+logging.Logger.success = success
+
+
+# Parse modes: 'two-stage' tries SLL first and falls back to full LL, the others force one mode
+PARSE_MODES = ('two-stage', 'sll', 'll')
+
+# Parsers: 'antlr' is the generated compiscriptParser, 'hybrid' the HybridParser of Controller.hybrid_parser
+# (ANTLR for the statements, precedence climbing for the expressions), 'fast' the one of Controller.fast_parser
+PARSERS = ('antlr', 'hybrid', 'fast')
+
+# Lexers: 'antlr' is the generated compiscriptLexer, 'regex' the RegexLexer of Controller.regex_lexer
+LEXERS = ('antlr', 'regex')
+
+# Token stores: 'list' is a CommonTokenStream with a CommonToken per token, 'columns' the
+# TokenBuffer of Controller.token_buffer with the tokens stored in arrays
+TOKEN_STORES = ('list', 'columns')
+
+# Inputs: 'read' decodes the file with a FileStream, 'mmap' maps it with the MappedInputStream of Controller.mapped_stream
+INPUT_MODES = ('read', 'mmap')
+
+
+def create_parser(stream, prediction_mode, bail, error_listener=None, profile=None, parser_class=compiscriptParser):
+    """
+    Creates a parser over a token stream.
+
+    Args:
+        - stream: The token stream to parse.
+        - prediction_mode: The ANTLR PredictionMode used by the parser.
+        - bail: Whether to abort silently on the first error (used by the SLL stage).
+        - error_listener: Listener of the syntax errors, ThrowingErrorListener if None.
+        - profile: GrammarProfile (see Controller.grammar_profile) that records the predictions, None to disable profiling.
+        - parser_class: Generated parser to use, compiscriptParser or one that shares its tokens and rule names.
+
+    Returns:
+        - The configured parser.
+    """
+    parser = parser_class(stream)
+    parser._interp.predictionMode = prediction_mode
+    if profile is not None:
+        profile.install(parser)
+    parser.removeErrorListeners()
+
+    if bail:
+        # Bail out on the first error without reporting it, the LL stage will report it
+        parser._errHandler = BailErrorStrategy()
+    else:
+        # Keep the default error strategy, the throwing listener stops parsing on the first
+        # error while a collecting one lets the strategy recover and keep going
+        parser._errHandler = DefaultErrorStrategy()
+        parser.addErrorListener(ThrowingErrorListener.INSTANCE if error_listener is None else error_listener)
+
+    return parser
+
+
+def parse_program(stream, parse_mode='two-stage', error_listener=None, profile=None, parser_class=compiscriptParser):
+    """
+    Parses the token stream starting from the 'program' rule.
+
+    In 'two-stage' mode the input is parsed with the faster SLL prediction first and
+    only re-parsed with full LL prediction if SLL fails, which gives the same results
+    as parsing with LL alone.
+
+    Args:
+        - stream: The token stream to parse.
+        - parse_mode: One of PARSE_MODES.
+        - error_listener: Listener of the syntax errors, see create_parser.
+        - profile: GrammarProfile that records the predictions of every stage, see create_parser.
+        - parser_class: Generated parser to use, see create_parser.
+
+    Returns:
+        - The root of the parse tree.
+
+    Raises:
+        - ParseCancellationException: If the source has a syntax error and no error_listener is given.
+    """
+    if parse_mode not in PARSE_MODES:
+        raise ValueError(f"Unknown parse mode '{parse_mode}', expected one of {PARSE_MODES}")
+
+    if parse_mode == 'll':
+        return create_parser(stream, PredictionMode.LL, bail=False, error_listener=error_listener, profile=profile,
+                             parser_class=parser_class).program()
+
+    if parse_mode == 'sll':
+        return create_parser(stream, PredictionMode.SLL, bail=False, error_listener=error_listener, profile=profile,
+                             parser_class=parser_class).program()
+
+    try:
+        return create_parser(stream, PredictionMode.SLL, bail=True, profile=profile, parser_class=parser_class).program()
+    except ParseCancellationException:
+        # SLL failed, either a real syntax error or a decision that needs full context
+        stream.seek(0)
+        return create_parser(stream, PredictionMode.LL, bail=False, error_listener=error_listener, profile=profile,
+                             parser_class=parser_class).program()
+
+
+def is_well_formed(ctx, lexer_positions=()):
+    """
+    Checks that the parser did not recover from an error inside a parse tree node.
+
+    A node is malformed if a rule under it caught a recognition exception, if the error
+    strategy conjured or skipped a token under it (both are added as error nodes), or
+    if a character the lexer could not recognize lies within its tokens.
+
+    Args:
+        - ctx: The parse tree node to check.
+        - lexer_positions: Positions (line, column) of the lexer errors.
+    """
+    if lexer_positions and ctx.start is not None and ctx.stop is not None:
+        start = (ctx.start.line, ctx.start.column)
+        stop = (ctx.stop.line, ctx.stop.column + len(ctx.stop.text or ''))
+        if any(start <= position < stop for position in lexer_positions):
+            return False
+
+    # Explicit stack, the subtree of a declaration can be deep
+    pending = [ctx]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, ErrorNode):
+            return False
+        if getattr(node, 'exception', None) is not None:
+            return False
+        pending.extend(getattr(node, 'children', None) or ())
+    return True
+
+
+def lower_recovered(tree, error_listener):
+    """
+    Lowers only the well-formed top-level declarations of a parse tree that has syntax errors.
+
+    Args:
+        - tree: Root of the parse tree, as returned by parse_program with a CollectingErrorListener.
+        - error_listener: The CollectingErrorListener used by the lexer and the parser.
+
+    Returns:
+        - The AST Program with the well-formed declarations.
+    """
+    builder = ASTBuilder()
+    declarations = [
+        child.accept(builder) for child in tree.getChildren()
+        if isinstance(child, compiscriptParser.DeclarationContext)
+        and is_well_formed(child, error_listener.lexer_positions)
+    ]
+    return ast.Program(declarations, span_of(tree))
+
+
+def count_parse_tree_nodes(tree):
+    """Returns the number of nodes of a parse tree, rules and tokens included."""
+    count = 0
+    pending = [tree]
+    while pending:
+        node = pending.pop()
+        count += 1
+        pending.extend(getattr(node, 'children', None) or ())
+    return count
+
+
+def count_scopes(scope):
+    """Returns the number of scopes and declared symbols of a scope tree."""
+    scopes = symbols = 0
+    pending = [scope]
+    while pending:
+        scope = pending.pop()
+        scopes += 1
+        symbols += sum(1 for _ in scope.declared_symbols())
+        pending.extend(scope.children)
+    return scopes, symbols
+
+
+def compile_file(file_path, logger, render_tree=False, output_dir='src/Output', parse_mode='two-stage',
+                 input_stream=None, analyzer=None, tracer=None, collect_errors=False, recover_syntax=False,
+                 metrics=None, parser='antlr', lexer='antlr', token_store='list',
+                 input_mode='read', lex_jobs=1):
+    """
+    Runs the whole compilation pipeline (lexer, parser and semantic analyzer) over a file.
+
+    Args:
+        - file_path: Path of the .cspt source file.
+        - logger: Logger used by the pipeline phases.
+        - render_tree: Whether to render the parse tree with graphviz.
+        - output_dir: Directory where the parse tree image is saved.
+        - parse_mode: Prediction strategy of the parser, one of PARSE_MODES.
+        - input_stream: Stream with the already loaded source, read from file_path if None.
+        - analyzer: Semantic analyzer to run, a new one is created if None.
+        - tracer: Tracer (see Controller.trace) that records the semantic analysis, None to disable tracing.
+        - collect_errors: Whether the semantic analyzer reports every error instead of stopping at the first one.
+        - recover_syntax: Whether to report every syntax error and still analyze the well-formed
+          top-level declarations, instead of stopping at the first syntax error.
+        - metrics: CompileMetrics (see Controller.metrics) that records the time and memory of each phase
+          and the sizes of the compilation, None to measure nothing.
+        - parser: Parser to use, one of PARSERS. The 'fast' parser builds the AST without a parse tree
+          and the 'hybrid' one builds a parse tree whose expressions are already ASTs. With both, the
+          source is parsed again with ANTLR if it has a syntax error (for the error messages and the
+          recovery) and when the parse tree is rendered.
+        - lexer: Lexer to use, one of LEXERS. Both give the same tokens and lexer errors.
+        - token_store: How the tokens are kept while parsing, one of TOKEN_STORES.
+        - input_mode: How the file is read when no input_stream is given, one of INPUT_MODES.
+        - lex_jobs: Number of processes that lex the file (see Controller.parallel_lexer). With more
+          than one, the tokens are kept in columns whatever the token_store.
+
+    Returns:
+        - The root of the AST lowered from the parse tree.
+
+    Raises:
+        - ParseCancellationException: If the source has a syntax error.
+        - SemanticError: If the semantic analyzer finds an error.
+        - SemanticErrors: With every error found, if the analyzer collects errors.
+        - SyntaxErrors: With the syntax and semantic errors found, if recover_syntax is set and the source has syntax errors.
+    """
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser '{parser}', expected one of {PARSERS}")
+    if lexer not in LEXERS:
+        raise ValueError(f"Unknown lexer '{lexer}', expected one of {LEXERS}")
+    if token_store not in TOKEN_STORES:
+        raise ValueError(f"Unknown token store '{token_store}', expected one of {TOKEN_STORES}")
+    if input_mode not in INPUT_MODES:
+        raise ValueError(f"Unknown input mode '{input_mode}', expected one of {INPUT_MODES}")
+
+    if input_stream is None:
+        input_stream = MappedInputStream(file_path) if input_mode == 'mmap' else FileStream(file_path)
+    lexer = RegexLexer(input_stream) if lexer == 'regex' else compiscriptLexer(input_stream)
+    lexer.removeErrorListeners()  # Remove the default error listener
+    # Collect the syntax errors of both the lexer and the parser when recovering from them
+    error_listener = CollectingErrorListener() if recover_syntax else None
+    # Otherwise only record the lexer errors: the parser may stop at an earlier error before reaching them
+    lexer_listener = CollectingErrorListener() if error_listener is None else error_listener
+    lexer.addErrorListener(lexer_listener)  # Add custom error listener
+
+    # Lex the whole input up front so lexer errors are not mistaken for SLL failures
+    with measure(metrics, 'lex'):
+        if lex_jobs > 1:
+            stream = ColumnarTokenStream(lex_parallel(lexer, lex_jobs))
+        elif token_store == 'columns':
+            stream = ColumnarTokenStream(TokenBuffer.from_lexer(lexer))
+        else:
+            stream = CommonTokenStream(lexer)
+            stream.fill()
+    if metrics is not None:
+        metrics.count('tokens', len(stream.tokens))
+
+    if error_listener is None and lexer_listener.diagnostics:
+        # Report the first error like a parser that lexes on demand: lex again while parsing, so the
+        # lexer error is raised when the parser reaches it, unless the parser stops at an error first
+        input_stream.reset()
+        lexer = type(lexer)(input_stream)
+        lexer.removeErrorListeners()
+        lexer.addErrorListener(ThrowingErrorListener.INSTANCE)
+        with measure(metrics, 'parse'):
+            parse_program(CommonTokenStream(lexer), parse_mode)
+        # The parser reads up to EOF, so it can't get here without raising the lexer error
+        line, column = lexer_listener.diagnostics[0].span[:2]
+        raise ParseCancellationException(f"Line {line}:{column} - {lexer_listener.diagnostics[0].message}")
+
+    # The fast and hybrid parsers stop at the first syntax error, ANTLR parses the source again to report it.
+    # Their failed attempt is timed as its own phase, so 'parse' is only the parse that was kept
+    program = tree = None
+    lexer_failed = len(lexer_listener.diagnostics) > 0
+    if parser == 'fast' and not render_tree and not lexer_failed:
+        try:
+            with measure(metrics, 'parse', failed_name='parse-fast'):
+                program = parse_fast(stream)
+        except ParseCancellationException:
+            program = None
+    elif parser == 'hybrid' and not render_tree and not lexer_failed:
+        try:
+            with measure(metrics, 'parse', failed_name='parse-hybrid'):
+                tree = create_parser(stream, PredictionMode.SLL, bail=True, parser_class=HybridParser).program()
+        except ParseCancellationException:
+            stream.seek(0)
+            tree = None
+
+    recovered = False
+    if program is not None:
+        logger.success("Parsing completed: No syntax errors found.")
+    else:
+        if tree is None:
+            # Try to parse the input file
+            with measure(metrics, 'parse'):
+                tree = parse_program(stream, parse_mode, error_listener)
+        recovered = error_listener is not None and len(error_listener.diagnostics) > 0
+        if recovered:
+            logger.warning(f"Parsing recovered from {len(error_listener.diagnostics)} syntax error(s).")
+        else:
+            logger.success("Parsing completed: No syntax errors found.")
+
+        if render_tree:
+            # Create a parse tree visualizer and visit the parse tree
+            visualizer = TreeVisualizer(logger=logger)
+            with measure(metrics, 'visualize'):
+                visualizer.visit(tree)
+
+            file_name = os.path.splitext(os.path.basename(file_path))[0]
+            output_file_name = f"parse_tree_{file_name}"
+
+            with measure(metrics, 'render'):
+                visualizer.render(output_file=output_file_name, format='png', output_dir=output_dir)
+
+        if metrics is not None:
+            metrics.count('parse_tree_nodes', visualizer.node_count if render_tree else count_parse_tree_nodes(tree))
+
+        # Lower the parse tree into the compact AST and release the parse tree and the tokens
+        with measure(metrics, 'lower'):
+            if recovered:
+                program = lower_recovered(tree, error_listener)
+            else:
+                program = ASTBuilder().visit(tree)
+        del tree
+    del stream, lexer, input_stream
+
+    # Bind every variable occurrence to its (level, slot) before the analysis
+    with measure(metrics, 'resolve'):
+        Resolver().resolve(program)
+
+    # Create a semantic analyzer and visit the AST
+    if analyzer is None:
+        analyzer = SemanticAnalyzer(logger=logger, tracer=tracer, collect_errors=collect_errors)
+    try:
+        with measure(metrics, 'analyze'):
+            if recovered:
+                # Report the syntax errors together with the semantic errors of the well-formed declarations
+                diagnostics = sorted(error_listener.diagnostics, key=lambda diagnostic: diagnostic.span)
+                try:
+                    analyzer.visit(program)
+                except SemanticError as e:
+                    diagnostics.append(Diagnostic.from_error(e, analyzer.scope_manager.current_scope.name))
+                diagnostics.extend(analyzer.diagnostics or ())
+            else:
+                analyzer.visit(program)
+    finally:
+        if metrics is not None:
+            # Count what the analysis built, even if it stopped on an error
+            scopes, symbols = count_scopes(analyzer.scope_manager.global_scope)
+            metrics.count('scopes', scopes)
+            metrics.count('symbols', symbols)
+
+    if recovered:
+        raise SyntaxErrors(diagnostics)
+    if analyzer.diagnostics:
+        raise SemanticErrors(analyzer.diagnostics)
+    logger.success("Compilation completed: No errors found.")
+
+    return program
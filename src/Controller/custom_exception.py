@@ -1,5 +1,6 @@
 from antlr4.error.ErrorListener import ErrorListener
 from antlr4.error.Errors import ParseCancellationException
+from Controller.diagnostics import Diagnostic
 
 class ThrowingErrorListener(ErrorListener):
     INSTANCE = None
@@ -15,3 +16,70 @@ class ThrowingErrorListener(ErrorListener):
 # Crear una instancia de la clase para reutilizarla
 ThrowingErrorListener.INSTANCE = ThrowingErrorListener()
 
+
+class CollectingErrorListener(ErrorListener):
+    """
+    Error listener that records every syntax error instead of stopping at the first one,
+    so the parser's error strategy can recover and keep reporting. Works for both the
+    lexer and the parser, use a new instance for every compilation.
+
+    Attributes:
+        - diagnostics: List of Diagnostic with the 'syntax-error' code, in the order they were reported.
+        - lexer_positions: Positions (line, column) of the lexer errors, the parser never sees those characters.
+    """
+    def __init__(self):
+        super(CollectingErrorListener, self).__init__()
+        self.diagnostics = []
+        self.lexer_positions = []
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        if offendingSymbol is None:
+            # Lexer errors have no token, the offending character is skipped
+            self.lexer_positions.append((line, column))
+            end_column = column + 1
+        else:
+            end_column = column + len(offendingSymbol.text or '')
+        self.diagnostics.append(Diagnostic('syntax-error', msg, (line, column, line, end_column)))
+
+
+
+class SemanticError(Exception):
+    """
+    Error found by the semantic analyzer.
+
+    Attributes:
+        - code: Short identifier of the kind of error (e.g. 'undeclared-variable').
+        - message: Description of the error.
+        - span: Span (line, column, end_line, end_column) of the offending node, or None.
+    """
+    def __init__(self, code: str, message: str, span=None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.span = span
+
+
+class SemanticErrors(Exception):
+    """
+    Raised at the end of an analysis that collected every error instead of stopping at the first one.
+
+    Attributes:
+        - diagnostics: List of Diagnostic (see Controller.diagnostics) in the order they were found.
+    """
+    def __init__(self, diagnostics: list):
+        super().__init__("\n".join(str(diagnostic) for diagnostic in diagnostics))
+        self.diagnostics = diagnostics
+
+
+class SyntaxErrors(ParseCancellationException):
+    """
+    Raised at the end of a compilation that recovered from syntax errors. It is a
+    ParseCancellationException, so it is reported like the first syntax error would be.
+
+    Attributes:
+        - diagnostics: List of Diagnostic, the syntax errors in source order followed by the
+          semantic errors found in the well-formed declarations.
+    """
+    def __init__(self, diagnostics: list):
+        super().__init__("\n".join(str(diagnostic) for diagnostic in diagnostics))
+        self.diagnostics = diagnostics
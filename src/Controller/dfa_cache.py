@@ -0,0 +1,220 @@
+import os
+import pickle
+import hashlib
+from io import BytesIO
+from antlr4.atn.ATNState import ATNState
+from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+from antlr4.atn.SemanticContext import SemanticContext
+from antlr4.PredictionContext import PredictionContext
+from antlr4.dfa.DFA import DFA
+from antlr4.dfa.DFAState import DFAState
+from Language import compiscriptLexer as lexer_module
+from Language import compiscriptParser as parser_module
+from Language.compiscriptLexer import compiscriptLexer
+from Language.compiscriptParser import compiscriptParser
+
+# Bump when the layout of the snapshot changes
+SNAPSHOT_FORMAT = 1
+
+# Edge markers for a missing edge and for the shared ERROR state of the simulators
+NO_EDGE = -1
+ERROR_EDGE = -2
+
+# Recognizers whose class-level DFA cache is saved, with the module holding their
+# serialized ATN and the simulator that owns their ERROR state
+RECOGNIZERS = {
+    'lexer': (compiscriptLexer, lexer_module, LexerATNSimulator),
+    'parser': (compiscriptParser, parser_module, ParserATNSimulator),
+}
+
+
+def grammar_fingerprint():
+    """
+    Returns a hash of the serialized ATNs of the lexer and parser.
+    A snapshot is only valid for the exact grammar it was taken from.
+    """
+    digest = hashlib.sha256()
+    for name, (_, module, _) in sorted(RECOGNIZERS.items()):
+        digest.update(name.encode())
+        digest.update(repr(module.serializedATN()).encode())
+    return digest.hexdigest()
+
+
+class _ATNPickler(pickle.Pickler):
+    """
+    Pickler that stores references to the ATN states and to the runtime singletons
+    instead of copying them, so only the DFA itself ends up in the snapshot.
+    """
+    def persistent_id(self, obj):
+        if isinstance(obj, ATNState):
+            return ('state', obj.stateNumber)
+        if obj is SemanticContext.NONE:
+            return ('semantic', None)
+        if obj is PredictionContext.EMPTY:
+            return ('context', None)
+        return None
+
+
+class _ATNUnpickler(pickle.Unpickler):
+    """Unpickler that resolves the references written by _ATNPickler against a live ATN."""
+    def __init__(self, file, atn):
+        super().__init__(file)
+        self.atn = atn
+
+    def persistent_load(self, pid):
+        kind, value = pid
+        if kind == 'state':
+            return self.atn.states[value]
+        if kind == 'semantic':
+            return SemanticContext.NONE
+        if kind == 'context':
+            return PredictionContext.EMPTY
+        raise pickle.UnpicklingError(f"Unknown persistent id {pid}")
+
+
+def _flatten_dfa(dfa: DFA, error_state: DFAState):
+    """
+    Converts a DFA into a list of plain state records with the edges stored as indices,
+    which avoids deep recursion when pickling long chains of states.
+    """
+    states = list(dfa.states)
+    if dfa.s0 is not None and dfa.s0 not in dfa.states:
+        states.append(dfa.s0)
+    index = {id(state): i for i, state in enumerate(states)}
+
+    records = []
+    for state in states:
+        edges = None
+        if state.edges is not None:
+            edges = [_edge_index(target, index, error_state) for target in state.edges]
+        records.append((state.stateNumber, state.configs, edges, state.isAcceptState, state.prediction,
+                        state.lexerActionExecutor, state.requiresFullContext, state.predicates))
+
+    s0 = NO_EDGE if dfa.s0 is None else index[id(dfa.s0)]
+    return dfa.decision, dfa.precedenceDfa, s0, records
+
+
+def _edge_index(target, index, error_state):
+    if target is None:
+        return NO_EDGE
+    if target is error_state:
+        return ERROR_EDGE
+    return index[id(target)]
+
+
+def _edge_target(target, states, error_state):
+    if target == NO_EDGE:
+        return None
+    if target == ERROR_EDGE:
+        return error_state
+    return states[target]
+
+
+def _rebuild_dfa(atn, flat, error_state):
+    """Rebuilds a DFA from the records produced by _flatten_dfa."""
+    decision, precedence_dfa, s0, records = flat
+    dfa = DFA(atn.decisionToState[decision], decision)
+    dfa.precedenceDfa = precedence_dfa
+
+    states = []
+    for state_number, configs, _, accept, prediction, executor, full_ctx, predicates in records:
+        # Hash codes cached before pickling may depend on the string hash seed of the old process
+        configs.cachedHashCode = -1
+        for config in configs:
+            if getattr(config, 'lexerActionExecutor', None) is not None:
+                config.lexerActionExecutor.hashCode = hash("".join(str(action) for action in config.lexerActionExecutor.lexerActions))
+        if executor is not None:
+            executor.hashCode = hash("".join(str(action) for action in executor.lexerActions))
+
+        state = DFAState(state_number, configs)
+        state.isAcceptState = accept
+        state.prediction = prediction
+        state.lexerActionExecutor = executor
+        state.requiresFullContext = full_ctx
+        state.predicates = predicates
+        states.append(state)
+
+    # Link the edges once every state exists
+    for state, record in zip(states, records):
+        edges = record[2]
+        if edges is not None:
+            state.edges = [_edge_target(target, states, error_state) for target in edges]
+
+    dfa._states = {state: state for state in states if state.stateNumber >= 0}
+    dfa.s0 = None if s0 == NO_EDGE else states[s0]
+    return dfa
+
+
+def save_dfa_snapshot(path):
+    """
+    Saves the warmed DFA caches of the lexer and the parser to a file.
+
+    Args:
+        - path: Path of the snapshot file.
+
+    Returns:
+        - The number of DFA states saved.
+    """
+    saved_states = 0
+    payload = {'format': SNAPSHOT_FORMAT, 'grammar': grammar_fingerprint(), 'recognizers': {}}
+    for name, (recognizer, _, simulator) in RECOGNIZERS.items():
+        flat = [_flatten_dfa(dfa, simulator.ERROR) for dfa in recognizer.decisionsToDFA]
+        saved_states += sum(len(records) for _, _, _, records in flat)
+
+        # Each recognizer is pickled on its own since the state ids refer to its ATN
+        payload['recognizers'][name] = _dump(flat)
+
+    # Write to a temporary file first so a crash never leaves a truncated snapshot
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as file:
+        pickle.dump(payload, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+    return saved_states
+
+
+def load_dfa_snapshot(path):
+    """
+    Loads a DFA snapshot into the class-level caches of the lexer and the parser.
+    Snapshots taken from a different grammar are ignored.
+
+    Args:
+        - path: Path of the snapshot file.
+
+    Returns:
+        - The number of DFA states loaded, or 0 if the snapshot is missing or stale.
+    """
+    if not os.path.exists(path):
+        return 0
+
+    with open(path, 'rb') as file:
+        payload = pickle.load(file)
+
+    if payload.get('format') != SNAPSHOT_FORMAT or payload.get('grammar') != grammar_fingerprint():
+        return 0
+
+    loaded_states = 0
+    for name, (recognizer, _, simulator) in RECOGNIZERS.items():
+        flat = _load(payload['recognizers'][name], recognizer.atn)
+        for decision, flat_dfa in enumerate(flat):
+            # Replace the entries in place, live simulators share this same list
+            recognizer.decisionsToDFA[decision] = _rebuild_dfa(recognizer.atn, flat_dfa, simulator.ERROR)
+            loaded_states += len(flat_dfa[3])
+
+    return loaded_states
+
+
+def dfa_state_count():
+    """Returns the number of DFA states cached by the lexer and the parser."""
+    return sum(len(dfa.states) for recognizer, _, _ in RECOGNIZERS.values() for dfa in recognizer.decisionsToDFA)
+
+
+def _dump(obj):
+    buffer = BytesIO()
+    _ATNPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return buffer.getvalue()
+
+
+def _load(data, atn):
+    return _ATNUnpickler(BytesIO(data), atn).load()
@@ -0,0 +1,37 @@
+class Diagnostic:
+    """
+    Error recorded by the semantic analyzer when it collects every error of a program.
+
+    Attributes:
+        - code: Short identifier of the kind of error (e.g. 'undeclared-variable').
+        - message: Description of the error.
+        - span: Span (line, column, end_line, end_column) of the offending node, or None.
+        - scope: Name of the scope where the error was found.
+    """
+    __slots__ = ('code', 'message', 'span', 'scope')
+
+    def __init__(self, code: str, message: str, span=None, scope: str = None):
+        self.code = code
+        self.message = message
+        self.span = span
+        self.scope = scope
+
+    @classmethod
+    def from_error(cls, error, scope: str = None):
+        """Builds the diagnostic of a SemanticError."""
+        return cls(error.code, error.message, error.span, scope)
+
+    def to_dict(self):
+        return {
+            'code': self.code,
+            'message': self.message,
+            'span': list(self.span) if self.span is not None else None,
+            'scope': self.scope,
+        }
+
+    def __str__(self):
+        position = f"Line {self.span[0]}:{self.span[1]}" if self.span is not None else "Line ?"
+        return f"{position} - {self.message} [{self.code}]"
+
+    def __repr__(self):
+        return f"Diagnostic({self.code}, {self.message!r}, {self.span}, {self.scope!r})"
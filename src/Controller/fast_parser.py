@@ -0,0 +1,388 @@
+from antlr4 import Token
+from antlr4.error.Errors import ParseCancellationException
+from Language.compiscriptParser import compiscriptParser
+from Controller.lowering import span_between
+import Model.ast_nodes as ast
+
+# Token type of each literal of the grammar, such as '=' or 'class'
+LITERALS = {name[1:-1]: token_type for token_type, name in enumerate(compiscriptParser.literalNames)
+            if name.startswith("'")}
+
+EOF = Token.EOF
+NUMBER = compiscriptParser.NUMBER
+STRING = compiscriptParser.STRING
+IDENTIFIER = compiscriptParser.IDENTIFIER
+
+CLASS, EXTENDS, FUN, VAR = LITERALS['class'], LITERALS['extends'], LITERALS['fun'], LITERALS['var']
+FOR, IF, ELSE, PRINT, RETURN, WHILE = (LITERALS['for'], LITERALS['if'], LITERALS['else'], LITERALS['print'],
+                                       LITERALS['return'], LITERALS['while'])
+TRUE, FALSE, NIL, THIS, SUPER, NEW = (LITERALS['true'], LITERALS['false'], LITERALS['nil'], LITERALS['this'],
+                                      LITERALS['super'], LITERALS['new'])
+LBRACE, RBRACE, LPAREN, RPAREN, LBRACKET, RBRACKET = (LITERALS['{'], LITERALS['}'], LITERALS['('], LITERALS[')'],
+                                                      LITERALS['['], LITERALS[']'])
+SEMI, COMMA, DOT, ASSIGN, BANG, MINUS = (LITERALS[';'], LITERALS[','], LITERALS['.'], LITERALS['='], LITERALS['!'],
+                                         LITERALS['-'])
+
+# Operators of the binary rules, from logic_or (loosest) to factor (tightest)
+BINARY_LEVELS = tuple(frozenset(LITERALS[operator] for operator in operators) for operators in (
+    ('or',), ('and',), ('!=', '=='), ('>', '>=', '<', '<='), ('-', '+'), ('/', '*', '%'),
+))
+
+# Statements that start with a keyword, the others are expression statements
+STATEMENT_KEYWORDS = frozenset((FOR, IF, PRINT, RETURN, WHILE, LBRACE))
+
+# Literal primaries lowered to ast.Literal with their own text as kind
+KEYWORD_LITERALS = frozenset((TRUE, FALSE, NIL))
+
+
+class FastParser:
+    """
+    Hand-written recursive descent parser of compiscript.g4 that builds the AST directly.
+
+    It accepts the same programs as compiscriptParser and builds the same AST as
+    ASTBuilder, spans included, without the ATN simulation nor the parse tree. The
+    binary operators are parsed by precedence climbing over BINARY_LEVELS instead of
+    one method per rule. It has no error recovery: it stops with a
+    ParseCancellationException at the first token it can't parse, so the caller can
+    parse the source again with ANTLR for its error messages, like the SLL stage of
+    parse_program does.
+
+    Attributes:
+        - tokens: Tokens of the source, as filled by a CommonTokenStream or a TokenBuffer
+          (see Controller.token_buffer), ending with EOF.
+        - types: Type of each token.
+        - position: Index of the next token.
+    """
+    def __init__(self, tokens: list):
+        self.tokens = tokens
+        # A TokenBuffer already has a column of types
+        types = getattr(tokens, 'types', None)
+        self.types = types if types is not None else [token.type for token in tokens]
+        self.position = 0
+
+
+    # ---------- Helpers ----------
+
+    def error(self):
+        token = self.tokens[self.position]
+        return ParseCancellationException(f"line {token.line}:{token.column} unexpected '{token.text}'")
+
+    def expect(self, token_type: int):
+        """Consumes the next token, which must be of the given type, and returns it."""
+        if self.types[self.position] != token_type:
+            raise self.error()
+        self.position += 1
+        return self.tokens[self.position - 1]
+
+    def span(self, start: int):
+        """Returns the span from the token at 'start' to the last consumed token."""
+        return span_between(self.tokens[start], self.tokens[self.position - 1])
+
+
+    # ---------- Declarations ----------
+
+    def parse(self):
+        """Parses the whole token list, returns the ast.Program."""
+        declarations = []
+        while self.types[self.position] != EOF:
+            declarations.append(self.declaration())
+        # Matching EOF doesn't move the stream, so like the 'program' rule the span ends at the last token
+        return ast.Program(declarations, self.span(0))
+
+    def declaration(self):
+        token_type = self.types[self.position]
+        if token_type == CLASS:
+            return self.class_declaration()
+        if token_type == FUN and self.types[self.position + 1] == IDENTIFIER:
+            start = self.position
+            self.position += 1
+            function = self.function()
+            # The declaration also spans the 'fun' keyword
+            function.span = self.span(start)
+            return function
+        if token_type == VAR:
+            return self.var_declaration()
+        return self.statement()
+
+    def class_declaration(self):
+        start = self.position
+        self.position += 1
+        name = self.expect(IDENTIFIER).text
+        superclass = None
+        if self.types[self.position] == EXTENDS:
+            self.position += 1
+            superclass = self.expect(IDENTIFIER).text
+        self.expect(LBRACE)
+        methods = []
+        while self.types[self.position] == IDENTIFIER:
+            methods.append(self.function())
+        self.expect(RBRACE)
+        return ast.ClassDecl(name, superclass, methods, self.span(start))
+
+    def function(self):
+        start = self.position
+        name = self.expect(IDENTIFIER).text
+        parameters = self.parameters()
+        return ast.FunDecl(name, parameters, self.block(), self.span(start))
+
+    def parameters(self):
+        """Parses '(' parameters? ')', returns None without parameters like ASTBuilder."""
+        self.expect(LPAREN)
+        if self.types[self.position] == RPAREN:
+            self.position += 1
+            return None
+        parameters = [self.expect(IDENTIFIER).text]
+        while self.types[self.position] == COMMA:
+            self.position += 1
+            parameters.append(self.expect(IDENTIFIER).text)
+        self.expect(RPAREN)
+        return parameters
+
+    def var_declaration(self):
+        start = self.position
+        self.position += 1
+        name = self.expect(IDENTIFIER).text
+        initializer = None
+        if self.types[self.position] == ASSIGN:
+            self.position += 1
+            initializer = self.expression()
+        self.expect(SEMI)
+        return ast.VarDecl(name, initializer, self.span(start))
+
+
+    # ---------- Statements ----------
+
+    def statement(self):
+        token_type = self.types[self.position]
+        if token_type not in STATEMENT_KEYWORDS:
+            return self.expression_statement()
+        if token_type == LBRACE:
+            return self.block()
+
+        start = self.position
+        self.position += 1
+        if token_type == PRINT:
+            expression = self.expression()
+            self.expect(SEMI)
+            return ast.PrintStmt(expression, self.span(start))
+
+        if token_type == RETURN:
+            value = None
+            if self.types[self.position] != SEMI:
+                value = self.expression()
+            self.expect(SEMI)
+            return ast.ReturnStmt(value, self.span(start))
+
+        if token_type == IF:
+            condition = self.condition()
+            then_branch = self.statement()
+            else_branch = None
+            # The 'else' belongs to the innermost if, as in the greedy ANTLR rule
+            if self.types[self.position] == ELSE:
+                self.position += 1
+                else_branch = self.statement()
+            return ast.IfStmt(condition, then_branch, else_branch, self.span(start))
+
+        if token_type == WHILE:
+            condition = self.condition()
+            return ast.WhileStmt(condition, self.statement(), self.span(start))
+
+        # 'for' '(' (varDecl | exprStmt | ';') expression? ';' expression? ')' statement
+        self.expect(LPAREN)
+        initializer_type = self.types[self.position]
+        if initializer_type == VAR:
+            initializer = self.var_declaration()
+        elif initializer_type == SEMI:
+            self.position += 1
+            initializer = None
+        else:
+            initializer = self.expression_statement()
+
+        condition = None
+        if self.types[self.position] != SEMI:
+            condition = self.expression()
+        self.expect(SEMI)
+        update = None
+        if self.types[self.position] != RPAREN:
+            update = self.expression()
+        self.expect(RPAREN)
+        return ast.ForStmt(initializer, condition, update, self.statement(), self.span(start))
+
+    def condition(self):
+        """Parses the '(' expression ')' of an if or a while."""
+        self.expect(LPAREN)
+        expression = self.expression()
+        self.expect(RPAREN)
+        return expression
+
+    def expression_statement(self):
+        start = self.position
+        expression = self.expression()
+        self.expect(SEMI)
+        return ast.ExprStmt(expression, self.span(start))
+
+    def block(self):
+        start = self.position
+        self.expect(LBRACE)
+        declarations = []
+        while self.types[self.position] != RBRACE:
+            declarations.append(self.declaration())
+        self.position += 1
+        return ast.Block(declarations, self.span(start))
+
+
+    # ---------- Expressions ----------
+
+    def expression(self):
+        """
+        Parses an assignment or a logic_or expression.
+
+        The rule '(call '.')? IDENTIFIER '=' assignment' is parsed as an expression
+        followed by '=': only an identifier or a property access can be assigned, and
+        the parser builds them as ast.Identifier and ast.Get nodes, so the node type
+        tells whether the left side matched the rule.
+        """
+        start = self.position
+        target = self.binary(0)
+        if self.types[self.position] != ASSIGN:
+            return target
+
+        if type(target) is ast.Identifier:
+            self.position += 1
+            value = self.expression()
+            return ast.Assign(target.name, value, self.span(start))
+        if type(target) is ast.Get:
+            self.position += 1
+            value = self.expression()
+            return ast.Set(target.object, target.name, value, self.span(start))
+        raise self.error()
+
+    def binary(self, level: int):
+        """Parses the binary rule at 'level' of BINARY_LEVELS, a single operand is returned as is."""
+        if level == len(BINARY_LEVELS):
+            return self.unary()
+
+        start = self.position
+        operators_of_level = BINARY_LEVELS[level]
+        operand = self.binary(level + 1)
+        if self.types[self.position] not in operators_of_level:
+            return operand
+
+        operands = [operand]
+        operators = []
+        while self.types[self.position] in operators_of_level:
+            operators.append(self.tokens[self.position].text)
+            self.position += 1
+            operands.append(self.binary(level + 1))
+        return ast.Binary(operands, operators, self.span(start))
+
+    def unary(self):
+        # Prefix operators are collected first, every Unary ends where its operand ends
+        starts = []
+        while self.types[self.position] in (BANG, MINUS):
+            starts.append(self.position)
+            self.position += 1
+
+        node = self.call()
+        for start in reversed(starts):
+            node = ast.Unary(self.tokens[start].text, node, self.span(start))
+        return node
+
+    def call(self):
+        start = self.position
+        types = self.types
+        if types[start] == FUN:
+            node = self.anonymous_function()
+            # An anonymous function takes no suffix, except a property that is assigned,
+            # which compiscript.g4 accepts through '(call '.')? IDENTIFIER '=''
+            position = self.position
+            if types[position] == DOT and types[position + 1] == IDENTIFIER and types[position + 2] == ASSIGN:
+                self.position += 2
+                node = ast.Get(node, self.tokens[position + 1].text, self.span(start))
+            return node
+
+        node = self.primary()
+        while True:
+            token_type = types[self.position]
+            if token_type == LPAREN:
+                self.position += 1
+                arguments = self.arguments(RPAREN)
+                node = ast.Call(node, arguments, self.span(start))
+            elif token_type == DOT:
+                self.position += 1
+                name = self.expect(IDENTIFIER).text
+                node = ast.Get(node, name, self.span(start))
+            elif token_type == LBRACKET:
+                self.position += 1
+                index = self.expression()
+                self.expect(RBRACKET)
+                node = ast.Index(node, index, self.span(start))
+            else:
+                return node
+
+    def arguments(self, closing: int):
+        """Parses 'expression (',' expression)*' up to the closing token, which can follow right away."""
+        if self.types[self.position] == closing:
+            self.position += 1
+            return []
+        arguments = [self.expression()]
+        while self.types[self.position] == COMMA:
+            self.position += 1
+            arguments.append(self.expression())
+        self.expect(closing)
+        return arguments
+
+    def anonymous_function(self):
+        start = self.position
+        self.position += 1
+        parameters = self.parameters()
+        return ast.FunAnon(parameters, self.block(), self.span(start))
+
+    def primary(self):
+        start = self.position
+        token = self.tokens[start]
+        token_type = token.type
+        self.position += 1
+
+        if token_type == IDENTIFIER:
+            return ast.Identifier(token.text, self.span(start))
+        if token_type == NUMBER:
+            return ast.Literal('num', token.text, self.span(start))
+        if token_type == STRING:
+            return ast.Literal('string', token.text, self.span(start))
+        if token_type in KEYWORD_LITERALS:
+            return ast.Literal(token.text, token.text, self.span(start))
+        if token_type == THIS:
+            return ast.This(self.span(start))
+        if token_type == LPAREN:
+            expression = self.expression()
+            self.expect(RPAREN)
+            return ast.Grouping(expression, self.span(start))
+        if token_type == SUPER:
+            self.expect(DOT)
+            name = self.expect(IDENTIFIER).text
+            return ast.Super(name, self.span(start))
+        if token_type == LBRACKET:
+            elements = self.arguments(RBRACKET)
+            return ast.ArrayLiteral(elements, self.span(start))
+        if token_type == NEW:
+            name = self.expect(IDENTIFIER).text
+            self.expect(LPAREN)
+            arguments = self.arguments(RPAREN)
+            return ast.New(name, arguments, self.span(start))
+
+        self.position = start
+        raise self.error()
+
+
+def parse_fast(stream):
+    """
+    Parses a filled token stream with the FastParser.
+
+    Returns:
+        - The root of the AST.
+
+    Raises:
+        - ParseCancellationException: At the first syntax error.
+    """
+    return FastParser(stream.tokens).parse()
@@ -0,0 +1,309 @@
+import os
+import re
+import json
+import time
+from antlr4 import FileStream, CommonTokenStream
+from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+from antlr4.error.Errors import RecognitionException
+from Language.compiscriptLexer import compiscriptLexer
+from Language.compiscriptParser import compiscriptParser
+from Controller.compiler import parse_program
+from Controller.custom_exception import CollectingErrorListener
+
+GRAMMAR_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Language", "compiscript.g4")
+
+# Kind of each ATN decision state, by class name, as the construct it comes from in the grammar
+DECISION_KINDS = {
+    'BasicBlockStartState': 'alternatives',
+    'StarLoopEntryState': '(...)*',
+    'StarBlockStartState': '(...)* body',
+    'PlusBlockStartState': '(...)+',
+    'PlusLoopbackState': '(...)+ exit',
+    'StarLoopbackState': '(...)* exit',
+    'TokensStartState': 'tokens',
+}
+
+
+def grammar_rule_lines(grammar_path=GRAMMAR_PATH):
+    """Returns the line where each rule of the grammar is defined, by rule name."""
+    lines = {}
+    rule = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)\s*:")
+    with open(grammar_path, 'r', encoding='utf-8') as file:
+        for number, line in enumerate(file, start=1):
+            match = rule.match(line)
+            if match:
+                lines.setdefault(match.group(1), number)
+    return lines
+
+
+class DecisionProfile:
+    """
+    Prediction statistics of one decision of the parser.
+
+    A decision is a point of the grammar where the parser must choose between
+    alternatives, such as the two alternatives of 'assignment' or whether a
+    '(...)*' loop takes one more iteration. The lookahead is the number of tokens
+    the prediction looked at, first with SLL and then with full LL when SLL found
+    a conflict.
+
+    Attributes:
+        - decision: Number of the decision in the ATN.
+        - rule: Name of the grammar rule of the decision.
+        - line: Line of the rule in compiscript.g4, or None if it is not found.
+        - kind: Construct of the decision (see DECISION_KINDS).
+        - invocations: Number of predictions made.
+        - time: Time spent predicting, in seconds.
+        - sll_lookahead: Tokens looked at by SLL, added up over the predictions.
+        - sll_max_lookahead: Longest SLL lookahead of a prediction.
+        - sll_max_line: Source line where the longest SLL lookahead started.
+        - sll_conflicts: Predictions where SLL found more than one viable alternative.
+        - ll_fallbacks: Predictions retried with full LL context after an SLL conflict.
+        - ll_lookahead: Tokens looked at by full LL, added up over the fallbacks.
+        - ll_max_lookahead: Longest full LL lookahead of a prediction.
+        - ll_max_line: Source line where the longest full LL lookahead started.
+        - context_sensitivities: Fallbacks where full LL found a unique alternative SLL could not.
+        - ambiguities: Fallbacks where full LL still found more than one viable alternative.
+        - errors: Predictions that found no viable alternative.
+        - dfa_transitions: Lookahead steps served by the DFA cache.
+        - atn_transitions: Lookahead steps that had to simulate the ATN (DFA cache misses).
+    """
+    __slots__ = ('decision', 'rule', 'line', 'kind', 'invocations', 'time',
+                 'sll_lookahead', 'sll_max_lookahead', 'sll_max_line', 'sll_conflicts',
+                 'll_fallbacks', 'll_lookahead', 'll_max_lookahead', 'll_max_line',
+                 'context_sensitivities', 'ambiguities', 'errors', 'dfa_transitions', 'atn_transitions')
+
+    def __init__(self, decision: int, rule: str, line: int, kind: str):
+        self.decision = decision
+        self.rule = rule
+        self.line = line
+        self.kind = kind
+        self.invocations = 0
+        self.time = 0.0
+        self.sll_lookahead = 0
+        self.sll_max_lookahead = 0
+        self.sll_max_line = None
+        self.sll_conflicts = 0
+        self.ll_fallbacks = 0
+        self.ll_lookahead = 0
+        self.ll_max_lookahead = 0
+        self.ll_max_line = None
+        self.context_sensitivities = 0
+        self.ambiguities = 0
+        self.errors = 0
+        self.dfa_transitions = 0
+        self.atn_transitions = 0
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ProfilingATNSimulator(ParserATNSimulator):
+    """
+    Parser ATN simulator that records the statistics of every prediction in a GrammarProfile.
+
+    The ANTLR Python runtime has no ProfilingATNSimulator, this one follows the Java
+    runtime's: the SLL lookahead ends at the last DFA state visited by execATN, the
+    full LL lookahead at the last reach set computed with full context, and the
+    fallbacks, context sensitivities and ambiguities are counted as they are reported.
+    """
+    def __init__(self, parser, atn, decisionToDFA, sharedContextCache, profile):
+        super().__init__(parser, atn, decisionToDFA, sharedContextCache)
+        self.profile = profile
+        self._decision = None
+        self._sll_stop = -1
+        self._ll_stop = -1
+        self._conflict = False
+
+    def adaptivePredict(self, input, decision, outerContext):
+        info = self.profile.decisions[decision]
+        start_index = input.index
+        self._decision = info
+        self._sll_stop = self._ll_stop = -1
+        self._conflict = False
+
+        start = time.perf_counter()
+        try:
+            return super().adaptivePredict(input, decision, outerContext)
+        except RecognitionException:
+            info.errors += 1
+            raise
+        finally:
+            info.time += time.perf_counter() - start
+            info.invocations += 1
+            if self._conflict:
+                info.sll_conflicts += 1
+
+            if self._sll_stop >= 0:
+                lookahead = self._sll_stop - start_index + 1
+                info.sll_lookahead += lookahead
+                if lookahead > info.sll_max_lookahead:
+                    info.sll_max_lookahead = lookahead
+                    info.sll_max_line = input.get(start_index).line
+            if self._ll_stop >= 0:
+                lookahead = self._ll_stop - start_index + 1
+                info.ll_lookahead += lookahead
+                if lookahead > info.ll_max_lookahead:
+                    info.ll_max_lookahead = lookahead
+                    info.ll_max_line = input.get(start_index).line
+
+    def getExistingTargetState(self, previousD, t):
+        # Only execATN, the SLL stage, walks the DFA
+        self._sll_stop = self._input.index
+        target = super().getExistingTargetState(previousD, t)
+        if target is not None:
+            self._decision.dfa_transitions += 1
+            if target.requiresFullContext:
+                self._conflict = True
+        return target
+
+    def computeTargetState(self, dfa, previousD, t):
+        self._decision.atn_transitions += 1
+        target = super().computeTargetState(dfa, previousD, t)
+        if target.requiresFullContext:
+            self._conflict = True
+        return target
+
+    def computeReachSet(self, closure, t, fullCtx):
+        if fullCtx:
+            self._ll_stop = self._input.index
+            self._decision.atn_transitions += 1
+        return super().computeReachSet(closure, t, fullCtx)
+
+    def reportAttemptingFullContext(self, dfa, conflictingAlts, configs, startIndex, stopIndex):
+        self._decision.ll_fallbacks += 1
+        super().reportAttemptingFullContext(dfa, conflictingAlts, configs, startIndex, stopIndex)
+
+    def reportContextSensitivity(self, dfa, prediction, configs, startIndex, stopIndex):
+        self._decision.context_sensitivities += 1
+        super().reportContextSensitivity(dfa, prediction, configs, startIndex, stopIndex)
+
+    def reportAmbiguity(self, dfa, D, startIndex, stopIndex, exact, ambigAlts, configs):
+        self._decision.ambiguities += 1
+        super().reportAmbiguity(dfa, D, startIndex, stopIndex, exact, ambigAlts, configs)
+
+
+class GrammarProfile:
+    """
+    Prediction statistics of compiscriptParser, per decision and per grammar rule.
+
+    parse_program installs a ProfilingATNSimulator in each parser it creates when it
+    gets a GrammarProfile, so in 'two-stage' mode a file that SLL can't parse is
+    counted twice, once per stage. The simulators share the DFA cache of the normal
+    parsers, so the ATN transitions only show the cache misses of this process.
+
+    Attributes:
+        - decisions: DecisionProfile of every decision of the parser, indexed by decision number.
+        - files: Number of files parsed.
+        - tokens: Number of tokens parsed.
+    """
+    def __init__(self, grammar_path=GRAMMAR_PATH):
+        rule_lines = grammar_rule_lines(grammar_path) if os.path.exists(grammar_path) else {}
+        self.decisions = []
+        for decision, state in enumerate(compiscriptParser.atn.decisionToState):
+            rule = compiscriptParser.ruleNames[state.ruleIndex]
+            kind = DECISION_KINDS.get(type(state).__name__, type(state).__name__)
+            self.decisions.append(DecisionProfile(decision, rule, rule_lines.get(rule), kind))
+        self.files = 0
+        self.tokens = 0
+
+    def install(self, parser):
+        """Replaces the ATN simulator of a parser with a profiling one, keeping its prediction mode."""
+        interpreter = parser._interp
+        simulator = ProfilingATNSimulator(parser, parser.atn, interpreter.decisionToDFA,
+                                          interpreter.sharedContextCache, self)
+        simulator.predictionMode = interpreter.predictionMode
+        parser._interp = simulator
+        return parser
+
+    def profile_file(self, file_path, parse_mode='two-stage'):
+        """
+        Parses a file with profiling, recovering from its syntax errors.
+
+        Returns:
+            - The syntax errors of the file as a list of Diagnostic.
+        """
+        error_listener = CollectingErrorListener()
+        lexer = compiscriptLexer(FileStream(file_path))
+        lexer.removeErrorListeners()
+        lexer.addErrorListener(error_listener)
+        stream = CommonTokenStream(lexer)
+        stream.fill()
+        parse_program(stream, parse_mode, error_listener, profile=self)
+        self.files += 1
+        self.tokens += len(stream.tokens)
+        return error_listener.diagnostics
+
+    def rules(self):
+        """
+        Adds up the statistics of the decisions of each rule.
+
+        Returns:
+            - A dictionary of rule name to a dictionary with the line of the rule and the totals.
+        """
+        totals = {}
+        for info in self.decisions:
+            if info.invocations == 0:
+                continue
+            rule = totals.setdefault(info.rule, {
+                'rule': info.rule, 'line': info.line, 'decisions': 0, 'invocations': 0, 'time': 0.0,
+                'sll_lookahead': 0, 'sll_max_lookahead': 0, 'sll_conflicts': 0, 'll_fallbacks': 0,
+                'll_lookahead': 0, 'll_max_lookahead': 0, 'context_sensitivities': 0, 'ambiguities': 0, 'errors': 0,
+            })
+            rule['decisions'] += 1
+            for name in ('invocations', 'time', 'sll_lookahead', 'sll_conflicts', 'll_fallbacks', 'll_lookahead',
+                         'context_sensitivities', 'ambiguities', 'errors'):
+                rule[name] += getattr(info, name)
+            rule['sll_max_lookahead'] = max(rule['sll_max_lookahead'], info.sll_max_lookahead)
+            rule['ll_max_lookahead'] = max(rule['ll_max_lookahead'], info.ll_max_lookahead)
+        return totals
+
+    def to_dict(self):
+        return {
+            'files': self.files,
+            'tokens': self.tokens,
+            'decisions': [info.to_dict() for info in self.decisions if info.invocations > 0],
+            'rules': list(self.rules().values()),
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def format(self, limit=None):
+        """
+        Formats the profile as two tables, the decisions and the rules, most expensive first.
+
+        Args:
+            - limit: Maximum number of decisions listed, all of them if None.
+
+        Returns:
+            - The tables as a string.
+        """
+        def average(total, count):
+            return f"{total / count:.2f}" if count else "-"
+
+        decisions = sorted((info for info in self.decisions if info.invocations > 0),
+                           key=lambda info: info.time, reverse=True)
+        if limit is not None:
+            decisions = decisions[:limit]
+
+        lines = [f"Grammar profile of {self.files} files, {self.tokens} tokens", "",
+                 f"{'decision':>8} {'rule':<14} {'line':>5} {'kind':<14} {'calls':>9} {'ms':>9} "
+                 f"{'SLL avg':>8} {'SLL max':>8} {'conflict':>8} {'LL':>6} {'LL avg':>7} {'LL max':>7} "
+                 f"{'ctx':>5} {'ambig':>5} {'errors':>6}"]
+        for info in decisions:
+            lines.append(f"{info.decision:>8} {info.rule:<14} {info.line or '-':>5} {info.kind:<14} "
+                         f"{info.invocations:>9} {info.time * 1000:>9.1f} "
+                         f"{average(info.sll_lookahead, info.invocations):>8} {info.sll_max_lookahead:>8} "
+                         f"{info.sll_conflicts:>8} {info.ll_fallbacks:>6} "
+                         f"{average(info.ll_lookahead, info.ll_fallbacks):>7} {info.ll_max_lookahead:>7} "
+                         f"{info.context_sensitivities:>5} {info.ambiguities:>5} {info.errors:>6}")
+
+        lines += ["", f"{'rule':<14} {'line':>5} {'decisions':>9} {'calls':>9} {'ms':>9} {'SLL avg':>8} {'SLL max':>8} "
+                      f"{'conflict':>8} {'LL':>6} {'LL max':>7} {'ctx':>5} {'ambig':>5}"]
+        for rule in sorted(self.rules().values(), key=lambda rule: rule['time'], reverse=True):
+            lines.append(f"{rule['rule']:<14} {rule['line'] or '-':>5} {rule['decisions']:>9} {rule['invocations']:>9} "
+                         f"{rule['time'] * 1000:>9.1f} {average(rule['sll_lookahead'], rule['invocations']):>8} "
+                         f"{rule['sll_max_lookahead']:>8} {rule['sll_conflicts']:>8} {rule['ll_fallbacks']:>6} "
+                         f"{rule['ll_max_lookahead']:>7} {rule['context_sensitivities']:>5} {rule['ambiguities']:>5}")
+
+        return "\n".join(lines)
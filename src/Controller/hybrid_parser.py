@@ -0,0 +1,72 @@
+import sys
+from antlr4.error.Errors import ParseCancellationException
+from antlr4.tree.Tree import ParseTreeVisitor
+from Language.compiscriptParser import compiscriptParser
+from Controller.fast_parser import FastParser
+
+
+class ParsedExpressionContext(compiscriptParser.ExpressionContext):
+    """
+    Expression rule node whose expression was parsed by the FastParser.
+
+    It has no children: the expression tokens go from start to stop and the AST of
+    the expression, with its binary and unary operators already collapsed, is in
+    'node'. ASTBuilder.visitParsedExpression returns it as is.
+
+    Attributes:
+        - node: Root of the AST of the expression.
+    """
+    __slots__ = ('node',)
+
+    def __init__(self, parser, parent, invokingState, node):
+        super().__init__(parser, parent, invokingState)
+        self.node = node
+
+    def accept(self, visitor: ParseTreeVisitor):
+        if hasattr(visitor, "visitParsedExpression"):
+            return visitor.visitParsedExpression(self)
+        return visitor.visitChildren(self)
+
+
+class HybridParser(compiscriptParser):
+    """
+    compiscriptParser that parses the expressions with the FastParser.
+
+    ANTLR still parses the declarations and statements, but every call to the
+    'expression' rule parses the whole expression, down to 'primary', by precedence
+    climbing over the token stream instead of going through the nine rules of the
+    cascade. The token stream must be filled before parsing.
+
+    When the FastParser can't parse an expression, the rule falls back to the ANTLR
+    one from the same token, so the errors are reported by ANTLR. Those reports can
+    still differ from the ones of compiscriptParser, since an expression the FastParser
+    accepts is never checked by the error strategy of ANTLR: compile_file only uses
+    this parser with a bailing error strategy and parses again with compiscriptParser
+    when it fails.
+    """
+    # ATN state the generated rule enters 'expression' with, the start state of the rule
+    EXPRESSION_STATE = compiscriptParser.atn.ruleToStartState[compiscriptParser.RULE_expression].stateNumber
+
+    def __init__(self, input, output=sys.stdout):
+        super().__init__(input, output)
+        self._expressions = None
+
+    def expression(self):
+        if self._expressions is None:
+            self._input.fill()
+            self._expressions = FastParser(self._input.tokens)
+
+        start = self._input.index
+        expressions = self._expressions
+        expressions.position = start
+        try:
+            node = expressions.expression()
+        except ParseCancellationException:
+            self._input.seek(start)
+            return super().expression()
+
+        localctx = ParsedExpressionContext(self, self._ctx, self.state, node)
+        self.enterRule(localctx, self.EXPRESSION_STATE, self.RULE_expression)
+        self._input.seek(expressions.position)
+        self.exitRule()
+        return localctx
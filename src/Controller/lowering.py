@@ -0,0 +1,254 @@
+from antlr4.tree.Tree import TerminalNode
+from Language.compiscriptVisitor import compiscriptVisitor
+from Language.compiscriptParser import compiscriptParser
+import Model.ast_nodes as ast
+
+
+def span_between(start, stop):
+    """
+    Returns the span (line, column, end_line, end_column) that goes from the start token to the stop token.
+    """
+    if stop is None or stop.tokenIndex < start.tokenIndex:
+        # Empty rule, the span collapses to the start token
+        stop = start
+    return (start.line, start.column, stop.line, stop.column + len(stop.text or ""))
+
+
+def span_of(ctx):
+    """Returns the span of a parse tree node."""
+    if isinstance(ctx, TerminalNode):
+        return span_between(ctx.symbol, ctx.symbol)
+    return span_between(ctx.start, ctx.stop)
+
+
+def last_token(node):
+    """Returns the last token of a parse tree node."""
+    return node.symbol if isinstance(node, TerminalNode) else node.stop
+
+
+class ASTBuilder(compiscriptVisitor):
+    """
+    Class that implements the visitor pattern to lower the parse tree generated by the
+    ANTLR parser into the compact AST defined in Model.ast_nodes.
+
+    The rule wrappers that only forward to a single child (declaration, statement,
+    expression, and the logic_or -> ... -> primary chain when it has no operators)
+    produce no node of their own, and the resulting AST keeps no reference to the
+    tokens or contexts, so the parse tree can be released once it is lowered.
+    """
+    def visitProgram(self, ctx: compiscriptParser.ProgramContext):
+        # The last child is the EOF token
+        declarations = [child.accept(self) for child in ctx.children[:-1]]
+        return ast.Program(declarations, span_of(ctx))
+
+
+    def visitDeclaration(self, ctx: compiscriptParser.DeclarationContext):
+        return ctx.getChild(0).accept(self)
+
+
+    def visitClassDecl(self, ctx: compiscriptParser.ClassDeclContext):
+        identifiers = ctx.IDENTIFIER()
+        superclass = identifiers[1].getText() if len(identifiers) > 1 else None
+        methods = [self.visitFunction(function) for function in ctx.function()]
+        return ast.ClassDecl(identifiers[0].getText(), superclass, methods, span_of(ctx))
+
+
+    def visitFunDecl(self, ctx: compiscriptParser.FunDeclContext):
+        function = self.visitFunction(ctx.function())
+        # The declaration also spans the 'fun' keyword
+        function.span = span_of(ctx)
+        return function
+
+
+    def visitFunction(self, ctx: compiscriptParser.FunctionContext):
+        parameters = self.visitParameters(ctx.parameters()) if ctx.parameters() is not None else None
+        return ast.FunDecl(ctx.IDENTIFIER().getText(), parameters, self.visitBlock(ctx.block()), span_of(ctx))
+
+
+    def visitParameters(self, ctx: compiscriptParser.ParametersContext):
+        return [identifier.getText() for identifier in ctx.IDENTIFIER()]
+
+
+    def visitArguments(self, ctx: compiscriptParser.ArgumentsContext):
+        return [expression.accept(self) for expression in ctx.expression()]
+
+
+    def visitVarDecl(self, ctx: compiscriptParser.VarDeclContext):
+        expression = ctx.expression()
+        initializer = expression.accept(self) if expression is not None else None
+        return ast.VarDecl(ctx.IDENTIFIER().getText(), initializer, span_of(ctx))
+
+
+    def visitStatement(self, ctx: compiscriptParser.StatementContext):
+        return ctx.getChild(0).accept(self)
+
+
+    def visitExprStmt(self, ctx: compiscriptParser.ExprStmtContext):
+        return ast.ExprStmt(ctx.expression().accept(self), span_of(ctx))
+
+
+    def visitForStmt(self, ctx: compiscriptParser.ForStmtContext):
+        # 'for' '(' (varDecl | exprStmt | ';') expression? ';' expression? ')' statement
+        children = ctx.children
+        initializer = None if isinstance(children[2], TerminalNode) else children[2].accept(self)
+
+        index = 3
+        condition = None
+        if isinstance(children[index], compiscriptParser.ExpressionContext):
+            condition = children[index].accept(self)
+            index += 1
+
+        index += 1  # Skip the ';'
+        update = None
+        if isinstance(children[index], compiscriptParser.ExpressionContext):
+            update = children[index].accept(self)
+            index += 1
+
+        index += 1  # Skip the ')'
+        body = children[index].accept(self)
+        return ast.ForStmt(initializer, condition, update, body, span_of(ctx))
+
+
+    def visitIfStmt(self, ctx: compiscriptParser.IfStmtContext):
+        else_branch = ctx.statement(1)
+        return ast.IfStmt(ctx.expression().accept(self),
+                          ctx.statement(0).accept(self),
+                          else_branch.accept(self) if else_branch is not None else None,
+                          span_of(ctx))
+
+
+    def visitPrintStmt(self, ctx: compiscriptParser.PrintStmtContext):
+        return ast.PrintStmt(ctx.expression().accept(self), span_of(ctx))
+
+
+    def visitReturnStmt(self, ctx: compiscriptParser.ReturnStmtContext):
+        expression = ctx.expression()
+        return ast.ReturnStmt(expression.accept(self) if expression is not None else None, span_of(ctx))
+
+
+    def visitWhileStmt(self, ctx: compiscriptParser.WhileStmtContext):
+        return ast.WhileStmt(ctx.expression().accept(self), ctx.statement().accept(self), span_of(ctx))
+
+
+    def visitBlock(self, ctx: compiscriptParser.BlockContext):
+        # Children are '{' declaration* '}'
+        declarations = [child.accept(self) for child in ctx.children[1:-1]]
+        return ast.Block(declarations, span_of(ctx))
+
+
+    def visitFunAnon(self, ctx: compiscriptParser.FunAnonContext):
+        parameters = self.visitParameters(ctx.parameters()) if ctx.parameters() is not None else None
+        return ast.FunAnon(parameters, self.visitBlock(ctx.block()), span_of(ctx))
+
+
+    def visitExpression(self, ctx: compiscriptParser.ExpressionContext):
+        return ctx.getChild(0).accept(self)
+
+
+    def visitParsedExpression(self, ctx):
+        # Expression of the HybridParser, already parsed into an AST
+        return ctx.node
+
+
+    def visitAssignment(self, ctx: compiscriptParser.AssignmentContext):
+        children = ctx.children
+        if len(children) == 1:
+            # Wrapper around logic_or
+            return children[0].accept(self)
+
+        # (call '.')? IDENTIFIER '=' assignment
+        name = children[-3].getText()
+        value = children[-1].accept(self)
+        if len(children) == 5:
+            return ast.Set(children[0].accept(self), name, value, span_of(ctx))
+        return ast.Assign(name, value, span_of(ctx))
+
+
+    def _binary(self, ctx):
+        """
+        Lowers an operand (operator operand)* rule. Without operators the rule is only
+        a wrapper and its single operand is returned instead.
+        """
+        children = ctx.children
+        if len(children) == 1:
+            return children[0].accept(self)
+
+        operands = [child.accept(self) for child in children[0::2]]
+        operators = [child.getText() for child in children[1::2]]
+        return ast.Binary(operands, operators, span_of(ctx))
+
+    visitLogic_or = _binary
+    visitLogic_and = _binary
+    visitEquality = _binary
+    visitComparison = _binary
+    visitTerm = _binary
+    visitFactor = _binary
+
+
+    def visitUnary(self, ctx: compiscriptParser.UnaryContext):
+        children = ctx.children
+        if len(children) == 1:
+            # Wrapper around call
+            return children[0].accept(self)
+        return ast.Unary(children[0].getText(), children[1].accept(self), span_of(ctx))
+
+
+    def visitCall(self, ctx: compiscriptParser.CallContext):
+        # primary ( '(' arguments? ')' | '.' IDENTIFIER | '[' expression ']' )* | funAnon
+        children = ctx.children
+        node = children[0].accept(self)
+
+        index = 1
+        while index < len(children):
+            token = children[index].getText()
+            if token == '(':
+                if isinstance(children[index + 1], compiscriptParser.ArgumentsContext):
+                    arguments = self.visitArguments(children[index + 1])
+                    index += 1
+                else:
+                    arguments = []
+                index += 2
+                node = ast.Call(node, arguments, span_between(ctx.start, last_token(children[index - 1])))
+            elif token == '.':
+                node = ast.Get(node, children[index + 1].getText(), span_between(ctx.start, last_token(children[index + 1])))
+                index += 2
+            else:
+                node = ast.Index(node, children[index + 1].accept(self), span_between(ctx.start, last_token(children[index + 2])))
+                index += 3
+
+        return node
+
+
+    def visitPrimary(self, ctx: compiscriptParser.PrimaryContext):
+        first = ctx.getChild(0)
+        if not isinstance(first, TerminalNode):
+            # array or instantiation
+            return first.accept(self)
+
+        token = first.symbol
+        span = span_of(ctx)
+        if token.type == compiscriptParser.NUMBER:
+            return ast.Literal('num', token.text, span)
+        elif token.type == compiscriptParser.STRING:
+            return ast.Literal('string', token.text, span)
+        elif token.type == compiscriptParser.IDENTIFIER:
+            return ast.Identifier(token.text, span)
+
+        text = token.text
+        if text in ('true', 'false', 'nil'):
+            return ast.Literal(text, text, span)
+        elif text == 'this':
+            return ast.This(span)
+        elif text == '(':
+            return ast.Grouping(ctx.expression().accept(self), span)
+        elif text == 'super':
+            return ast.Super(ctx.IDENTIFIER().getText(), span)
+
+
+    def visitArray(self, ctx: compiscriptParser.ArrayContext):
+        return ast.ArrayLiteral([expression.accept(self) for expression in ctx.expression()], span_of(ctx))
+
+
+    def visitInstantiation(self, ctx: compiscriptParser.InstantiationContext):
+        arguments = self.visitArguments(ctx.arguments()) if ctx.arguments() is not None else []
+        return ast.New(ctx.IDENTIFIER().getText(), arguments, span_of(ctx))
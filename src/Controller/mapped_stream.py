@@ -0,0 +1,63 @@
+import re
+import mmap
+from antlr4.InputStream import InputStream
+
+# Any byte outside ASCII, found without decoding the file
+NON_ASCII = re.compile(rb"[\x80-\xff]")
+
+
+class MappedInputStream(InputStream):
+    """
+    Input stream over a memory-mapped source file, a drop-in for FileStream(file_path).
+
+    FileStream reads the whole file, decodes it and then keeps a list with the code
+    point of every character, about 8 bytes per character on top of the bytes and the
+    string. Like FileStream, the source must be ASCII, so each byte of the file is
+    already its code point: 'data' is the map itself, the lexers read it in place and
+    the text of the tokens is decoded only when asked for. The pages are loaded by
+    the OS as the lexer reaches them and can be dropped again under memory pressure.
+
+    The file is checked for non-ASCII bytes when it is opened, and a UnicodeDecodeError
+    is raised like the one of FileStream. 'strdata' is None, RegexLexer matches the
+    bytes of the map instead.
+
+    Attributes:
+        - fileName: Path of the source file.
+        - data: The read-only mmap of the file (bytes if the file is empty, which can't be mapped).
+    """
+    def __init__(self, fileName: str):
+        self.name = "<empty>"
+        self.fileName = fileName
+        with open(fileName, 'rb') as file:
+            try:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                data = b""
+
+        non_ascii = NON_ASCII.search(data)
+        if non_ascii is not None:
+            position = non_ascii.start()
+            prefix = data[:position + 1]
+            if isinstance(data, mmap.mmap):
+                data.close()
+            raise UnicodeDecodeError('ascii', prefix, position, position + 1, "ordinal not in range(128)")
+
+        self.strdata = None
+        self.data = data
+        self._index = 0
+        self._size = len(data)
+
+    def close(self):
+        """Unmaps the file, the stream and its tokens can't be read afterwards."""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def getText(self, start: int, stop: int):
+        if stop >= self._size:
+            stop = self._size - 1
+        if start >= self._size:
+            return ""
+        return self.data[start:stop + 1].decode('ascii')
+
+    def __str__(self):
+        return self.getText(0, self._size - 1)
@@ -0,0 +1,146 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+class PhaseMetrics:
+    """
+    Resources used by one phase of a compilation.
+
+    Attributes:
+        - name: Name of the phase ('lex', 'parse', 'visualize', 'render', 'lower', 'resolve', 'analyze'), or
+          of a failed attempt at one ('parse-fast', 'parse-hybrid').
+        - wall: Wall time in seconds.
+        - cpu: CPU time of the process in seconds.
+        - peak_memory: Peak of the memory allocated by the phase in bytes, or None if memory is not traced.
+    """
+    __slots__ = ('name', 'wall', 'cpu', 'peak_memory')
+
+    def __init__(self, name: str, wall: float, cpu: float, peak_memory: int = None):
+        self.name = name
+        self.wall = wall
+        self.cpu = cpu
+        self.peak_memory = peak_memory
+
+    def to_dict(self):
+        return {'name': self.name, 'wall': self.wall, 'cpu': self.cpu, 'peak_memory': self.peak_memory}
+
+
+class CompileMetrics:
+    """
+    Timings, memory and sizes recorded while compiling a file.
+
+    compile_file measures each phase with phase() when it gets a CompileMetrics, and
+    measures nothing otherwise. Peak memory comes from tracemalloc, which is started
+    on the first phase if it isn't running and stopped by close(). Tracing memory
+    slows Python allocations down, so the times are inflated when trace_memory is set.
+
+    Attributes:
+        - trace_memory: Whether to record the peak memory of each phase.
+        - phases: List of PhaseMetrics in the order the phases ran.
+        - counts: Sizes of the compilation by name ('tokens', 'parse_tree_nodes', 'scopes', 'symbols').
+    """
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.phases = []
+        self.counts = {}
+        self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name: str, failed_name: str = None):
+        """Measures the block as the phase 'name', it is recorded as 'failed_name' (if given) when the block raises."""
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        except BaseException:
+            name = failed_name or name
+            raise
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            peak_memory = tracemalloc.get_traced_memory()[1] - baseline if self.trace_memory else None
+            self.phases.append(PhaseMetrics(name, wall, cpu, peak_memory))
+
+    def count(self, name: str, value: int):
+        """Records a size of the compilation."""
+        self.counts[name] = value
+
+    def close(self):
+        """Stops tracemalloc if these metrics started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def to_dict(self):
+        return {'phases': [phase.to_dict() for phase in self.phases], 'counts': dict(self.counts)}
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+def measure(metrics, name: str, failed_name: str = None):
+    """Returns the context manager that measures a phase, or one that does nothing if metrics is None."""
+    return nullcontext() if metrics is None else metrics.phase(name, failed_name)
+
+
+def combine_metrics(reports):
+    """
+    Adds up the metrics of many compilations, as returned by CompileMetrics.to_dict.
+
+    Times and counts are summed per phase and per name, and the peak memory of a
+    phase is the largest one among the compilations.
+
+    Returns:
+        - A dictionary with the same shape as CompileMetrics.to_dict.
+    """
+    phases = {}
+    counts = {}
+    for report in reports:
+        for phase in report['phases']:
+            total = phases.setdefault(phase['name'], {'name': phase['name'], 'wall': 0.0, 'cpu': 0.0, 'peak_memory': None})
+            total['wall'] += phase['wall']
+            total['cpu'] += phase['cpu']
+            if phase['peak_memory'] is not None:
+                total['peak_memory'] = max(total['peak_memory'] or 0, phase['peak_memory'])
+        for name, value in report['counts'].items():
+            counts[name] = counts.get(name, 0) + value
+
+    return {'phases': list(phases.values()), 'counts': counts}
+
+
+def format_metrics(report):
+    """
+    Formats metrics, as returned by CompileMetrics.to_dict, as a table.
+
+    Returns:
+        - The table as a string.
+    """
+    lines = [f"{'phase':<10} {'wall ms':>10} {'cpu ms':>10} {'peak KB':>10}"]
+    for phase in report['phases']:
+        peak = '-' if phase['peak_memory'] is None else f"{phase['peak_memory'] / 1024:.1f}"
+        lines.append(f"{phase['name']:<10} {phase['wall'] * 1000:>10.2f} {phase['cpu'] * 1000:>10.2f} {peak:>10}")
+
+    wall = sum(phase['wall'] for phase in report['phases'])
+    cpu = sum(phase['cpu'] for phase in report['phases'])
+    lines.append(f"{'total':<10} {wall * 1000:>10.2f} {cpu * 1000:>10.2f}")
+
+    if report['counts']:
+        lines.append("")
+        lines.extend(f"{name:<18} {value:>10}" for name, value in report['counts'].items())
+
+    return "\n".join(lines)
@@ -0,0 +1,185 @@
+import re
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+from antlr4 import Token
+from antlr4.error.ErrorListener import ErrorListener
+from Controller.mapped_stream import MappedInputStream
+from Controller.token_buffer import TokenBuffer
+
+# Strings and comments, the only tokens a newline can be part of besides whitespace.
+# An unterminated string stops at its first backslash or at the end, like the lexer.
+SKELETON_PATTERN = re.compile(r'"[^"\\]*"?|//[^\n]*')
+BYTES_SKELETON_PATTERN = re.compile(SKELETON_PATTERN.pattern.encode('ascii'))
+
+# Smallest chunk worth sending to another process, in characters
+MIN_CHUNK_SIZE = 1 << 20
+
+
+def count_newlines(data, start: int, end: int, window: int = 1 << 24):
+    """Counts the newlines of data[start:end], copying at most 'window' characters at a time (mmap has no count)."""
+    newline = "\n" if isinstance(data, str) else b"\n"
+    return sum(data[position:min(position + window, end)].count(newline) for position in range(start, end, window))
+
+
+def split_points(data, chunks: int):
+    """
+    Finds where to split a source into about 'chunks' chunks of the same size.
+
+    Every split point is right after a newline that is not inside a string nor a
+    comment, so it starts a line and, if the source has no lexer errors, the lexer is
+    between two tokens there (or inside whitespace, which is skipped either way).
+
+    Returns:
+        - The sorted split points, without 0 and the end of the source.
+    """
+    newline = "\n" if isinstance(data, str) else b"\n"
+    pattern = SKELETON_PATTERN if isinstance(data, str) else BYTES_SKELETON_PATTERN
+    size = len(data)
+    targets = [size * index // chunks for index in range(1, chunks)]
+    points = []
+
+    matches = pattern.finditer(data)
+    match = next(matches, None)
+    for target in targets:
+        if points and target < points[-1]:
+            target = points[-1]
+        while True:
+            while match is not None and match.end() <= target:
+                match = next(matches, None)
+            if match is not None and match.start() <= target:
+                # Inside a string or a comment, look again after it
+                target = match.end()
+                continue
+            limit = match.start() if match is not None else size
+            position = data.find(newline, target, limit)
+            if position >= 0:
+                points.append(position + 1)
+                break
+            if match is None:
+                return [point for point in points if point < size]
+            target = limit
+
+    return [point for point in points if point < size]
+
+
+class ChunkErrorListener(ErrorListener):
+    """Records the lexer errors of a chunk with the indices of the characters they start and stop at."""
+    def __init__(self):
+        super().__init__()
+        self.errors = []
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.errors.append((recognizer._tokenStartCharIndex, recognizer.inputStream.index, line, column, msg))
+
+
+def lex_chunk(file_path: str, lexer_class, start: int, end: int, line: int):
+    """
+    Lexes the characters [start, end) of a file in a worker process.
+
+    The file is mapped (see Controller.mapped_stream) and lexed in place from 'start',
+    which is the start of line 'line', so the indices, lines and columns of the tokens
+    are already the ones of the whole file. The chunk is valid if no token nor failed
+    match crosses 'end': the lexer of the whole file then goes through the same
+    tokens and errors and is between two tokens at 'end'.
+
+    Returns:
+        - Whether the chunk is valid, the TokenBuffer columns of its tokens (the tokens that
+          start before 'end', and EOF in the last chunk), and its errors as (line, column, message).
+    """
+    input_stream = MappedInputStream(file_path)
+    lexer = lexer_class(input_stream)
+    lexer.removeErrorListeners()
+    listener = ChunkErrorListener()
+    lexer.addErrorListener(listener)
+    input_stream.seek(start)
+    lexer.line = line
+    lexer.column = 0
+
+    buffer = TokenBuffer(None, None)
+    match_token = getattr(lexer, 'match_token', None)
+    valid = True
+    while True:
+        fields = match_token() if match_token is not None else None
+        if fields is None:
+            token = lexer.nextToken()
+            fields = (token.type, token.start, token.stop, token.line, token.column)
+        if fields[1] >= end and (fields[0] != Token.EOF or end < len(input_stream.data)):
+            break
+        if fields[2] >= end and fields[0] != Token.EOF:
+            valid = False
+            break
+        buffer.append(*fields)
+        if fields[0] == Token.EOF:
+            break
+
+    errors = []
+    for error_start, error_stop, error_line, error_column, message in listener.errors:
+        if error_start >= end:
+            break
+        if error_stop >= end:
+            valid = False
+        errors.append((error_line, error_column, message))
+
+    input_stream.close()
+    return valid, buffer.types, buffer.starts, buffer.stops, buffer.lines, buffer.columns, errors
+
+
+def lex_parallel(lexer, workers: int, chunks: int = None):
+    """
+    Lexes the whole input of a lexer into a TokenBuffer, splitting it across a pool of processes.
+
+    The source is split at split_points, every chunk is lexed by lex_chunk, and the
+    columns of the chunks are joined in order, which gives the same tokens as lexing
+    the whole source with the lexer. The lexer errors of the chunks are reported to
+    the error listeners of the lexer in order, without the exceptions. The lexer is
+    left at the end of the input, as after lexing it.
+
+    The split points are only proven right by the chunks: if a lexer error (such as a
+    backslash in a string) made a string cross a split point, the whole source is
+    lexed again in this process. Sources that were not read from a file, or too small
+    to split, are lexed in this process too.
+
+    Args:
+        - lexer: compiscriptLexer or RegexLexer over a FileStream or a MappedInputStream, with its error listeners.
+        - workers: Number of worker processes.
+        - chunks: Number of chunks, if None one per worker and at most one per MIN_CHUNK_SIZE characters.
+
+    Returns:
+        - The TokenBuffer with every token, EOF included.
+    """
+    input_stream = lexer.inputStream
+    file_path = getattr(input_stream, 'fileName', None)
+    data = input_stream.strdata if input_stream.strdata is not None else input_stream.data
+    if chunks is None:
+        chunks = min(workers, len(data) // MIN_CHUNK_SIZE)
+    if file_path is None or workers < 2 or chunks < 2:
+        return TokenBuffer.from_lexer(lexer)
+
+    bounds = [0] + split_points(data, chunks) + [len(data)]
+    starts, ends = bounds[:-1], bounds[1:]
+    lines = [1]
+    for start, end in zip(starts[:-1], ends[:-1]):
+        lines.append(lines[-1] + count_newlines(data, start, end))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lex_chunk, repeat(file_path), repeat(type(lexer)), starts, ends, lines))
+
+    if not all(result[0] for result in results):
+        return TokenBuffer.from_lexer(lexer)
+
+    buffer = TokenBuffer(lexer, input_stream)
+    listener = lexer.getErrorListenerDispatch()
+    for _, types, token_starts, stops, token_lines, columns, errors in results:
+        for line, column, message in errors:
+            listener.syntaxError(lexer, None, line, column, message, None)
+        buffer.types.extend(types)
+        buffer.starts.extend(token_starts)
+        buffer.stops.extend(stops)
+        buffer.lines.extend(token_lines)
+        buffer.columns.extend(columns)
+
+    # Leave the lexer at the end of the input, where the EOF token is
+    input_stream.seek(len(data))
+    lexer.line = buffer.lines[-1]
+    lexer.column = buffer.columns[-1]
+    return buffer
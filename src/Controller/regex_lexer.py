@@ -0,0 +1,117 @@
+import re
+from antlr4 import Token
+from Language.compiscriptLexer import compiscriptLexer
+
+# Token type of each literal of the grammar, split into keywords and operators
+LITERALS = {name[1:-1]: token_type for token_type, name in enumerate(compiscriptLexer.literalNames)
+            if name.startswith("'")}
+KEYWORDS = {literal: token_type for literal, token_type in LITERALS.items() if literal.isalpha()}
+OPERATORS = {literal: token_type for literal, token_type in LITERALS.items() if not literal.isalpha()}
+
+# One alternative per group, tried in order: the groups start with different characters
+# except the comment and '/', and the operators are sorted longest first so '==' wins
+# over '=', which gives the longest match like the ANTLR lexer. The character classes
+# are spelled out because \s, \d and \w also match non-ASCII characters.
+(WS, COMMENT, NUMBER, STRING, IDENTIFIER, OPERATOR) = range(1, 7)
+TOKEN_PATTERN = re.compile("|".join((
+    r"([ \t\r\n]+)",
+    r"(//[^\n]*\n?)",
+    r"([0-9]+(?:\.[0-9]+)?)",
+    r'("[^"\\]*")',
+    r"([a-zA-Z_][a-zA-Z_0-9]*)",
+    "(" + "|".join(re.escape(operator) for operator in sorted(OPERATORS, key=len, reverse=True)) + ")",
+)))
+
+# The same pattern and tables over ASCII bytes, for the sources read from a MappedInputStream
+BYTES_TOKEN_PATTERN = re.compile(TOKEN_PATTERN.pattern.encode('ascii'))
+BYTES_KEYWORDS = {literal.encode('ascii'): token_type for literal, token_type in KEYWORDS.items()}
+BYTES_OPERATORS = {literal.encode('ascii'): token_type for literal, token_type in OPERATORS.items()}
+
+
+class RegexLexer(compiscriptLexer):
+    """
+    compiscriptLexer that matches the tokens with one compiled regular expression.
+
+    The token set of compiscript.g4 is regular and small, so instead of simulating the
+    lexer ATN one character at a time, every token is matched by TOKEN_PATTERN straight
+    on the source string, and the identifiers are looked up in KEYWORDS. The tokens are
+    created by the token factory with the same types, channels, indices, lines and columns
+    as the ones of compiscriptLexer, so it plugs into a CommonTokenStream as is.
+
+    The characters the pattern can't match (an unterminated string, a backslash in a
+    string, or a character of no token), and the end of the input, are left to
+    compiscriptLexer.nextToken, which reports the errors to the same listeners and
+    recovers from them the same way. The input stream, line and column are kept in sync
+    after every token, so both can take turns.
+
+    The input stream must be an InputStream or a FileStream, whose source string is
+    read from 'strdata', or a MappedInputStream (see Controller.mapped_stream), whose
+    bytes are matched in place with BYTES_TOKEN_PATTERN.
+    """
+    def nextToken(self):
+        fields = self.match_token()
+        if fields is None:
+            # End of the input or a lexer error, compiscriptLexer takes this token
+            return super().nextToken()
+
+        token_type, start, stop, line, column = fields
+        token = self._factory.create(self._tokenFactorySourcePair, token_type, None, Token.DEFAULT_CHANNEL,
+                                     start, stop, line, column)
+        self._token = token
+        return token
+
+    def match_token(self):
+        """
+        Matches the next token with TOKEN_PATTERN, skipping whitespace and comments, without
+        creating it (see Controller.token_buffer).
+
+        Returns:
+            - The (type, start, stop, line, column) of the token, or None at the end of the input
+              and on a lexer error, which are left to compiscriptLexer.nextToken.
+        """
+        input_stream = self._input
+        text = input_stream.strdata
+        if text is not None:
+            pattern, keywords, operators, newline = TOKEN_PATTERN, KEYWORDS, OPERATORS, "\n"
+        else:
+            text = input_stream.data
+            pattern, keywords, operators, newline = BYTES_TOKEN_PATTERN, BYTES_KEYWORDS, BYTES_OPERATORS, b"\n"
+        position = input_stream.index
+        line = self._interp.line
+        line_start = position - self._interp.column
+
+        while True:
+            match = pattern.match(text, position)
+            if match is None:
+                input_stream.seek(position)
+                self._interp.line = line
+                self._interp.column = position - line_start
+                return None
+
+            group = match.lastindex
+            end = match.end()
+            if group == IDENTIFIER:
+                token_type = keywords.get(match.group(), compiscriptLexer.IDENTIFIER)
+            elif group == OPERATOR:
+                token_type = operators[match.group()]
+            elif group == NUMBER:
+                token_type = compiscriptLexer.NUMBER
+            elif group == STRING:
+                token_type = compiscriptLexer.STRING
+            else:
+                token_type = None
+            start, start_line, start_column = position, line, position - line_start
+
+            if group <= STRING and group != NUMBER:
+                # Whitespace, comments and strings are the only tokens that can span lines
+                last_newline = text.rfind(newline, position, end)
+                if last_newline >= 0:
+                    line += match.group().count(newline)
+                    line_start = last_newline + 1
+
+            position = end
+            if token_type is not None:
+                input_stream.seek(position)
+                self._interp.line = line
+                self._interp.column = position - line_start
+                return token_type, start, end - 1, start_line, start_column
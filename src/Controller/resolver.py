@@ -0,0 +1,175 @@
+from types import GeneratorType
+import Model.ast_nodes as ast
+
+
+class Resolver:
+    """
+    Pass that binds every variable occurrence of the AST to the (level, slot) pair
+    of the symbol it refers to, before the semantic analysis runs.
+
+    The resolver opens the same scopes as the SemanticAnalyzer, in the same order,
+    and numbers the symbols of each scope in declaration order, like Scope.add_symbol.
+    The binding is stored on the Identifier, Assign, Set and Super nodes, and the
+    analyzer then finds the symbol with ScopeManager.resolve instead of walking the
+    scope chain. Occurrences that name no visible variable keep a None binding, so
+    the analyzer falls back to the name lookup and reports the error itself.
+
+    Like the SemanticAnalyzer, the visit methods with children are generators that
+    yield the nodes to visit (or the generator of another visit method), and walk()
+    runs them on an explicit stack, so the nesting depth is not limited by the Python
+    recursion limit.
+
+    Attributes:
+        - level: Level of the current scope (0 is the global scope).
+        - slot_counts: Number of symbols declared in each open scope, indexed by level.
+        - declared: Names declared in each open scope, indexed by level.
+        - bindings: Stack of (level, slot) of the visible variables of each name.
+    """
+    def __init__(self):
+        self.level = 0
+        self.slot_counts = [0]
+        self.declared = [[]]
+        self.bindings = {}
+
+
+    def resolve(self, program: ast.Program):
+        """Binds the variable occurrences of a program. Returns the program."""
+        self.visit(program)
+        return program
+
+
+    def visit(self, node: ast.Node):
+        result = self._visit_table[type(node)](self, node)
+        if type(result) is GeneratorType:
+            self.walk(result)
+
+
+    def walk(self, generator):
+        """
+        Runs the generator of a visit method to completion, see SemanticAnalyzer.walk.
+
+        The visit methods of the resolver return nothing and catch no exception, so
+        nothing is sent back to the generators and an exception simply propagates.
+        """
+        stack = [generator]
+        while stack:
+            try:
+                request = next(stack[-1])
+            except StopIteration:
+                stack.pop()
+                continue
+            if isinstance(request, ast.Node):
+                request = self._visit_table[type(request)](self, request)
+            if type(request) is GeneratorType:
+                stack.append(request)
+
+
+    # ---------- Scopes ----------
+
+    def enter_scope(self):
+        self.level += 1
+        self.slot_counts.append(0)
+        self.declared.append([])
+
+
+    def exit_scope(self):
+        # Names declared in the scope are no longer visible
+        for name in self.declared.pop():
+            self.bindings[name].pop()
+        self.slot_counts.pop()
+        self.level -= 1
+
+
+    def declare(self, name: str, is_variable=True):
+        """Takes the next slot of the current scope, functions take one too but are not variables."""
+        slot = self.slot_counts[self.level]
+        self.slot_counts[self.level] = slot + 1
+        if is_variable:
+            self.bindings.setdefault(name, []).append((self.level, slot))
+            self.declared[self.level].append(name)
+
+
+    def lookup(self, name: str):
+        """Returns the binding of the innermost visible variable with that name, or None."""
+        stack = self.bindings.get(name)
+        return stack[-1] if stack else None
+
+
+    # ---------- Declarations and statements ----------
+
+    def visitProgram(self, node: ast.Program):
+        for declaration in node.declarations:
+            yield declaration
+
+
+    def visitFunDecl(self, node: ast.FunDecl):
+        self.declare(node.name, is_variable=False)
+
+        # Function scope with the parameters, then the scope of the body
+        self.enter_scope()
+        for parameter in node.parameters or ():
+            self.declare(parameter)
+        yield self.visitBlock(node.body)
+        self.exit_scope()
+
+
+    def visitVarDecl(self, node: ast.VarDecl):
+        # The variable is declared before its initializer is analyzed
+        self.declare(node.name)
+        if node.initializer is not None:
+            yield node.initializer
+
+
+    def visitClassDecl(self, node: ast.ClassDecl):
+        # Class declarations are not analyzed yet
+        pass
+
+
+    def visitBlock(self, node: ast.Block):
+        self.enter_scope()
+        for declaration in node.declarations:
+            yield declaration
+        self.exit_scope()
+
+
+    def visitForStmt(self, node: ast.ForStmt):
+        # Scope of the loop, then the scope of the body (a block body opens a third one)
+        self.enter_scope()
+        for part in (node.initializer, node.condition, node.update):
+            if part is not None:
+                yield part
+        self.enter_scope()
+        yield node.body
+        self.exit_scope()
+        self.exit_scope()
+
+
+    def visitFunAnon(self, node: ast.FunAnon):
+        # Anonymous functions are not analyzed yet, their bodies stay unresolved
+        pass
+
+
+    # ---------- Variable occurrences ----------
+
+    def visitIdentifier(self, node: ast.Identifier):
+        node.binding = self.lookup(node.name)
+
+    visitSuper = visitIdentifier
+
+
+    def visitAssign(self, node: ast.Assign):
+        node.binding = self.lookup(node.name)
+        yield from node.children()
+
+    visitSet = visitAssign
+
+
+    def visitChildren(self, node: ast.Node):
+        yield from node.children()
+
+
+# Visit method of each node class, nodes without one only have their children resolved
+Resolver._visit_table = {
+    node_class: getattr(Resolver, 'visit' + node_class.__name__, Resolver.visitChildren)
+    for node_class in ast.NODE_CLASSES
+}
@@ -0,0 +1,191 @@
+import os
+import json
+import hashlib
+from Controller.dfa_cache import grammar_fingerprint
+
+# Bump when the layout of the cache entries changes
+CACHE_FORMAT = 2
+
+# Default size cap of the cache directory (64 MB)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Packages whose source files decide the outcome of a compilation: the generated
+# parsers, the lowering, the resolver, the analyzer and the way errors are reported
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMPILER_PACKAGES = ('Controller', 'Language', 'Model')
+
+# Variants of the key, one per set of compiler options that change the outcome
+CACHE_VARIANTS = ('', 'all-errors')
+
+_compiler_version = None
+
+
+def compiler_sources():
+    """Returns the paths of every .py file of the COMPILER_PACKAGES, relative to src/ and sorted."""
+    sources = []
+    for package in COMPILER_PACKAGES:
+        for directory, subdirectories, files in os.walk(os.path.join(SRC_DIR, package)):
+            subdirectories[:] = [name for name in subdirectories if name != '__pycache__']
+            sources.extend(os.path.relpath(os.path.join(directory, name), SRC_DIR)
+                           for name in files if name.endswith('.py'))
+    return sorted(sources)
+
+
+def compiler_version():
+    """
+    Returns a fingerprint of the grammar and of every source file of the compiler, so
+    cache entries produced by an older version of any of them are never reused.
+    """
+    global _compiler_version
+    if _compiler_version is None:
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_FORMAT}:{grammar_fingerprint()}".encode())
+        for source in compiler_sources():
+            digest.update(source.replace(os.sep, '/').encode())
+            with open(os.path.join(SRC_DIR, source), 'rb') as file:
+                digest.update(file.read())
+        _compiler_version = digest.hexdigest()
+
+    return _compiler_version
+
+
+class ResultCache:
+    """
+    On-disk cache of compilation outcomes keyed by the content of the source file.
+
+    Each entry is a JSON file named after the SHA-256 of the source text plus the
+    compiler version. Hits refresh the modification time of the entry, and prune()
+    removes the least recently used entries until the cache fits in max_bytes.
+
+    Attributes:
+        - directory: Directory where the entries are stored.
+        - max_bytes: Size cap of the cache directory.
+    """
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+
+    def key(self, source: bytes, variant: str = ''):
+        """
+        Returns the cache key of a source text.
+
+        Args:
+            - source: The source text.
+            - variant: Name of the compiler options that change the outcome, if any.
+        """
+        digest = hashlib.sha256(source)
+        digest.update(compiler_version().encode())
+        digest.update(variant.encode())
+        return digest.hexdigest()
+
+
+    def _entry_path(self, key: str):
+        return os.path.join(self.directory, f"{key}.json")
+
+
+    def get(self, key: str):
+        """
+        Returns the cached outcome for a key, or None on a miss.
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        # Mark the entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return entry
+
+
+    def put(self, key: str, entry: dict):
+        """
+        Stores the outcome of a compilation under a key.
+
+        Args:
+            - key: The cache key of the source text.
+            - entry: Dictionary with the 'error', 'phase' and 'scopes' of the compilation.
+        """
+        path = self._entry_path(key)
+        # Write to a temporary file first so concurrent workers never read half an entry
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(entry, file)
+        os.replace(temp_path, path)
+
+
+    def evict(self, key: str):
+        """Removes one entry. Returns True if it existed."""
+        try:
+            os.remove(self._entry_path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+
+    def evict_source(self, file_path: str):
+        """Removes the entries of the current content of a source file, one per variant. Returns how many existed."""
+        with open(file_path, 'rb') as file:
+            source = file.read()
+        return sum(self.evict(self.key(source, variant)) for variant in CACHE_VARIANTS)
+
+
+    def _entries(self):
+        """Returns (mtime, size, path) for every entry in the cache."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+
+    def prune(self, max_bytes: int = None):
+        """
+        Removes the least recently used entries until the cache fits in the size cap.
+
+        Args:
+            - max_bytes: Size cap to enforce, defaults to the cap of the cache.
+
+        Returns:
+            - The number of removed entries.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+
+        removed = 0
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+
+        return removed
+
+
+    def clear(self):
+        """Removes every entry. Returns the number of removed entries."""
+        return self.prune(max_bytes=0)
+
+
+    def size(self):
+        """Returns the number of entries and their total size in bytes."""
+        entries = self._entries()
+        return len(entries), sum(size for _, size, _ in entries)
@@ -1,33 +1,42 @@
-from Model.data_types import BooleanType, NumType, StringType
+from Model.data_types import BOOLEAN_TYPE, NUM_TYPE, STRING_TYPE, ERROR_TYPE
+from Controller.custom_exception import SemanticError
 
 def validate_logical_types(left_type, right_type, operator):
     """
     Validate that both types are BooleanType for logical operators ('and', 'or').
     """
-    if not isinstance(left_type, BooleanType) or not isinstance(right_type, BooleanType):
-        raise Exception(f"Type mismatch: Operator '{operator}' requires boolean operands, found '{left_type}' and '{right_type}'")
+    # Operands that already failed to type check were reported
+    if left_type is ERROR_TYPE or right_type is ERROR_TYPE:
+        return
+
+    if left_type is not BOOLEAN_TYPE or right_type is not BOOLEAN_TYPE:
+        raise SemanticError('logical-operands', f"Type mismatch: Operator '{operator}' requires boolean operands, found '{left_type}' and '{right_type}'")
 
 
-def validate_arithmetic_type(left_type, right_type, operator, logger, print_context, return_context):
+def validate_arithmetic_type(left_type, right_type, operator, print_context, return_context):
     """
     Validate that both types are NumType for arithmetic operators ('+', '-', '*', '/', '%') 
     or comparison operators ('<', '>', '<=', '>=').
+
+    Returns 'concatenation' when the operator joins strings, 'postponed' when the check
+    is left for runtime, and None for a regular numeric operation.
     """
-    # Check if the + operator is being used and print the context 
+    # Check if the + operator is being used in the print context
     if operator == '+' and print_context:
-        logger.debug("Operator '+' is being used as a concatenation operator.")
-        return
+        return 'concatenation'
     
+    # Operation type inference is postponed until runtime
     if return_context:
-        logger.debug(f"Operation type inference for operator '{operator}' postponed until runtime.")
-        return
+        return 'postponed'
     
-    if isinstance(left_type, StringType) and isinstance(right_type, StringType):
-        logger.debug(f"Operator '{operator}' is being used as a concatenation operator.")
+    if left_type is ERROR_TYPE or right_type is ERROR_TYPE:
         return
+
+    if left_type is STRING_TYPE and right_type is STRING_TYPE:
+        return 'concatenation'
     
-    elif not isinstance(left_type, NumType) or not isinstance(right_type, NumType):
-        raise Exception(f"Type mismatch: Operator '{operator}' requires numeric operands, found '{left_type}' and '{right_type}'")
+    elif left_type is not NUM_TYPE or right_type is not NUM_TYPE:
+        raise SemanticError('arithmetic-operands', f"Type mismatch: Operator '{operator}' requires numeric operands, found '{left_type}' and '{right_type}'")
 
 
 def validate_equality_type(left_type, right_type, operator):
@@ -35,24 +44,27 @@ def validate_equality_type(left_type, right_type, operator):
     Validate that both types are the same for equality operators ('==', '!=').
     Only NumType or StringType can be compared.
     """
-    if not isinstance(left_type, type(right_type)):
-        raise Exception(f"Type mismatch: Cannot compare '{left_type}' with '{right_type}' using '{operator}'")
+    if left_type is ERROR_TYPE or right_type is ERROR_TYPE:
+        return
+
+    if left_type is not right_type:
+        raise SemanticError('equality-operands', f"Type mismatch: Cannot compare '{left_type}' with '{right_type}' using '{operator}'")
 
-    if not isinstance(left_type, (NumType, StringType)):
-        raise Exception(f"Type mismatch: Operator '{operator}' requires operands to be either both numbers or both strings, found '{left_type}' and '{right_type}'")
+    if left_type is not NUM_TYPE and left_type is not STRING_TYPE:
+        raise SemanticError('equality-operands', f"Type mismatch: Operator '{operator}' requires operands to be either both numbers or both strings, found '{left_type}' and '{right_type}'")
 
 
 def validate_boolean_expression_type(expression_type, extra_message=""):
     """
     Validate that the expression type is BooleanType.
     """
-    if not isinstance(expression_type, BooleanType):
-        raise Exception(f"Type mismatch: Expected boolean expression{extra_message}")
+    if expression_type is not BOOLEAN_TYPE and expression_type is not ERROR_TYPE:
+        raise SemanticError('boolean-expected', f"Type mismatch: Expected boolean expression{extra_message}")
     
 
 def validate_num_expression_type(expression_type, extra_message=""):
     """
     Validate that the expression type is NumType.
     """
-    if not isinstance(expression_type, NumType):
-        raise Exception(f"Type mismatch: Expected numeric expression{extra_message}")
\ No newline at end of file
+    if expression_type is not NUM_TYPE and expression_type is not ERROR_TYPE:
+        raise SemanticError('number-expected', f"Type mismatch: Expected numeric expression{extra_message}")
\ No newline at end of file
@@ -0,0 +1,172 @@
+import os
+import json
+import socket
+import tempfile
+import threading
+import socketserver
+from Controller.batch import FileResult, compile_worker
+from Controller.compiler import PARSE_MODES, PARSERS, LEXERS, TOKEN_STORES, INPUT_MODES
+from Controller.dfa_cache import save_dfa_snapshot, load_dfa_snapshot, dfa_state_count
+
+# Default location of the compile server socket
+DEFAULT_SOCKET_PATH = os.path.join(tempfile.gettempdir(), 'compiscript.sock')
+
+
+class CompileRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handles one client connection. Each line sent by the client is a JSON request
+    and gets a single JSON line as response.
+    """
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.server.dispatch(json.loads(line))
+            except Exception as e:
+                response = {'ok': False, 'error': str(e)}
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+class CompileServer(socketserver.UnixStreamServer):
+    """
+    Long-lived compile server listening on a Unix socket.
+
+    Compilations run in this process one at a time, so the class-level DFA caches of
+    the lexer and the parser stay warm between requests. The caches can be loaded from
+    and saved to a snapshot file so they also survive restarts.
+
+    Requests:
+        - {"command": "compile", "path": ..., "parse_mode": ..., "parser": ..., "lexer": ..., "token_store": ...,
+          "input_mode": ..., "lex_jobs": ..., "all_errors": ..., "timings": ...}: Compiles a file.
+        - {"command": "stats"}: Returns the number of compilations and cached DFA states.
+        - {"command": "snapshot"}: Saves the DFA caches to the snapshot file.
+        - {"command": "shutdown"}: Saves the snapshot (if any) and stops the server.
+    """
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, snapshot_path=None):
+        # Remove a socket left behind by a previous server
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+        super().__init__(socket_path, CompileRequestHandler)
+        self.socket_path = socket_path
+        self.snapshot_path = snapshot_path
+        self.compilations = 0
+        self.loaded_states = load_dfa_snapshot(snapshot_path) if snapshot_path else 0
+
+
+    def dispatch(self, request: dict):
+        """
+        Runs a request and returns the response to send back to the client.
+        """
+        command = request.get('command')
+
+        if command == 'compile':
+            parse_mode = request.get('parse_mode', 'two-stage')
+            if parse_mode not in PARSE_MODES:
+                return {'ok': False, 'error': f"Unknown parse mode '{parse_mode}'"}
+            parser = request.get('parser', 'antlr')
+            if parser not in PARSERS:
+                return {'ok': False, 'error': f"Unknown parser '{parser}'"}
+            lexer = request.get('lexer', 'antlr')
+            if lexer not in LEXERS:
+                return {'ok': False, 'error': f"Unknown lexer '{lexer}'"}
+            token_store = request.get('token_store', 'list')
+            if token_store not in TOKEN_STORES:
+                return {'ok': False, 'error': f"Unknown token store '{token_store}'"}
+            input_mode = request.get('input_mode', 'read')
+            if input_mode not in INPUT_MODES:
+                return {'ok': False, 'error': f"Unknown input mode '{input_mode}'"}
+            lex_jobs = request.get('lex_jobs', 1)
+            if not isinstance(lex_jobs, int) or lex_jobs < 1:
+                return {'ok': False, 'error': f"Invalid lex jobs '{lex_jobs}'"}
+            result = compile_worker(request['path'], parse_mode, all_errors=bool(request.get('all_errors')),
+                                    timings=bool(request.get('timings')), parser=parser, lexer=lexer,
+                                    token_store=token_store, input_mode=input_mode, lex_jobs=lex_jobs)
+            self.compilations += 1
+            return {'ok': True, 'result': result.to_dict()}
+
+        if command == 'stats':
+            return {'ok': True, 'compilations': self.compilations,
+                    'loaded_states': self.loaded_states, 'dfa_states': dfa_state_count()}
+
+        if command == 'snapshot':
+            if self.snapshot_path is None:
+                return {'ok': False, 'error': "The server was started without a snapshot path"}
+            return {'ok': True, 'saved_states': save_dfa_snapshot(self.snapshot_path)}
+
+        if command == 'shutdown':
+            saved_states = save_dfa_snapshot(self.snapshot_path) if self.snapshot_path else 0
+            # shutdown() blocks until serve_forever() returns, so it can't run in this thread
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {'ok': True, 'saved_states': saved_states}
+
+        return {'ok': False, 'error': f"Unknown command '{command}'"}
+
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def send_requests(requests, socket_path=DEFAULT_SOCKET_PATH):
+    """
+    Sends requests to a running compile server over a single connection.
+
+    Args:
+        - requests: Iterable of request dictionaries.
+        - socket_path: Path of the server socket.
+
+    Returns:
+        - The list of response dictionaries, in the same order as the requests.
+    """
+    responses = []
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        with client.makefile('rwb') as stream:
+            for request in requests:
+                stream.write(json.dumps(request).encode('utf-8') + b'\n')
+                stream.flush()
+                responses.append(json.loads(stream.readline()))
+
+    return responses
+
+
+def compile_remote(sources, socket_path=DEFAULT_SOCKET_PATH, parse_mode='two-stage', all_errors=False, timings=False,
+                   parser='antlr', lexer='antlr', token_store='list',
+                   input_mode='read', lex_jobs=1):
+    """
+    Compiles the source files through a running compile server.
+
+    Args:
+        - sources: List of source file paths.
+        - socket_path: Path of the server socket.
+        - parse_mode: Prediction strategy of the parser.
+        - all_errors: Whether to report every syntax and semantic error of each file.
+        - timings: Whether to record the time and memory of each phase of each file.
+        - parser: Parser to use, one of PARSERS.
+        - lexer: Lexer to use, one of LEXERS.
+        - token_store: How the tokens are kept while parsing, one of TOKEN_STORES.
+        - input_mode: How the file is read, one of INPUT_MODES.
+        - lex_jobs: Number of processes that lex each file.
+
+    Returns:
+        - The list of FileResult in the same order as the sources.
+    """
+    # The server may run from another directory, so send absolute paths
+    requests = [{'command': 'compile', 'path': os.path.abspath(path), 'parse_mode': parse_mode, 'parser': parser,
+                 'lexer': lexer, 'token_store': token_store, 'input_mode': input_mode, 'lex_jobs': lex_jobs,
+                 'all_errors': all_errors, 'timings': timings}
+                for path in sources]
+    results = []
+    for path, response in zip(sources, send_requests(requests, socket_path)):
+        if not response['ok']:
+            results.append(FileResult(path, f"Error: {response['error']}"))
+            continue
+        result = FileResult.from_dict(response['result'])
+        result.path = path
+        results.append(result)
+
+    return results
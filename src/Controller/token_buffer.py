@@ -0,0 +1,173 @@
+from array import array
+from io import StringIO
+from antlr4.Token import Token, CommonToken
+from antlr4.BufferedTokenStream import TokenStream
+from antlr4.error.Errors import IllegalStateException
+
+
+class TokenBuffer:
+    """
+    Tokens of a source stored column by column instead of one CommonToken per token.
+
+    The type, start, stop, line and column of every token are kept in parallel
+    array('i') columns, about 20 bytes per token, and the text is sliced from the
+    input stream when it is asked for. Indexing the buffer creates a CommonToken for
+    one token, which is not kept, so the token objects only live while they are used.
+
+    compiscript.g4 sends every token to the default channel (whitespace and comments
+    are skipped), so the channel is not stored.
+
+    Attributes:
+        - types, starts, stops, lines, columns: The columns, one entry per token, the last one is EOF.
+        - source: (token source, input stream) pair shared by the tokens, as in CommonToken.
+    """
+    def __init__(self, token_source, input_stream):
+        self.types = array('i')
+        self.starts = array('i')
+        self.stops = array('i')
+        self.lines = array('i')
+        self.columns = array('i')
+        self.source = (token_source, input_stream)
+
+    @classmethod
+    def from_lexer(cls, lexer):
+        """
+        Lexes the whole input of a lexer into a new buffer.
+
+        A RegexLexer (see Controller.regex_lexer) fills the columns straight from its
+        matches, without creating the tokens, any other lexer through nextToken.
+        """
+        buffer = cls(lexer, lexer.inputStream)
+        match_token = getattr(lexer, 'match_token', None)
+        append = buffer.append
+        while True:
+            fields = match_token() if match_token is not None else None
+            if fields is not None:
+                append(*fields)
+                continue
+
+            # End of the input or a lexer error, or a lexer that only creates tokens
+            token = lexer.nextToken()
+            append(token.type, token.start, token.stop, token.line, token.column)
+            if token.type == Token.EOF:
+                return buffer
+
+    def append(self, token_type: int, start: int, stop: int, line: int, column: int):
+        self.types.append(token_type)
+        self.starts.append(start)
+        self.stops.append(stop)
+        self.lines.append(line)
+        self.columns.append(column)
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index: int):
+        """Creates the CommonToken of the token at 'index', its text is read from the input stream when needed."""
+        if index < 0:
+            index += len(self.types)
+        # Fill the slots directly, the constructor would set most of them twice
+        token = CommonToken.__new__(CommonToken)
+        token.source = self.source
+        token.type = self.types[index]
+        token.channel = Token.DEFAULT_CHANNEL
+        token.start = self.starts[index]
+        token.stop = self.stops[index]
+        token.tokenIndex = index
+        token.line = self.lines[index]
+        token.column = self.columns[index]
+        token._text = None
+        return token
+
+    def text(self, index: int):
+        """Returns the text of the token at 'index', '<EOF>' for the EOF token."""
+        if self.types[index] == Token.EOF:
+            return "<EOF>"
+        return self.source[1].getText(self.starts[index], self.stops[index])
+
+
+class ColumnarTokenStream(TokenStream):
+    """
+    Token stream over a TokenBuffer, so the ANTLR parsers and the FastParser can parse it
+    like a filled CommonTokenStream.
+
+    Lookahead by type (LA) reads the types column, the tokens asked for with LT and get
+    are created by the buffer. The last one is kept, since the parser asks for the
+    current token several times before consuming it.
+
+    Attributes:
+        - tokens: The TokenBuffer, indexed like the token list of a CommonTokenStream.
+        - types: The types column of the buffer.
+        - tokenSource: The lexer that filled the buffer.
+        - index: Index of the current token.
+    """
+    def __init__(self, buffer: TokenBuffer):
+        super().__init__()
+        self.tokens = buffer
+        self.types = buffer.types
+        self.tokenSource = buffer.source[0]
+        self.index = 0
+        self._last = None
+
+    def fill(self):
+        # The buffer already holds every token up to EOF
+        pass
+
+    def getTokenSource(self):
+        return self.tokenSource
+
+    @property
+    def size(self):
+        return len(self.types)
+
+    def mark(self):
+        return 0
+
+    def release(self, marker: int):
+        pass
+
+    def seek(self, index: int):
+        self.index = index
+
+    def consume(self):
+        if self.types[self.index] == Token.EOF:
+            raise IllegalStateException("cannot consume EOF")
+        self.index += 1
+
+    def get(self, index: int):
+        last = self._last
+        if last is not None and last.tokenIndex == index:
+            return last
+        self._last = last = self.tokens[index]
+        return last
+
+    def LA(self, k: int):
+        if k <= 0:
+            token = self.LT(k)
+            return token.type if token is not None else Token.INVALID_TYPE
+        return self.types[min(self.index + k - 1, len(self.types) - 1)]
+
+    def LT(self, k: int):
+        if k == 0:
+            return None
+        if k < 0:
+            return self.get(self.index + k) if self.index + k >= 0 else None
+        return self.get(min(self.index + k - 1, len(self.types) - 1))
+
+    def getText(self, start=None, stop=None):
+        if isinstance(start, Token):
+            start = start.tokenIndex
+        elif start is None:
+            start = 0
+        if isinstance(stop, Token):
+            stop = stop.tokenIndex
+        elif stop is None or stop >= len(self.types):
+            stop = len(self.types) - 1
+        if start < 0 or stop < 0 or stop < start:
+            return ""
+        with StringIO() as buf:
+            for index in range(start, stop + 1):
+                if self.types[index] == Token.EOF:
+                    break
+                buf.write(self.tokens.text(index))
+            return buf.getvalue()
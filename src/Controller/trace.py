@@ -0,0 +1,99 @@
+import json
+
+
+class TraceEvent:
+    """
+    Event recorded by the semantic analyzer while tracing.
+
+    Attributes:
+        - event: What happened ('visit', 'declare', 'infer', 'enter_scope', ...).
+        - node: Class name of the AST node being analyzed, or None.
+        - span: Span (line, column, end_line, end_column) of the node, or None.
+        - scope: Name of the current scope.
+        - level: Depth of the current scope.
+        - data_type: Type involved in the event (declared or inferred), or None.
+        - detail: Extra information, such as the name of a symbol or an operator.
+    """
+    __slots__ = ('event', 'node', 'span', 'scope', 'level', 'data_type', 'detail')
+
+    def __init__(self, event, node, span, scope, level, data_type, detail):
+        self.event = event
+        self.node = node
+        self.span = span
+        self.scope = scope
+        self.level = level
+        self.data_type = data_type
+        self.detail = detail
+
+    def to_dict(self):
+        return {
+            'event': self.event,
+            'node': self.node,
+            'span': list(self.span) if self.span is not None else None,
+            'scope': self.scope,
+            'level': self.level,
+            'type': None if self.data_type is None else str(self.data_type),
+            'detail': self.detail,
+        }
+
+    def __str__(self):
+        position = f"{self.span[0]}:{self.span[1]}" if self.span is not None else "-"
+        text = f"{position:>8} {'  ' * self.level}{self.event}"
+        if self.node is not None:
+            text += f" {self.node}"
+        if self.detail is not None:
+            text += f" '{self.detail}'"
+        if self.data_type is not None:
+            text += f" : {self.data_type}"
+        return f"{text} [{self.scope}]"
+
+
+class Tracer:
+    """
+    Buffer of the events emitted by the semantic analyzer.
+
+    The analyzer only holds a tracer while tracing is enabled and guards every call site
+    with 'if self.tracer is not None:', so a compilation without tracing builds no
+    event and formats no string at all. Events keep their raw values and are only
+    formatted when dumped.
+    """
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event, node=None, scope=None, data_type=None, detail=None):
+        """
+        Records an event.
+
+        Args:
+            - event: What happened.
+            - node: AST node being analyzed, if any.
+            - scope: Current scope, if any.
+            - data_type: Type involved in the event, if any.
+            - detail: Extra information, if any.
+        """
+        self.events.append(TraceEvent(
+            event,
+            None if node is None else type(node).__name__,
+            getattr(node, 'span', None),
+            None if scope is None else scope.name,
+            0 if scope is None else scope.level,
+            data_type,
+            detail,
+        ))
+
+    def __len__(self):
+        return len(self.events)
+
+    def lines(self):
+        """Yields the events formatted as text, one per line."""
+        for event in self.events:
+            yield str(event)
+
+    def dump(self, stream):
+        """Writes the events as text to a stream."""
+        for line in self.lines():
+            stream.write(line + '\n')
+
+    def to_json(self):
+        """Returns the events as a JSON string."""
+        return json.dumps([event.to_dict() for event in self.events])
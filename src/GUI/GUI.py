@@ -66,6 +66,16 @@ class CompilerGUI:
         save_button = tk.Button(self.button_frame, text="Guardar", command=self.save_file)  
         save_button.pack(side=tk.LEFT, padx=10, pady=5)
 
+        # Casilla para reportar todos los errores del archivo en lugar de detenerse en el primero
+        self.all_errors = tk.BooleanVar(value=False)
+        all_errors_check = tk.Checkbutton(self.button_frame, text="Todos los errores", variable=self.all_errors)
+        all_errors_check.pack(side=tk.LEFT, padx=10, pady=5)
+
+        # Casilla para mostrar el tiempo y la memoria de cada fase de la compilación
+        self.timings = tk.BooleanVar(value=False)
+        timings_check = tk.Checkbutton(self.button_frame, text="Tiempos", variable=self.timings)
+        timings_check.pack(side=tk.LEFT, padx=10, pady=5)
+
         # Crear el menú en la barra de menú
         self.menu_bar = Menu(root)
         root.config(menu=self.menu_bar)
@@ -85,7 +95,8 @@ class CompilerGUI:
             self.terminal_output.delete("1.0", tk.END)
 
             # Ejecuta el proceso de compilación o debugueo y captura el output y errores
-            output, error = self.run_code_callback(self.current_file_path, is_debug, self.terminal_output)
+            output, error = self.run_code_callback(self.current_file_path, is_debug, self.terminal_output,
+                                                   timings=self.timings.get(), all_errors=self.all_errors.get())
 
             # Despliega el output (logs y mensajes de stdout/stderr) en la terminal de la GUI
             if error:
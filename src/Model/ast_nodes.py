@@ -0,0 +1,304 @@
+class Node:
+    """
+    Base class of the nodes of the abstract syntax tree (AST).
+
+    The AST is lowered from the ANTLR parse tree: it keeps no tokens nor parent
+    pointers, and single-child rule chains (logic_or -> ... -> primary) are collapsed
+    into the node they wrap. Every node stores the source span it was built from.
+
+    Attributes:
+        - span: Tuple (line, column, end_line, end_column) of the node in the source.
+        - fields: Names of the attributes holding child nodes (or lists of child nodes).
+    """
+    __slots__ = ('span',)
+    fields = ()
+
+    def accept(self, visitor):
+        """Calls the visit method of the visitor for this node class."""
+        return getattr(visitor, 'visit' + type(self).__name__)(self)
+
+    def children(self):
+        """Yields the child nodes in source order."""
+        for field in self.fields:
+            value = getattr(self, field)
+            if isinstance(value, list):
+                yield from value
+            elif value is not None:
+                yield value
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+
+# ---------- Declarations and statements ----------
+
+class Program(Node):
+    __slots__ = ('declarations',)
+    fields = ('declarations',)
+
+    def __init__(self, declarations: list, span=None):
+        self.declarations = declarations
+        self.span = span
+
+
+class ClassDecl(Node):
+    __slots__ = ('name', 'superclass', 'methods')
+    fields = ('methods',)
+
+    def __init__(self, name: str, superclass: str, methods: list, span=None):
+        self.name = name
+        self.superclass = superclass    # Name of the parent class, or None
+        self.methods = methods          # List of FunDecl
+        self.span = span
+
+
+class FunDecl(Node):
+    __slots__ = ('name', 'parameters', 'body')
+    fields = ('body',)
+
+    def __init__(self, name: str, parameters: list, body, span=None):
+        self.name = name
+        self.parameters = parameters    # List of parameter names, or None if the function takes none
+        self.body = body                # Block
+        self.span = span
+
+
+class VarDecl(Node):
+    __slots__ = ('name', 'initializer')
+    fields = ('initializer',)
+
+    def __init__(self, name: str, initializer=None, span=None):
+        self.name = name
+        self.initializer = initializer
+        self.span = span
+
+
+class ExprStmt(Node):
+    __slots__ = ('expression',)
+    fields = ('expression',)
+
+    def __init__(self, expression, span=None):
+        self.expression = expression
+        self.span = span
+
+
+class ForStmt(Node):
+    __slots__ = ('initializer', 'condition', 'update', 'body')
+    fields = ('initializer', 'condition', 'update', 'body')
+
+    def __init__(self, initializer, condition, update, body, span=None):
+        self.initializer = initializer  # VarDecl, ExprStmt or None
+        self.condition = condition
+        self.update = update
+        self.body = body
+        self.span = span
+
+
+class IfStmt(Node):
+    __slots__ = ('condition', 'then_branch', 'else_branch')
+    fields = ('condition', 'then_branch', 'else_branch')
+
+    def __init__(self, condition, then_branch, else_branch=None, span=None):
+        self.condition = condition
+        self.then_branch = then_branch
+        self.else_branch = else_branch
+        self.span = span
+
+
+class PrintStmt(Node):
+    __slots__ = ('expression',)
+    fields = ('expression',)
+
+    def __init__(self, expression, span=None):
+        self.expression = expression
+        self.span = span
+
+
+class ReturnStmt(Node):
+    __slots__ = ('value',)
+    fields = ('value',)
+
+    def __init__(self, value=None, span=None):
+        self.value = value
+        self.span = span
+
+
+class WhileStmt(Node):
+    __slots__ = ('condition', 'body')
+    fields = ('condition', 'body')
+
+    def __init__(self, condition, body, span=None):
+        self.condition = condition
+        self.body = body
+        self.span = span
+
+
+class Block(Node):
+    __slots__ = ('declarations',)
+    fields = ('declarations',)
+
+    def __init__(self, declarations: list, span=None):
+        self.declarations = declarations
+        self.span = span
+
+
+# ---------- Expressions ----------
+
+class FunAnon(Node):
+    __slots__ = ('parameters', 'body')
+    fields = ('body',)
+
+    def __init__(self, parameters: list, body, span=None):
+        self.parameters = parameters
+        self.body = body
+        self.span = span
+
+
+class Assign(Node):
+    __slots__ = ('name', 'value', 'binding')
+    fields = ('value',)
+
+    def __init__(self, name: str, value, span=None):
+        self.name = name
+        self.value = value
+        self.binding = None             # (depth, slot) of the variable, set by Controller.resolver
+        self.span = span
+
+
+class Set(Node):
+    """Assignment to a property: object.name = value"""
+    __slots__ = ('object', 'name', 'value', 'binding')
+    fields = ('object', 'value')
+
+    def __init__(self, object, name: str, value, span=None):
+        self.object = object
+        self.name = name
+        self.value = value
+        self.binding = None             # (depth, slot) of the variable, set by Controller.resolver
+        self.span = span
+
+
+class Binary(Node):
+    """
+    Chain of operands of the same precedence level, e.g. a + b - c.
+    operators[i] sits between operands[i] and operands[i + 1].
+    """
+    __slots__ = ('operands', 'operators')
+    fields = ('operands',)
+
+    def __init__(self, operands: list, operators: list, span=None):
+        self.operands = operands
+        self.operators = operators
+        self.span = span
+
+
+class Unary(Node):
+    __slots__ = ('operator', 'operand')
+    fields = ('operand',)
+
+    def __init__(self, operator: str, operand, span=None):
+        self.operator = operator
+        self.operand = operand
+        self.span = span
+
+
+class Call(Node):
+    __slots__ = ('callee', 'arguments')
+    fields = ('callee', 'arguments')
+
+    def __init__(self, callee, arguments: list, span=None):
+        self.callee = callee
+        self.arguments = arguments
+        self.span = span
+
+
+class Get(Node):
+    __slots__ = ('object', 'name')
+    fields = ('object',)
+
+    def __init__(self, object, name: str, span=None):
+        self.object = object
+        self.name = name
+        self.span = span
+
+
+class Index(Node):
+    __slots__ = ('object', 'index')
+    fields = ('object', 'index')
+
+    def __init__(self, object, index, span=None):
+        self.object = object
+        self.index = index
+        self.span = span
+
+
+class Literal(Node):
+    """A 'num', 'string', 'true', 'false' or 'nil' literal, value holds the source text."""
+    __slots__ = ('kind', 'value')
+
+    def __init__(self, kind: str, value: str, span=None):
+        self.kind = kind
+        self.value = value
+        self.span = span
+
+
+class Identifier(Node):
+    __slots__ = ('name', 'binding')
+
+    def __init__(self, name: str, span=None):
+        self.name = name
+        self.binding = None             # (depth, slot) of the variable, set by Controller.resolver
+        self.span = span
+
+
+class This(Node):
+    __slots__ = ()
+
+    def __init__(self, span=None):
+        self.span = span
+
+
+class Super(Node):
+    __slots__ = ('name', 'binding')
+
+    def __init__(self, name: str, span=None):
+        self.name = name
+        self.binding = None             # (depth, slot) of the variable, set by Controller.resolver
+        self.span = span
+
+
+class Grouping(Node):
+    __slots__ = ('expression',)
+    fields = ('expression',)
+
+    def __init__(self, expression, span=None):
+        self.expression = expression
+        self.span = span
+
+
+class ArrayLiteral(Node):
+    __slots__ = ('elements',)
+    fields = ('elements',)
+
+    def __init__(self, elements: list, span=None):
+        self.elements = elements
+        self.span = span
+
+
+class New(Node):
+    __slots__ = ('class_name', 'arguments')
+    fields = ('arguments',)
+
+    def __init__(self, class_name: str, arguments: list, span=None):
+        self.class_name = class_name
+        self.arguments = arguments
+        self.span = span
+
+
+# Every concrete node class, used to build class-keyed dispatch tables
+NODE_CLASSES = (
+    Program, ClassDecl, FunDecl, VarDecl, ExprStmt, ForStmt, IfStmt, PrintStmt, ReturnStmt, WhileStmt, Block,
+    FunAnon, Assign, Set, Binary, Unary, Call, Get, Index, Literal, Identifier, This, Super, Grouping,
+    ArrayLiteral, New,
+)
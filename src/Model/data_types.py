@@ -9,21 +9,105 @@ class DataType(Enum):
     - BOOLEAN: Represents a boolean.
     - STRING: Represents a string.
     - NIL: Represents a null value.
+    - ARRAY: Represents an array of elements of one type.
+    - FUNCTION: Represents a function value.
+    - CLASS: Represents an instance of a class.
+    - ERROR: Represents the type of an expression that failed to type check.
     """
     NUM = auto()
     BOOLEAN = auto()
     STRING = auto()
     NIL = auto()
+    ARRAY = auto()
+    FUNCTION = auto()
+    CLASS = auto()
+    ERROR = auto()
 
     def __str__(self):
         return self.name.lower()
 
-class Type():
+
+class TypeRegistry:
+    """
+    Registry of the canonical instance of every type.
+
+    Types are hash-consed: building a type with the same class and arguments always
+    returns the same object, so two types are equal only if they are the same object
+    and can be compared with 'is'.
+    """
+    def __init__(self):
+        self.types = {}     # Canonical type by (type class, arguments)
+        self.names = {}     # First registered type by name (e.g. 'num[]')
+
+    def intern(self, type_class, args: tuple):
+        """
+        Returns the canonical instance of a type, creating it on first use.
+
+        Args:
+            - type_class: The Type subclass.
+            - args: The arguments of the type, they must be hashable (other types, names, tuples).
+        """
+        key = (type_class, args)
+        instance = self.types.get(key)
+        if instance is None:
+            instance = type_class.__new__(type_class)
+            instance.__init__(*args)
+            self.types[key] = instance
+            # Types are immutable, so the name never changes once registered
+            self.names.setdefault(str(instance), instance)
+        return instance
+
+    def lookup(self, name: str):
+        """Returns the registered type whose name is 'name' (e.g. 'num', 'num[]'), or None."""
+        return self.names.get(name)
+
+    def __contains__(self, instance):
+        return self.types.get((type(instance), instance.args)) is instance
+
+    def __iter__(self):
+        return iter(self.types.values())
+
+    def __len__(self):
+        return len(self.types)
+
+
+# Registry shared by every type of the compiler
+TYPE_REGISTRY = TypeRegistry()
+
+
+class InternedType(type):
+    """
+    Metaclass that routes the construction of types through the registry, so
+    NumType() or ArrayType(NumType()) return the canonical instance.
+    """
+    def __call__(cls, *args):
+        return TYPE_REGISTRY.intern(cls, cls.canonical_args(*args))
+
+
+class Type(metaclass=InternedType):
     """
     Base class that represents a type in the language CompiScript.
+
+    Types are immutable and interned (see TypeRegistry), compare them with 'is'.
+
+    Attributes:
+        - data_type: The kind of the type.
+        - args: The arguments the type was built with.
     """
-    def __init__(self, data_type: DataType):
+    __slots__ = ('data_type', 'args')
+
+    def __init__(self, data_type: DataType, *args):
         self.data_type = data_type
+        self.args = args
+
+    @staticmethod
+    def canonical_args(*args):
+        """Returns the arguments in the form used as the registry key, overridden by types with optional or list arguments."""
+        return args
+
+    def __reduce__(self):
+        # Unpickling and copying go through the registry, so they keep the type canonical
+        return (type(self), self.args)
 
     def __str__(self):
         return str(self.data_type)
@@ -32,17 +116,79 @@ class Type():
         return self.__str__()
 
 class NumType(Type):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(DataType.NUM)
 
 class BooleanType(Type):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(DataType.BOOLEAN)
 
 class StringType(Type):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(DataType.STRING)
 
 class NilType(Type):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(DataType.NIL)
+
+class ErrorType(Type):
+    """
+    Type of an expression with a semantic error. The analyzer gives it to the offending
+    expression so it can keep going, and no check reports it again.
+    """
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(DataType.ERROR)
+
+class ArrayType(Type):
+    __slots__ = ('element_type',)
+
+    def __init__(self, element_type: Type):
+        super().__init__(DataType.ARRAY, element_type)
+        self.element_type = element_type
+
+    def __str__(self):
+        return f"{self.element_type}[]"
+
+class FunctionType(Type):
+    __slots__ = ('return_type', 'parameter_types')
+
+    @staticmethod
+    def canonical_args(return_type, parameter_types=()):
+        return (return_type, tuple(parameter_types))
+
+    def __init__(self, return_type: Type, parameter_types: tuple):
+        super().__init__(DataType.FUNCTION, return_type, parameter_types)
+        self.return_type = return_type
+        self.parameter_types = parameter_types  # Tuple of the parameter types
+
+    def __str__(self):
+        params = ", ".join(str(param) for param in self.parameter_types)
+        return f"fun({params}) -> {self.return_type}"
+
+class ClassType(Type):
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        super().__init__(DataType.CLASS, name)
+        self.name = name    # Classes are nominal, one type per class name
+
+    def __str__(self):
+        return f"class {self.name}"
+
+
+# Canonical instances of the primitive types
+NUM_TYPE = NumType()
+BOOLEAN_TYPE = BooleanType()
+STRING_TYPE = StringType()
+NIL_TYPE = NilType()
+ERROR_TYPE = ErrorType()
@@ -45,5 +45,3 @@ class Class(Object):
         super().__init__(ObjectType.CLASS)
         self.methods = methods  # Dictionary to store class methods by name
         self.attributes = attributes  # Dictionary to store class attributes by name
-    def __repr__(self):
-        return f'{self.object_type} {self.name}'
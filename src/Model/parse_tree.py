@@ -57,7 +57,11 @@ class TreeVisualizer:
 
     def visit(self, ctx: ParserRuleContext, parent=None):
         """
-        Visits a node in the parse tree and adds it to the graph.
+        Visits a node in the parse tree and adds it and its subtree to the graph.
+
+        The subtree is walked in preorder with an explicit stack instead of recursion,
+        so deeply nested parse trees don't hit the Python recursion limit. Nodes are
+        numbered in the same order as a recursive walk.
 
         Args:
             - ctx: The context node to visit.
@@ -65,25 +69,33 @@ class TreeVisualizer:
 
         Returns:
             - The name of the current node.
-        """        
-        # Determine the label for the current node
-        if ctx.getChildCount() == 0:  # Terminal node
-            label = ctx.getText()
-        else:  # Non-terminal node (rule)
-            label = type(ctx).__name__.replace("Context", "")
-        
-        # Add the current node
-        current_node = self.add_node(label)
-
-        # If there is a parent, create an edge
-        if parent:
-            self.add_edge(parent, current_node)
-        
-        # Visit all children
-        for i in range(ctx.getChildCount()):
-            self.visit(ctx.getChild(i), current_node)
-
-        return current_node
+        """
+        root_node = None
+        # Pending (context node, parent node) pairs
+        pending = [(ctx, parent)]
+        while pending:
+            ctx, parent = pending.pop()
+
+            # Determine the label for the current node
+            if ctx.getChildCount() == 0:  # Terminal node
+                label = ctx.getText()
+            else:  # Non-terminal node (rule)
+                label = type(ctx).__name__.replace("Context", "")
+
+            # Add the current node
+            current_node = self.add_node(label)
+            if root_node is None:
+                root_node = current_node
+
+            # If there is a parent, create an edge
+            if parent:
+                self.add_edge(parent, current_node)
+
+            # Push the children in reverse, so they are visited from left to right
+            for i in range(ctx.getChildCount() - 1, -1, -1):
+                pending.append((ctx.getChild(i), current_node))
+
+        return root_node
 
 
     def render(self, output_file='parse_tree', format='png', output_dir='.', cleanup=True):
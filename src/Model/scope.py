@@ -4,10 +4,13 @@ class Scope:
     """
     Represents a single scope in the program.
     Each scope has its own symbol table and may have a parent scope and children scopes.
+    Symbols also get a slot, their index in declaration order, so a resolved identifier
+    (see Controller.resolver) is found with (scope level, slot) instead of a name lookup.
     """
     def __init__(self, name: str, level: int, parent=None):
         self.name = name
         self.symbol_table = SymbolTable()   # Each scope has its own symbol table
+        self.slots = []                     # Symbols of the scope in declaration order
         self.parent = parent                # Parent scope (if not global)
         self.level = level                  # Current scope level
         self.children = []                  # List of child scopes
@@ -17,12 +20,17 @@ class Scope:
         self.children.append(child_scope)
 
     def add_symbol(self, symbol: Symbol):
-        """Adds a symbol to the symbol table of the current scope."""
-        if self.get_symbol(symbol.name, type(symbol.object_type)) is not None:
+        """
+        Adds a symbol to the symbol table of the current scope and returns its slot.
+        Only this scope is checked, the analyzer looks for the name in the enclosing scopes first.
+        """
+        if self.symbol_table.get_symbol(symbol.name, type(symbol.object_type)) is not None:
             raise Exception(f"Symbol {symbol.name} of type {symbol.object_type} already exists in the current scope")
         
         # Add the symbol to the symbol table
         self.symbol_table.add_symbol(symbol)
+        self.slots.append(symbol)
+        return len(self.slots) - 1
 
     def get_symbol(self, name: str, object_type=None):
         """
@@ -33,8 +41,36 @@ class Scope:
             return self.parent.get_symbol(name, object_type)
         return symbol
 
+    def declared_symbols(self):
+        """Yields the symbols declared in this scope in declaration order, skipping reserved slots."""
+        for symbol in self.slots:
+            if self.symbol_table.get_symbol(symbol.name, type(symbol.object_type)) is symbol:
+                yield symbol
+
+    def to_dict(self):
+        """
+        Returns a plain summary of the scope and its children, with the kind and type of each symbol.
+        """
+        # Symbols in declaration order, a variable and a function may share a name
+        symbols = []
+        for symbol in self.declared_symbols():
+            obj = symbol.object_type
+            symbols.append({
+                'name': symbol.name,
+                'kind': str(obj.object_type),
+                'type': str(getattr(obj, 'data_type', getattr(obj, 'return_type', None))),
+            })
+
+        return {
+            'name': self.name,
+            'level': self.level,
+            'symbols': symbols,
+            'children': [child.to_dict() for child in self.children],
+        }
+
     def __repr__(self):
-        return f"Scope: {self.name}, Level: {self.level}, Symbols: {self.symbol_table.symbols.keys()}"
+        names = dict.fromkeys(symbol.name for symbol in self.declared_symbols())
+        return f"Scope: {self.name}, Level: {self.level}, Symbols: {names.keys()}"
 
 
 
@@ -46,6 +82,7 @@ class ScopeManager:
         self.global_scope = Scope("global", level=0)    # Initialize the global scope
         self.current_scope = self.global_scope          # Start with global scope
         self.scope_level = 0                            # Start at depth 0
+        self.display = [self.global_scope]              # Current scope and its ancestors, indexed by level
 
 
     def enter_scope(self, scope_name: str):
@@ -56,6 +93,7 @@ class ScopeManager:
         new_scope = Scope(scope_name, level=self.scope_level, parent=self.current_scope)
         self.current_scope.add_child(new_scope)
         self.current_scope = new_scope  # Move to the new scope
+        self.display.append(new_scope)
         
 
     def exit_scope(self):
@@ -65,11 +103,20 @@ class ScopeManager:
         if self.current_scope.parent:
             self.current_scope = self.current_scope.parent  # Move back to the parent scope
             self.scope_level -= 1 # Decrease the scope depth
+            self.display.pop()
 
 
     def add_symbol(self, symbol: Symbol):
-        """Adds a symbol to the current scope."""
-        self.current_scope.add_symbol(symbol)
+        """Adds a symbol to the current scope and returns its slot."""
+        return self.current_scope.add_symbol(symbol)
+
+
+    def reserve_slot(self, symbol: Symbol):
+        """
+        Takes the slot of a rejected declaration, pointing at the symbol it collided with,
+        so the slots of the scope stay aligned with the ones numbered by the resolver.
+        """
+        self.current_scope.slots.append(symbol)
 
 
     def get_symbol(self, name: str, object_type=None):
@@ -79,6 +126,17 @@ class ScopeManager:
         return self.current_scope.get_symbol(name, object_type)
 
 
+    def resolve(self, binding: tuple):
+        """
+        Returns the symbol of a resolved identifier.
+
+        Args:
+            - binding: Tuple (level, slot) computed by the resolver.
+        """
+        level, slot = binding
+        return self.display[level].slots[slot]
+
+
     def update_symbol(self, name: str, symbol: Symbol, object_type=None):
         """
         Updates a symbol in the current scope or any parent scope.
@@ -89,12 +147,12 @@ class ScopeManager:
         scope = self.current_scope
         while scope:
             # If the symbol is found, update it and return
-            if name in scope.symbol_table.symbols:
-                existing_symbol = scope.symbol_table.symbols[name]
-                # Check if the object type matches (if specified)
-                if object_type is None or isinstance(existing_symbol.object_type, object_type):
-                    scope.symbol_table.symbols[name] = symbol
-                    return
+            existing_symbol = scope.symbol_table.get_symbol(name, object_type)
+            if existing_symbol is not None:
+                scope.symbol_table.replace_symbol(existing_symbol, symbol)
+                if symbol is not existing_symbol:
+                    scope.slots[scope.slots.index(existing_symbol)] = symbol
+                return
                 
             # Move to the parent scope
             scope = scope.parent
@@ -104,4 +162,132 @@ class ScopeManager:
 
     
     def __repr__(self):
-        return f"Current Scope: {self.current_scope.name} - Level: {self.scope_level}"
\ No newline at end of file
+        return f"Current Scope: {self.current_scope.name} - Level: {self.scope_level}"
+
+
+class BindingScopeManager:
+    """
+    Scope manager with constant-time lookups, a drop-in alternative to ScopeManager.
+
+    Every name maps to the stack of its visible symbols (innermost last), one map per
+    kind of object like SymbolTable, and an undo log records the symbols declared in
+    each open scope so exit_scope pops them again. get_symbol and update_symbol look at
+    the top of the stack instead of walking up the parent scopes, so their cost does
+    not grow with the nesting depth.
+
+    Scopes are still created with their own symbol table, but they are only linked
+    into the scope tree when global_scope is requested, for tooling that needs it.
+    """
+    def __init__(self):
+        self.root_scope = Scope("global", level=0)      # Initialize the global scope
+        self.current_scope = self.root_scope            # Start with global scope
+        self.scope_level = 0                            # Start at depth 0
+        self.display = [self.root_scope]                # Current scope and its ancestors, indexed by level
+        self.bindings = {kind: {} for kind in SymbolTable.KINDS}  # Stack of visible (scope, symbol) by kind and name
+        self.undo_log = [[]]                            # Stacks pushed by each open scope
+        self.scopes = [self.root_scope]                 # Every scope in creation order
+        self.linked_scopes = 1                          # Number of scopes already linked into the tree
+
+
+    @property
+    def global_scope(self):
+        """
+        Returns the global scope, linking the scopes created so far into the scope tree.
+        """
+        for scope in self.scopes[self.linked_scopes:]:
+            scope.parent.add_child(scope)
+        self.linked_scopes = len(self.scopes)
+        return self.root_scope
+
+
+    def enter_scope(self, scope_name: str):
+        """
+        Enters a new child scope under the current scope.
+        """
+        self.scope_level += 1 # Increase the scope depth
+        new_scope = Scope(scope_name, level=self.scope_level, parent=self.current_scope)
+        self.scopes.append(new_scope)
+        self.current_scope = new_scope  # Move to the new scope
+        self.display.append(new_scope)
+        self.undo_log.append([])
+
+
+    def exit_scope(self):
+        """
+        Exits the current scope, its symbols stop being visible.
+        """
+        if self.current_scope.parent:
+            for stack in self.undo_log.pop():
+                stack.pop()
+            self.display.pop()
+            self.current_scope = self.current_scope.parent  # Move back to the parent scope
+            self.scope_level -= 1 # Decrease the scope depth
+
+
+    def add_symbol(self, symbol: Symbol):
+        """Adds a symbol to the current scope and returns its slot."""
+        slot = self.current_scope.add_symbol(symbol)
+        stack = self.bindings[type(symbol.object_type)].setdefault(symbol.name, [])
+        stack.append((self.current_scope, symbol))
+        self.undo_log[-1].append(stack)
+        return slot
+
+
+    def reserve_slot(self, symbol: Symbol):
+        """
+        Takes the slot of a rejected declaration, pointing at the symbol it collided with,
+        so the slots of the scope stay aligned with the ones numbered by the resolver.
+        """
+        self.current_scope.slots.append(symbol)
+
+
+    def _find(self, name: str, object_type=None):
+        """Returns the stack whose top is the innermost visible symbol with that name and object type, or None."""
+        if object_type is not None:
+            return self.bindings[object_type].get(name) or None
+
+        # Without a kind, the innermost symbol of any kind (in SymbolTable.KINDS order within a scope)
+        found = None
+        for bindings in self.bindings.values():
+            stack = bindings.get(name)
+            if stack and (found is None or stack[-1][0].level > found[-1][0].level):
+                found = stack
+        return found
+
+
+    def get_symbol(self, name: str, object_type=None):
+        """
+        Returns the innermost visible symbol with that name (and object type, if given), or None.
+        """
+        stack = self._find(name, object_type)
+        return None if stack is None else stack[-1][1]
+
+
+    def resolve(self, binding: tuple):
+        """
+        Returns the symbol of a resolved identifier.
+
+        Args:
+            - binding: Tuple (level, slot) computed by the resolver.
+        """
+        level, slot = binding
+        return self.display[level].slots[slot]
+
+
+    def update_symbol(self, name: str, symbol: Symbol, object_type=None):
+        """
+        Replaces the innermost visible symbol with that name (and object type, if given).
+        """
+        stack = self._find(name, object_type)
+        if stack is None:
+            raise Exception(f"Symbol '{name}' not found in any accessible scope for update.")
+
+        scope, existing_symbol = stack[-1]
+        stack[-1] = (scope, symbol)
+        scope.symbol_table.replace_symbol(existing_symbol, symbol)
+        if symbol is not existing_symbol:
+            scope.slots[scope.slots.index(existing_symbol)] = symbol
+
+
+    def __repr__(self):
+        return f"Current Scope: {self.current_scope.name} - Level: {self.scope_level}"
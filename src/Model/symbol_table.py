@@ -30,30 +30,50 @@ class SymbolTable:
     """
     Represents a symbol table for a specific scope.
     It allows adding and retrieving symbols but does not handle scope hierarchy (delegated to scope manager).
+
+    Variables, functions and classes live in separate namespaces, so a variable and a function
+    may share a name, and a lookup of one kind is a single dictionary hit.
     """
+    # Kinds of object with their own namespace, in lookup order when no kind is given
+    KINDS = (Variable, Function, Class)
+
     def __init__(self):
-        self.symbols = {}  # Dictionary to store symbols by name
+        self.namespaces = {kind: {} for kind in self.KINDS}  # Dictionary of symbols by name for each kind of object
 
     def add_symbol(self, symbol: Symbol):
         """
         Adds a new symbol to the table if it does not already exist in the current scope.
         """
-        if symbol.name in self.symbols:
-            existing_symbol = self.symbols[symbol.name]
-            # Check if the symbol already exists in the current scope (same name and type)
-            if isinstance(existing_symbol.object_type, symbol.object_type):
-                raise Exception(f'Symbol {symbol.name} of type {symbol.object_type} already exists in the current scope')
+        namespace = self.namespaces[type(symbol.object_type)]
+        # Check if the symbol already exists in the current scope (same name and kind)
+        if symbol.name in namespace:
+            raise Exception(f'Symbol {symbol.name} of type {symbol.object_type} already exists in the current scope')
 
         # Add the symbol to the table
-        self.symbols[symbol.name] = symbol
+        namespace[symbol.name] = symbol
 
 
     def get_symbol(self, name: str, object_type=None):
         """
         Retrieves a symbol by name. Optionally, the object type can be provided to ensure we get a symbol of a specific type.
         """
-        if name in self.symbols:
-            symbol = self.symbols[name]
-            if object_type is None or isinstance(symbol.object_type, object_type):
-                return symbol
+        if object_type is not None:
+            return self.namespaces[object_type].get(name)
+
+        for namespace in self.namespaces.values():
+            if name in namespace:
+                return namespace[name]
         return None
+
+
+    def replace_symbol(self, existing_symbol: Symbol, symbol: Symbol):
+        """
+        Replaces a symbol of the table with a new one.
+        """
+        self.namespaces[type(existing_symbol.object_type)][existing_symbol.name] = symbol
+
+
+    def __iter__(self):
+        """Iterates over the symbols of every namespace."""
+        for namespace in self.namespaces.values():
+            yield from namespace.values()
@@ -0,0 +1,231 @@
+import sys
+import json
+import time
+import logging
+import argparse
+from antlr4.error.Errors import ParseCancellationException
+from Controller.compiler import PARSE_MODES, PARSERS, LEXERS, TOKEN_STORES, INPUT_MODES, compile_file
+from Controller.trace import Tracer
+from Controller.metrics import combine_metrics, format_metrics
+from Controller.grammar_profile import GrammarProfile
+from Controller.batch import collect_sources, run_batch, format_summary
+from Controller.result_cache import DEFAULT_MAX_BYTES, ResultCache
+from Controller.server import DEFAULT_SOCKET_PATH, CompileServer, compile_remote, send_requests
+
+
+def build(args):
+    """Compiles every source file found in the given paths and prints a summary."""
+    sources = collect_sources(args.paths)
+    if not sources:
+        print("No .cspt files found.")
+        return 1
+
+    if args.profile_grammar or args.profile_json is not None:
+        return profile_grammar(sources, args)
+
+    cache = ResultCache(args.cache, max_bytes=args.cache_size * 1024 * 1024) if args.cache else None
+
+    timings = args.timings or args.timings_json is not None
+
+    start = time.perf_counter()
+    if args.server:
+        results = compile_remote(sources, socket_path=args.server, parse_mode=args.parse_mode,
+                                 all_errors=args.all_errors, timings=timings, parser=args.parser,
+                                 lexer=args.lexer, token_store=args.token_store, input_mode=args.input_mode,
+                                 lex_jobs=args.lex_jobs)
+    else:
+        results = run_batch(sources, workers=args.jobs, parse_mode=args.parse_mode, snapshot_path=args.dfa_snapshot,
+                            cache=cache, all_errors=args.all_errors, timings=timings, parser=args.parser,
+                            lexer=args.lexer, token_store=args.token_store, input_mode=args.input_mode,
+                            lex_jobs=args.lex_jobs)
+    wall_time = time.perf_counter() - start
+
+    print(format_summary(results, wall_time, quiet=args.quiet))
+
+    if timings:
+        # Files served from the cache were not compiled, they have no metrics
+        reports = {result.path: result.metrics for result in results if result.metrics is not None}
+        total = combine_metrics(reports.values())
+        if args.timings:
+            print(f"\nPhases of {len(reports)} compiled files:")
+            print(format_metrics(total))
+        if args.timings_json is not None:
+            with open(args.timings_json, 'w') as file:
+                json.dump({'files': reports, 'total': total}, file, indent=2)
+    return 0 if all(result.ok for result in results) else 1
+
+
+def profile_grammar(sources, args):
+    """Parses every source file in this process with a profiling parser and prints the grammar profile."""
+    profile = GrammarProfile()
+    failed = 0
+    for path in sources:
+        errors = profile.profile_file(path, args.parse_mode)
+        if errors:
+            failed += 1
+            print(f"{path}: {len(errors)} syntax error(s), the profile includes the recovery")
+
+    if args.profile_grammar:
+        print(profile.format(limit=args.profile_limit))
+    if args.profile_json is not None:
+        with open(args.profile_json, 'w') as file:
+            file.write(profile.to_json())
+    return 0 if failed == 0 else 1
+
+
+def cache_command(args):
+    """Inspects the result cache and evicts entries from it."""
+    cache = ResultCache(args.directory, max_bytes=args.cache_size * 1024 * 1024)
+
+    if args.clear:
+        print(f"Removed {cache.clear()} entries")
+    elif args.evict:
+        removed = sum(cache.evict_source(path) for path in args.evict)
+        print(f"Removed {removed} entries")
+    elif args.prune:
+        print(f"Removed {cache.prune()} entries")
+
+    entries, size = cache.size()
+    print(f"{entries} entries, {size / 1024:.1f} KB in {args.directory}")
+    return 0
+
+
+def trace(args):
+    """Compiles one file and prints the trace of its semantic analysis."""
+    logger = logging.getLogger("compiscript.trace")
+    tracer = Tracer()
+    status = 0
+    try:
+        compile_file(args.file, logger, parse_mode=args.parse_mode, tracer=tracer, parser=args.parser,
+                     lexer=args.lexer, token_store=args.token_store, input_mode=args.input_mode,
+                     lex_jobs=args.lex_jobs)
+    except ParseCancellationException as e:
+        print(f"Syntax error: {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        status = 1
+
+    if args.json:
+        print(tracer.to_json())
+    else:
+        tracer.dump(sys.stdout)
+    return status
+
+
+def serve(args):
+    """Runs the compile server until it receives a shutdown request."""
+    with CompileServer(args.socket, snapshot_path=args.dfa_snapshot) as server:
+        print(f"Listening on {args.socket} ({server.loaded_states} DFA states loaded)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def shutdown(args):
+    """Asks a running compile server to save its DFA snapshot and stop."""
+    response = send_requests([{'command': 'shutdown'}], socket_path=args.socket)[0]
+    print(f"Server stopped ({response.get('saved_states', 0)} DFA states saved)")
+    return 0
+
+
+def create_parser():
+    parser = argparse.ArgumentParser(prog="compiscript", description="Headless CompiScript compiler.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # build: compile many files in parallel
+    build_parser = subparsers.add_parser("build", help="Compile .cspt files and directories in parallel.")
+    build_parser.add_argument("paths", nargs="+", help="Source files or directories to compile.")
+    build_parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker processes (default: all cores).")
+    build_parser.add_argument("-q", "--quiet", action="store_true", help="Only list the files that failed.")
+    build_parser.add_argument("--all-errors", action="store_true",
+                              help="Report every syntax and semantic error of each file instead of stopping at the first one.")
+    build_parser.add_argument("--parse-mode", choices=PARSE_MODES, default="two-stage",
+                              help="Parser prediction mode: SLL with LL fallback (default), or force SLL or LL.")
+    build_parser.add_argument("--parser", choices=PARSERS, default="antlr",
+                              help="Parser: the generated ANTLR one (default), ANTLR with hand-written expressions, or the "
+                                   "hand-written one. The last two fall back to ANTLR to report syntax errors.")
+    build_parser.add_argument("--lexer", choices=LEXERS, default="antlr",
+                              help="Lexer: the generated ANTLR one (default), or one that matches the tokens with a "
+                                   "regular expression and falls back to ANTLR to report lexer errors.")
+    build_parser.add_argument("--token-store", choices=TOKEN_STORES, default="list",
+                              help="Token storage while parsing: a token object per token (default), or arrays of "
+                                   "token fields, which take less memory.")
+    build_parser.add_argument("--input", dest="input_mode", choices=INPUT_MODES, default="read",
+                              help="How the sources are read: decoded into memory (default), or memory-mapped, "
+                                   "which takes less memory on large files. Ignored with --cache.")
+    build_parser.add_argument("--lex-jobs", type=int, default=1,
+                              help="Processes that lex each file, split at line breaks outside strings and comments. "
+                                   "Only files of several MB are split. Ignored with --cache.")
+    build_parser.add_argument("--dfa-snapshot", default=None, help="DFA snapshot loaded by every worker before compiling.")
+    build_parser.add_argument("--server", nargs="?", const=DEFAULT_SOCKET_PATH, default=None,
+                              help="Compile through a running compile server instead of a process pool.")
+    build_parser.add_argument("--cache", default=None, help="Directory of the result cache, unchanged files are not recompiled.")
+    build_parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                              help="Size cap of the result cache in MB.")
+    build_parser.add_argument("--timings", action="store_true",
+                              help="Print the time, CPU time and peak memory of each phase, added up over the files.")
+    build_parser.add_argument("--timings-json", default=None, metavar="FILE",
+                              help="Write the metrics of every file and their total to a JSON file.")
+    build_parser.add_argument("--profile-grammar", action="store_true",
+                              help="Only parse the files, in this process, and print the lookahead, LL fallbacks "
+                                   "and ambiguities of each parser decision and grammar rule.")
+    build_parser.add_argument("--profile-limit", type=int, default=None,
+                              help="Number of decisions listed by --profile-grammar, the most expensive first.")
+    build_parser.add_argument("--profile-json", default=None, metavar="FILE",
+                              help="Write the grammar profile to a JSON file, implies parsing like --profile-grammar.")
+    build_parser.set_defaults(func=build)
+
+    # cache: manage the result cache
+    cache_parser = subparsers.add_parser("cache", help="Inspect or evict entries of the result cache.")
+    cache_parser.add_argument("directory", help="Directory of the result cache.")
+    cache_parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                              help="Size cap in MB enforced by --prune.")
+    cache_actions = cache_parser.add_mutually_exclusive_group()
+    cache_actions.add_argument("--clear", action="store_true", help="Remove every entry.")
+    cache_actions.add_argument("--prune", action="store_true", help="Remove the least recently used entries above the size cap.")
+    cache_actions.add_argument("--evict", nargs="+", metavar="FILE", help="Remove the entries of these source files.")
+    cache_parser.set_defaults(func=cache_command)
+
+    # trace: show what the semantic analyzer does on one file
+    trace_parser = subparsers.add_parser("trace", help="Print the trace of the semantic analysis of a file.")
+    trace_parser.add_argument("file", help="Source file to analyze.")
+    trace_parser.add_argument("--json", action="store_true", help="Print the events as JSON.")
+    trace_parser.add_argument("--parse-mode", choices=PARSE_MODES, default="two-stage",
+                              help="Parser prediction mode: SLL with LL fallback (default), or force SLL or LL.")
+    trace_parser.add_argument("--parser", choices=PARSERS, default="antlr",
+                              help="Parser: the generated ANTLR one (default), ANTLR with hand-written expressions, "
+                                   "or the hand-written one.")
+    trace_parser.add_argument("--lexer", choices=LEXERS, default="antlr",
+                              help="Lexer: the generated ANTLR one (default), or the regular expression one.")
+    trace_parser.add_argument("--token-store", choices=TOKEN_STORES, default="list",
+                              help="Token storage while parsing: a token object per token (default), or arrays.")
+    trace_parser.add_argument("--input", dest="input_mode", choices=INPUT_MODES, default="read",
+                              help="How the source is read: decoded into memory (default), or memory-mapped.")
+    trace_parser.add_argument("--lex-jobs", type=int, default=1,
+                              help="Processes that lex the source, only files of several MB are split.")
+    trace_parser.set_defaults(func=trace)
+
+    # serve: long-lived compile server that keeps the DFA cache warm
+    serve_parser = subparsers.add_parser("serve", help="Run a compile server on a Unix socket.")
+    serve_parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Path of the server socket.")
+    serve_parser.add_argument("--dfa-snapshot", default=None, help="DFA snapshot loaded at startup and saved on shutdown.")
+    serve_parser.set_defaults(func=serve)
+
+    # shutdown: stop a running compile server
+    shutdown_parser = subparsers.add_parser("shutdown", help="Stop a running compile server.")
+    shutdown_parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Path of the server socket.")
+    shutdown_parser.set_defaults(func=shutdown)
+
+    return parser
+
+
+def main(argv=None):
+    args = create_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
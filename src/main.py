@@ -1,29 +1,12 @@
-import os
 import logging
 import tkinter as tk
-from antlr4 import FileStream, CommonTokenStream
 from antlr4.error.Errors import ParseCancellationException
-from antlr4.error.ErrorStrategy import DefaultErrorStrategy
-from Model.parse_tree import TreeVisualizer
-from Language.compiscriptLexer import compiscriptLexer
-from Language.compiscriptParser import compiscriptParser
-from Controller.driver import SemanticAnalyzer
-from Controller.custom_exception import ThrowingErrorListener
+from Controller.compiler import compile_file
+from Controller.trace import Tracer
+from Controller.metrics import CompileMetrics, format_metrics
 from GUI.GUI import CompilerGUI  # Importamos la GUI desde el módulo GUI
 import sys
 
-# Define the custom logging level SUCCESS (between INFO and WARNING)
-SUCCESS_LEVEL_NUM = 25
-logging.addLevelName(SUCCESS_LEVEL_NUM, "SUCCESS")
-
-# Define the method for logging success messages
-def success(self, message, *args, **kwargs):
-    if self.isEnabledFor(SUCCESS_LEVEL_NUM):
-        self._log(SUCCESS_LEVEL_NUM, message, args, **kwargs)
-
-# Add the 'success' method to the Logger class
-logging.Logger.success = success
-
 # Custom logger to redirect to the GUI terminal
 def setup_logger(level, terminal_output):
     logger = logging.getLogger()  # Get the root logger
@@ -74,42 +57,19 @@ class StreamRedirector:
 
 
 # Función que realiza el proceso de compilación
-def run_compiler(file_path, is_debug=False, terminal_output=None):
+def run_compiler(file_path, is_debug=False, terminal_output=None, timings=False, all_errors=False):
     level = logging.DEBUG if is_debug else logging.INFO
     logger = setup_logger(level, terminal_output)
+    # Only trace the semantic analysis in debug mode
+    tracer = Tracer() if is_debug else None
+    # Only measure the phases when asked to, tracemalloc slows the whole compilation down
+    metrics = CompileMetrics() if timings else None
 
     try:
         logger.info(f"Starting {'debug' if is_debug else 'compilation'} for {file_path}...")
-        input_stream = FileStream(file_path)
-        lexer = compiscriptLexer(input_stream)
-        lexer.removeErrorListeners()  # Remove the default error listener
-        lexer.addErrorListener(ThrowingErrorListener.INSTANCE)  # Add custom error listener
-
-        stream = CommonTokenStream(lexer)
-        parser = compiscriptParser(stream)
-
-        # Set BailErrorStrategy to stop parsing on first error
-        parser._errHandler = DefaultErrorStrategy()
-        parser.removeErrorListeners()
-        parser.addErrorListener(ThrowingErrorListener.INSTANCE)
-
-        # Try to parse the input file
-        tree = parser.program()  # Start rule is 'program'
-        logger.success("Parsing completed: No syntax errors found.")
-
-        # Create a parse tree visualizer and visit the parse tree
-        visualizer = TreeVisualizer(logger=logger)
-        visualizer.visit(tree)
-
-        file_name = os.path.splitext(os.path.basename(file_path))[0]
-        output_file_name = f"parse_tree_{file_name}"
-
-        visualizer.render(output_file=output_file_name, format='png', output_dir='src/Output')
-
-        # Create a semantic analyzer and visit the parse tree
-        analyzer = SemanticAnalyzer(logger=logger)
-        analyzer.visit(tree)
-        logger.success("Compilation completed: No errors found.")
+        # Stop at the first error unless every syntax and semantic error of the file was asked for
+        compile_file(file_path, logger, render_tree=True, tracer=tracer, collect_errors=all_errors,
+                     recover_syntax=all_errors, metrics=metrics)
         
         return "Compilation successful", None
 
@@ -119,6 +79,16 @@ def run_compiler(file_path, is_debug=False, terminal_output=None):
     except Exception as e:
         logger.error(f"{str(e)}")
         return None, f"Error: {str(e)}"
+    finally:
+        if tracer is not None:
+            # Format the trace once the analysis is over, even if it stopped on an error
+            for line in tracer.lines():
+                logger.debug(line)
+        if metrics is not None:
+            # Show where the time went, even if a phase failed
+            metrics.close()
+            for line in format_metrics(metrics.to_dict()).splitlines():
+                logger.info(line)
 
 # Función principal que inicializa la GUI y se encarga de la compilación
 def main():
@@ -0,0 +1,67 @@
+import logging
+import pytest
+from Model.object_types import Variable
+from Model.data_types import ERROR_TYPE, NUM_TYPE
+from Controller.Driver import SemanticAnalyzer
+from Controller.compiler import compile_file
+from Controller.custom_exception import SemanticError, SemanticErrors
+
+# Independent semantic errors, one or two per statement
+PROGRAM = """var a = 1;
+var a = 2;
+print b;
+fun f(x) {
+  print y;
+  return x;
+}
+var s = "x" - 1;
+var t = c * 2 - 3;
+a = d + 1;
+var u = t + 1;
+"""
+
+# Code, span and scope of every error of PROGRAM, in the order they are found
+EXPECTED = [
+    ('duplicate-variable', (2, 0, 2, 10), 'global'),
+    ('undeclared-variable', (3, 6, 3, 7), 'global'),
+    ('undeclared-variable', (5, 8, 5, 9), 'Function f Body'),
+    ('arithmetic-operands', (8, 8, 8, 15), 'global'),
+    ('undeclared-variable', (9, 8, 9, 9), 'global'),
+    ('undeclared-variable', (10, 4, 10, 5), 'global'),
+]
+
+logger = logging.getLogger("compiscript.tests")
+
+
+@pytest.fixture
+def program(tmp_path):
+    path = tmp_path / "program.cspt"
+    path.write_text(PROGRAM)
+    return str(path)
+
+
+def test_every_error_is_collected_in_one_pass(program):
+    with pytest.raises(SemanticErrors) as raised:
+        compile_file(program, logger, collect_errors=True)
+    diagnostics = raised.value.diagnostics
+    assert [(diagnostic.code, diagnostic.span, diagnostic.scope) for diagnostic in diagnostics] == EXPECTED
+    assert str(raised.value).splitlines() == [str(diagnostic) for diagnostic in diagnostics]
+
+
+def test_first_error_mode_stops_at_the_first_collected_error(program):
+    with pytest.raises(SemanticError) as raised:
+        compile_file(program, logger)
+    assert (raised.value.code, raised.value.span) == EXPECTED[0][:2]
+
+
+def test_erroneous_expressions_get_the_error_type_without_follow_on_errors(program):
+    # 't' is initialized with 'c * 2 - 3', whose 'c' is undeclared: the product and the
+    # difference are not reported, and neither is the use of 't' in 'u'
+    analyzer = SemanticAnalyzer(logger=logger, collect_errors=True)
+    with pytest.raises(SemanticErrors):
+        compile_file(program, logger, analyzer=analyzer)
+    global_scope = analyzer.scope_manager.global_scope
+    assert global_scope.get_symbol('t', Variable).object_type.data_type is ERROR_TYPE
+    assert global_scope.get_symbol('u', Variable).object_type.data_type is ERROR_TYPE
+    assert global_scope.get_symbol('s', Variable).object_type.data_type is ERROR_TYPE
+    assert global_scope.get_symbol('a', Variable).object_type.data_type is NUM_TYPE
@@ -0,0 +1,17 @@
+from Model.data_types import TYPE_REGISTRY, NumType, StringType, ArrayType, FunctionType, ClassType
+
+
+def test_lookup_finds_the_canonical_instance_by_name():
+    array = ArrayType(ArrayType(NumType()))
+    function = FunctionType(StringType(), [NumType()])
+    point = ClassType("Point")
+    assert TYPE_REGISTRY.lookup("num") is NumType()
+    assert TYPE_REGISTRY.lookup("num[][]") is array
+    assert TYPE_REGISTRY.lookup(str(function)) is function
+    assert TYPE_REGISTRY.lookup("class Point") is point
+    assert TYPE_REGISTRY.lookup("unknown[]") is None
+
+
+def test_lookup_agrees_with_a_scan_of_the_registry():
+    for instance in TYPE_REGISTRY:
+        assert str(TYPE_REGISTRY.lookup(str(instance))) == str(instance)
@@ -0,0 +1,26 @@
+import sys
+import pytest
+from Controller.resolver import Resolver
+from Benchmark.deep_nesting import SHAPES, analyzer_run
+from Controller.Driver import SemanticAnalyzer
+
+# Deeper than the recursion limit, one Python frame per level would fail
+DEPTH = 5 * sys.getrecursionlimit()
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_resolver_and_analyzer_handle_deep_nesting(shape):
+    program = SHAPES[shape](DEPTH)
+    Resolver().resolve(program)
+    analyzer_run(SemanticAnalyzer, program)()
+
+
+def test_nested_blocks_are_bound_to_the_enclosing_scope():
+    program = Resolver().resolve(SHAPES['blocks'](DEPTH))
+    block = program.declarations[1]
+    for level in range(1, DEPTH + 1):
+        declaration = block.declarations[0]
+        # 'var vN = vN-1' reads the only variable of the enclosing scope
+        assert declaration.initializer.binding == (level - 1, 0)
+        if level < DEPTH:
+            block = block.declarations[1]
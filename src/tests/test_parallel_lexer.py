@@ -0,0 +1,69 @@
+import random
+import logging
+import pytest
+from antlr4 import FileStream
+from Language.compiscriptLexer import compiscriptLexer
+from Controller import parallel_lexer
+from Controller.parallel_lexer import SKELETON_PATTERN, split_points
+from Controller.compiler import compile_file
+from Benchmark.parallel_lexing import LEXERS, STREAMS, lex, check_sources
+
+
+def source_files(tmp_path, sources):
+    for index, (name, source) in enumerate(sources):
+        path = tmp_path / f"source{index}.cspt"
+        path.write_text(source, encoding='ascii', newline='')
+        yield name, str(path)
+
+
+def test_chunks_match_serial_lexing(tmp_path):
+    rng = random.Random(0)
+    sources = check_sources(4, rng)
+    sources += [("backslash", 'var a = "x\\";\nprint "y";\n' * 50), ("comments", '// "\nprint "//";\n' * 50)]
+    for name, path in source_files(tmp_path, sources):
+        expected = lex(compiscriptLexer, FileStream, path)
+        for lexer_class in LEXERS.values():
+            for stream_class in STREAMS.values():
+                assert lex(lexer_class, stream_class, path, 3, rng.randint(2, 12)) == expected, name
+
+
+def test_split_points_start_lines_outside_strings_and_comments():
+    source = '"a\nb" // c "\n' * 40 + 'var x = "\n\n";\n' * 40
+    inside = set()
+    for match in SKELETON_PATTERN.finditer(source):
+        inside.update(range(match.start() + 1, match.end()))
+    points = split_points(source, 16)
+    assert points == sorted(set(points)) and points
+    for point in points:
+        assert source[point - 1] == "\n" and point - 1 not in inside
+
+
+def test_falls_back_to_serial_lexing_when_a_chunk_is_wrong(tmp_path, monkeypatch):
+    # The backslash ends the first string early, so the quotes that follow pair up differently
+    source = 'print "a\\";\n' + 'print "b\n";\n' * 20
+    path = tmp_path / "source.cspt"
+    path.write_text(source)
+    serial_calls = []
+    from_lexer = parallel_lexer.TokenBuffer.from_lexer
+    monkeypatch.setattr(parallel_lexer.TokenBuffer, 'from_lexer',
+                        classmethod(lambda cls, lexer: serial_calls.append(lexer) or from_lexer(lexer)))
+    chunked = lex(compiscriptLexer, FileStream, str(path), 3, 8)
+    assert len(serial_calls) == 1
+    assert chunked == lex(compiscriptLexer, FileStream, str(path))
+
+
+@pytest.mark.parametrize("recover_syntax", (False, True))
+def test_compile_file_outcomes_match_serial_lexing(tmp_path, monkeypatch, recover_syntax):
+    monkeypatch.setattr(parallel_lexer, 'MIN_CHUNK_SIZE', 64)
+    logger = logging.getLogger("compiscript.tests")
+    sources = [("valid", "var a = 1;\nprint a;\n" * 20), ("semantic", "var a = 1;\n" * 20),
+               ("lexer", "var a = 1;\nvar b = @;\n" * 20), ("syntax", "print 1;\nprint ;\n" * 20)]
+    for name, path in source_files(tmp_path, sources):
+        outcomes = []
+        for lex_jobs in (1, 3):
+            try:
+                compile_file(path, logger, lex_jobs=lex_jobs, recover_syntax=recover_syntax)
+                outcomes.append(None)
+            except Exception as e:
+                outcomes.append((type(e).__name__, str(e)))
+        assert outcomes[0] == outcomes[1], name
@@ -0,0 +1,106 @@
+import random
+import inspect
+import logging
+import pytest
+from antlr4.error.Errors import ParseCancellationException
+from Language.compiscriptParser import compiscriptParser
+from Controller.hybrid_parser import HybridParser
+from Controller.metrics import CompileMetrics
+from Controller.compiler import PARSE_MODES, PARSERS, LEXERS, TOKEN_STORES, INPUT_MODES, compile_file
+from Benchmark.parser_comparison import EDGE_CASES, parse_outline, mutants, fast_outline, hybrid_outline
+from Benchmark.program_generator import ProgramGenerator
+
+OUTLINES = {'fast': fast_outline, 'hybrid': hybrid_outline}
+
+# Programs that exercise every statement, precedence level and error path of compile_file
+PROGRAMS = (
+    "var a = 1 + 2 * 3 - -4 / 5 % 6;\nprint a;\n",
+    "var s = \"a\" + \"b\";\nif (s == \"ab\" and !false or nil == nil) { print s; } else { print 1; }\n",
+    "fun f(a, b) { return a < b; }\nvar i = 0;\nwhile (i <= 3) { i = i + 1; }\nfor (var j = 0; j >= 0; j = j - 1) print j;\n",
+    "var a = [1, 2, 3];\nprint a[0];\nvar o = new Point(1);\no.x = o.y.z(1)[2];\n",
+    "var a = 1;\nvar a = 2;\n",
+    "print b;\n",
+    "var a = ;\nprint 1\n",
+    "fun () {}.x = 1;\nvar f = fun (a) { return a; };\n",
+    "a + b = 1;\n",
+)
+
+
+@pytest.mark.parametrize("parser", OUTLINES)
+@pytest.mark.parametrize("source", EDGE_CASES + PROGRAMS)
+def test_edge_cases_match_antlr(parser, source):
+    assert OUTLINES[parser](source) == parse_outline(source)
+
+
+@pytest.mark.parametrize("parser", OUTLINES)
+def test_generated_programs_and_mutants_match_antlr(parser):
+    rng = random.Random(0)
+    for seed in range(10):
+        source = ProgramGenerator(seed=seed).generate(60)
+        for program in [source, *mutants(source, 10, rng)]:
+            assert OUTLINES[parser](program) == parse_outline(program), program
+
+
+def test_hybrid_expression_enters_the_state_of_the_generated_rule():
+    source = inspect.getsource(compiscriptParser.expression)
+    assert f"self.enterRule(localctx, {HybridParser.EXPRESSION_STATE}, self.RULE_expression)" in source
+
+
+def outcome(path, **options):
+    """Compiles a file, returning None or the type and message of the error it stopped at."""
+    logger = logging.getLogger("compiscript.tests")
+    try:
+        compile_file(str(path), logger, **options)
+    except Exception as e:
+        return type(e).__name__, str(e)
+    return None
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize("recover_syntax", (False, True))
+def test_compile_file_outcomes_match_antlr(tmp_path, parser, recover_syntax):
+    for index, source in enumerate(PROGRAMS):
+        path = tmp_path / f"program{index}.cspt"
+        path.write_text(source)
+        assert outcome(path, parser=parser, recover_syntax=recover_syntax) \
+            == outcome(path, parser='antlr', recover_syntax=recover_syntax), source
+
+
+
+@pytest.mark.parametrize("parser, phases", [('antlr', ['parse']), ('hybrid', ['parse-hybrid', 'parse']),
+                                            ('fast', ['parse-fast', 'parse'])])
+def test_failed_parse_attempts_are_timed_as_their_own_phase(tmp_path, parser, phases):
+    path = tmp_path / "program.cspt"
+    logger = logging.getLogger("compiscript.tests")
+    path.write_text("var a = 1 + 2;\n")
+    metrics = CompileMetrics(trace_memory=False)
+    compile_file(str(path), logger, parser=parser, metrics=metrics)
+    assert [phase.name for phase in metrics.phases if phase.name.startswith('parse')] == ['parse']
+
+    path.write_text("var a = 1 +;\n")
+    metrics = CompileMetrics(trace_memory=False)
+    with pytest.raises(ParseCancellationException):
+        compile_file(str(path), logger, parser=parser, metrics=metrics)
+    assert [phase.name for phase in metrics.phases if phase.name.startswith('parse')] == phases
+
+
+# A parser error before a lexer error, and the other way around
+FIRST_ERRORS = (
+    ("var a = 1 +;\nvar b = 3 $ 4;\n", "Line 1:11 - mismatched input ';'"),
+    ("var b = 3 $ 4;\nvar a = 1 +;\n", "Line 1:10 - token recognition error at: '$'"),
+)
+
+
+@pytest.mark.parametrize("source, error", FIRST_ERRORS)
+@pytest.mark.parametrize("parse_mode", PARSE_MODES)
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize("lexer", LEXERS)
+@pytest.mark.parametrize("token_store", TOKEN_STORES)
+@pytest.mark.parametrize("input_mode, lex_jobs", [(mode, 1) for mode in INPUT_MODES] + [('mmap', 2)])
+def test_first_error_in_the_source_is_reported(tmp_path, source, error, parse_mode, parser, lexer, token_store,
+                                               input_mode, lex_jobs):
+    path = tmp_path / "program.cspt"
+    path.write_text(source)
+    name, message = outcome(path, parse_mode=parse_mode, parser=parser, lexer=lexer, token_store=token_store,
+                            input_mode=input_mode, lex_jobs=lex_jobs)
+    assert name == "ParseCancellationException" and message.startswith(error)
@@ -0,0 +1,43 @@
+import random
+import pytest
+from antlr4 import FileStream
+from Language.compiscriptLexer import compiscriptLexer
+from Controller.regex_lexer import RegexLexer
+from Controller.mapped_stream import MappedInputStream
+from Benchmark.lexer_comparison import lex, mutants
+from Benchmark.parser_comparison import EDGE_CASES
+from Benchmark.parallel_lexing import lex as lex_file
+from Benchmark.program_generator import ProgramGenerator
+
+# Sources at the edges of the lexer rules, most of them with lexer errors
+LEXER_CASES = (
+    "", " ", "\n", "a", "1", "1.", "1.5", ".5", "1..2", "a1_b", "_", "__init", "classy class",
+    '"abc"', '""', '"a\nb"', '"unterminated', '"back\\slash"', '"a\\"b"', '\\', '"\\',
+    "// comment", "// comment\nprint 1;", "//", "/ /", "a/b", "a//b\nc",
+    "@", "#$~", "a@b", "é", "\t\r\n", "a\r\nb", "!=", "!", "==", "=", ">=", "<=", "<>", "a.b.c",
+    "var x = 1;", "print \"a\" + 1.25 * x;",
+)
+
+
+@pytest.mark.parametrize("source", LEXER_CASES + EDGE_CASES)
+def test_edge_cases_match_antlr(source):
+    assert lex(RegexLexer, source) == lex(compiscriptLexer, source)
+
+
+def test_generated_programs_and_mutants_match_antlr():
+    rng = random.Random(0)
+    for seed in range(10):
+        source = ProgramGenerator(seed=seed).generate(60)
+        for program in [source, *mutants(source, 20, rng)]:
+            assert lex(RegexLexer, program) == lex(compiscriptLexer, program), program
+
+
+def test_mapped_input_matches_antlr(tmp_path):
+    rng = random.Random(1)
+    path = tmp_path / "source.cspt"
+    source = ProgramGenerator(seed=0).generate(60)
+    for program in [source, *LEXER_CASES, *mutants(source, 20, rng)]:
+        path.write_bytes(program.encode('ascii', 'ignore'))
+        expected = lex_file(compiscriptLexer, FileStream, str(path))
+        for lexer_class in (compiscriptLexer, RegexLexer):
+            assert lex_file(lexer_class, MappedInputStream, str(path)) == expected, program
@@ -0,0 +1,49 @@
+from Controller.result_cache import compiler_sources
+
+
+def test_fingerprint_covers_every_compiler_module():
+    sources = compiler_sources()
+    for source in ('Controller/lowering.py', 'Controller/resolver.py', 'Controller/compiler.py',
+                   'Controller/diagnostics.py', 'Controller/custom_exception.py', 'Controller/Driver.py',
+                   'Language/compiscriptParser.py', 'Model/data_types.py'):
+        assert source in sources
+    assert not any('__pycache__' in source for source in sources)
+
+
+def test_only_outcomes_of_the_source_are_cached(tmp_path, monkeypatch):
+    from Controller import batch
+    from Controller.result_cache import ResultCache
+
+    source = tmp_path / "program.cspt"
+    source.write_text("var a = 1;\nvar a = 2;\n")
+    cache = ResultCache(str(tmp_path / "cache"))
+
+    def crash(*args, **kwargs):
+        raise RecursionError("maximum recursion depth exceeded")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(batch, 'compile_file', crash)
+        result = batch.compile_worker(str(source), cache=cache)
+    assert result.error == "Error: maximum recursion depth exceeded"
+    assert cache.size()[0] == 0
+
+    result = batch.compile_worker(str(source), cache=cache)
+    assert "already exists" in result.error and not result.cached
+    assert cache.size()[0] == 1
+    assert batch.compile_worker(str(source), cache=cache).cached
+
+
+def test_evict_source_removes_every_variant(tmp_path):
+    from Controller import batch
+    from Controller.result_cache import ResultCache
+
+    source = tmp_path / "program.cspt"
+    source.write_text("var a = 1;\nprint a;\n")
+    cache = ResultCache(str(tmp_path / "cache"))
+    batch.compile_worker(str(source), cache=cache)
+    batch.compile_worker(str(source), cache=cache, all_errors=True)
+    assert cache.size()[0] == 2
+
+    assert cache.evict_source(str(source)) == 2
+    assert cache.size()[0] == 0
+    assert cache.evict_source(str(source)) == 0
@@ -0,0 +1,96 @@
+import os
+import logging
+import pytest
+from Model.scope import ScopeManager, BindingScopeManager
+from Model.symbol_table import Symbol
+from Model.object_types import Variable, Function
+from Model.data_types import NumType, StringType
+from Controller.Driver import SemanticAnalyzer
+from Controller.compiler import compile_file
+from Benchmark.program_generator import ProgramGenerator
+
+INPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'Input')
+
+MANAGERS = (ScopeManager, BindingScopeManager)
+
+# Names declared again in nested scopes (reported as duplicates), declared again in sibling
+# scopes once the first one is left, and used after their scope is left
+PROGRAMS = (
+    "{ var a = 1; print a; }\n{ var a = \"s\"; print a + \"t\"; }\nvar a = true;\nprint a;\n",
+    "fun f(x) { var a = x; return a; }\nfun g(a) { { var x = a; } var x = \"s\"; return x; }\nvar x = 1;\n",
+    "var n = 0;\nwhile (n < 2) { var m = n; { var k = m; n = k + 1; } var k = \"s\"; }\nvar m = \"t\";\nvar k = m;\n",
+    "var a = 1;\n{ var a = \"s\"; print a + \"t\"; }\nprint a * 2;\n",
+    "var a = 1;\n{ var a = \"s\"; { var a = true; print a; } print a - 1; }\nprint a;\n",
+    "var x = 1;\nfun f(x) { var y = x; { var x = \"s\"; y = x; } return y; }\nprint f(2);\n",
+    "{ var a = 1; }\nprint a;\n",
+    "fun f() { var a = 1; return a; }\nprint a;\n",
+    "var f = 1;\nfun f() { var f = \"s\"; return f; }\n{ var f = true; print f; }\nprint f + 1;\n",
+    "var i = \"s\";\nfor (var i = 0; i < 3; i = i + 1) { var i = 2; print i; }\nprint i + \"t\";\n",
+    "var a = 1;\nwhile (a < 3) { var b = a; a = b + 1; }\nb = 2;\n",
+    "var a = 1;\n{ var a = 2; var a = 3; }\nvar a = 4;\n",
+)
+
+logger = logging.getLogger("compiscript.tests")
+
+
+def sources():
+    for name in sorted(os.listdir(INPUT_DIR)):
+        with open(os.path.join(INPUT_DIR, name), 'r', encoding='utf-8') as file:
+            yield name, file.read()
+    for seed in range(10):
+        yield f"generated-{seed}", ProgramGenerator(seed=seed).generate(80)
+    for index, source in enumerate(PROGRAMS):
+        yield f"program-{index}", source
+
+
+def analyze(path, manager_class, collect_errors):
+    """Compiles a file with a scope manager, returning its outcome and the summary of its scopes."""
+    analyzer = SemanticAnalyzer(logger=logger, scope_manager=manager_class(), collect_errors=collect_errors)
+    try:
+        compile_file(str(path), logger, analyzer=analyzer, collect_errors=collect_errors)
+        outcome = None
+    except Exception as e:
+        outcome = (type(e).__name__, str(e), [diagnostic.to_dict() for diagnostic in getattr(e, 'diagnostics', ())])
+    return outcome, analyzer.scope_manager.global_scope.to_dict()
+
+
+@pytest.mark.parametrize("collect_errors", (False, True))
+def test_binding_scope_manager_matches_scope_manager(tmp_path, collect_errors):
+    path = tmp_path / "program.cspt"
+    for name, source in sources():
+        path.write_text(source)
+        assert analyze(path, BindingScopeManager, collect_errors) \
+            == analyze(path, ScopeManager, collect_errors), name
+
+
+@pytest.mark.parametrize("manager_class", MANAGERS)
+def test_shadowed_symbols_are_visible_again_after_the_scope_is_left(manager_class):
+    manager = manager_class()
+    outer = Symbol("a", Variable(NumType()))
+    function = Symbol("a", Function(NumType(), []))
+    manager.add_symbol(outer)
+    manager.add_symbol(function)
+
+    manager.enter_scope("block")
+    inner = Symbol("a", Variable(StringType()))
+    manager.add_symbol(inner)
+    assert manager.get_symbol("a", Variable) is inner
+    assert manager.get_symbol("a", Function) is function
+    assert manager.get_symbol("a") is inner
+
+    manager.enter_scope("nested")
+    assert manager.get_symbol("a", Variable) is inner
+    replacement = Symbol("a", Variable(NumType()))
+    manager.update_symbol("a", replacement, Variable)
+    assert manager.get_symbol("a", Variable) is replacement
+    manager.exit_scope()
+
+    manager.exit_scope()
+    assert manager.current_scope is manager.global_scope
+    assert manager.get_symbol("a", Variable) is outer
+    assert manager.get_symbol("a") is outer
+
+    # Leaving the global scope does nothing
+    manager.exit_scope()
+    assert manager.get_symbol("a", Variable) is outer
+    assert [child.name for child in manager.global_scope.children] == ["block"]
@@ -0,0 +1,65 @@
+import logging
+import pytest
+from Model.symbol_table import Symbol, SymbolTable
+from Model.object_types import Variable, Function, Class
+from Model.data_types import NumType, StringType
+from Controller.compiler import compile_file
+
+
+def test_variable_and_function_share_a_name():
+    table = SymbolTable()
+    variable = Symbol("f", Variable(NumType()))
+    function = Symbol("f", Function(StringType(), []))
+    table.add_symbol(variable)
+    table.add_symbol(function)
+
+    assert table.get_symbol("f", Variable) is variable
+    assert table.get_symbol("f", Function) is function
+    assert table.get_symbol("f", Class) is None
+    assert list(table) == [variable, function]
+
+
+def test_lookup_without_a_kind_prefers_variables():
+    table = SymbolTable()
+    function = Symbol("f", Function(NumType(), []))
+    table.add_symbol(function)
+    assert table.get_symbol("f") is function
+
+    variable = Symbol("f", Variable(NumType()))
+    table.add_symbol(variable)
+    assert table.get_symbol("f") is variable
+    assert table.get_symbol("g") is None
+
+
+@pytest.mark.parametrize("object_type", (lambda: Variable(NumType()), lambda: Function(NumType(), []),
+                                         lambda: Class({}, {})))
+def test_redeclaration_of_the_same_kind_is_reported(object_type):
+    table = SymbolTable()
+    first = Symbol("a", object_type())
+    table.add_symbol(first)
+    with pytest.raises(Exception, match="Symbol a of type .* already exists in the current scope"):
+        table.add_symbol(Symbol("a", object_type()))
+    assert table.get_symbol("a") is first
+
+
+def test_replace_symbol_keeps_the_other_kinds():
+    table = SymbolTable()
+    variable = Symbol("f", Variable(NumType()))
+    function = Symbol("f", Function(NumType(), []))
+    table.add_symbol(variable)
+    table.add_symbol(function)
+
+    replacement = Symbol("f", Variable(StringType()))
+    table.replace_symbol(variable, replacement)
+    assert table.get_symbol("f", Variable) is replacement
+    assert table.get_symbol("f", Function) is function
+
+
+def test_compile_variable_and_function_with_the_same_name(tmp_path):
+    path = tmp_path / "program.cspt"
+    path.write_text("var f = 1;\nfun f() { return 2; }\nprint f;\nprint f();\n")
+    compile_file(str(path), logging.getLogger("compiscript.tests"))
+
+    path.write_text("var f = 1;\nvar f = 2;\n")
+    with pytest.raises(Exception, match="already"):
+        compile_file(str(path), logging.getLogger("compiscript.tests"))
@@ -0,0 +1,66 @@
+import logging
+import pytest
+from antlr4 import InputStream, CommonTokenStream
+from Language.compiscriptLexer import compiscriptLexer
+from Language.compiscriptParser import compiscriptParser
+from Model.object_types import Variable
+from Controller.Driver import SemanticAnalyzer
+from Controller.compiler import PARSE_MODES, PARSERS, compile_file, parse_program, is_well_formed, lower_recovered
+from Controller.custom_exception import CollectingErrorListener, SyntaxErrors
+
+# Two separate syntax errors (in 'b' and 'c'), and a semantic error in a well-formed declaration after them
+PROGRAM = """var a = 1;
+var b = a +;
+print a;
+var c = ;
+var d = a * 2;
+print e;
+"""
+
+logger = logging.getLogger("compiscript.tests")
+
+
+def recovered_tree(source: str):
+    """Parses a source with a CollectingErrorListener on the lexer and the parser."""
+    listener = CollectingErrorListener()
+    lexer = compiscriptLexer(InputStream(source))
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(listener)
+    stream = CommonTokenStream(lexer)
+    stream.fill()
+    return parse_program(stream, 'two-stage', listener), listener
+
+
+def test_only_the_well_formed_declarations_are_lowered():
+    tree, listener = recovered_tree(PROGRAM)
+    assert [diagnostic.span[:2] for diagnostic in listener.diagnostics] == [(2, 11), (4, 8)]
+
+    declarations = [child for child in tree.getChildren() if isinstance(child, compiscriptParser.DeclarationContext)]
+    assert [is_well_formed(declaration) for declaration in declarations] == [True, False, True, False, True, True]
+    program = lower_recovered(tree, listener)
+    assert [declaration.span[0] for declaration in program.declarations] == [1, 3, 5, 6]
+
+
+def test_a_lexer_error_makes_its_declaration_malformed():
+    tree, listener = recovered_tree("var a = 1;\nvar b = 2 # 3;\nprint a;\n")
+    assert listener.lexer_positions == [(2, 10)]
+    assert [declaration.span[0] for declaration in lower_recovered(tree, listener).declarations] == [1, 3]
+
+
+@pytest.mark.parametrize("parse_mode", PARSE_MODES)
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize("collect_errors", (False, True))
+def test_both_syntax_errors_are_reported_with_the_semantic_errors(tmp_path, parse_mode, parser, collect_errors):
+    path = tmp_path / "program.cspt"
+    path.write_text(PROGRAM)
+    analyzer = SemanticAnalyzer(logger=logger, collect_errors=collect_errors)
+    with pytest.raises(SyntaxErrors) as raised:
+        compile_file(str(path), logger, parse_mode=parse_mode, parser=parser, analyzer=analyzer,
+                     collect_errors=collect_errors, recover_syntax=True)
+
+    diagnostics = [(diagnostic.code, diagnostic.span[:2], diagnostic.scope) for diagnostic in raised.value.diagnostics]
+    assert diagnostics == [('syntax-error', (2, 11), None), ('syntax-error', (4, 8), None),
+                           ('undeclared-variable', (6, 6), 'global')]
+    # The malformed declarations are left out of the analysis, the ones after them are analyzed
+    global_scope = analyzer.scope_manager.global_scope
+    assert [name for name in 'abcd' if global_scope.get_symbol(name, Variable) is not None] == ['a', 'd']
@@ -0,0 +1,23 @@
+import logging
+from Controller.trace import Tracer
+from Controller.compiler import compile_file
+
+
+def test_an_empty_tracer_records_the_whole_analysis(tmp_path):
+    path = tmp_path / "program.cspt"
+    path.write_text("var a = 1;\nprint a;\n")
+    tracer = Tracer()
+    assert len(tracer) == 0
+    compile_file(str(path), logging.getLogger("compiscript.tests"), tracer=tracer)
+
+    # The first event is recorded while the tracer is still empty
+    events = [(event.event, event.node) for event in tracer.events]
+    assert events[0] == ('enter_scope', 'Program')
+    assert ('declare', 'VarDecl') in events
+    assert len(tracer) == len(events)
+
+
+def test_no_tracer_records_nothing(tmp_path):
+    path = tmp_path / "program.cspt"
+    path.write_text("var a = 1;\nprint a;\n")
+    assert compile_file(str(path), logging.getLogger("compiscript.tests"), tracer=None) is not None